@@ -0,0 +1,58 @@
+"""create users and blogs tables
+
+Revision ID: 8f2d41c7a6b3
+Revises: 33404bfe64a6
+Create Date: 2026-10-17 10:12:04.118240
+
+Databases created before migrations existed already have these tables (from
+Base.metadata.create_all); for them this revision is a no-op.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2d41c7a6b3'
+down_revision: Union[str, Sequence[str], None] = '33404bfe64a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("users"):
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("full_name", sa.String(), nullable=False),
+            sa.Column("password", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_users_id", "users", ["id"], unique=False)
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+    if not inspector.has_table("blogs"):
+        op.create_table(
+            "blogs",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("slug", sa.String(), nullable=False),
+            sa.Column("content", sa.Text(), nullable=True),
+            sa.Column("author_id", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["author_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("blogs")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_table("users")
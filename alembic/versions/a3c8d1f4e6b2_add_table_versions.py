@@ -0,0 +1,41 @@
+"""add table_versions
+
+Revision ID: a3c8d1f4e6b2
+Revises: e7b3f05c92a8
+Create Date: 2026-10-17 11:05:42.118307
+
+One change counter per table, bumped by the repositories on every write
+and used to build ETags for the blog and user read endpoints.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c8d1f4e6b2'
+down_revision: Union[str, Sequence[str], None] = 'e7b3f05c92a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if sa.inspect(op.get_bind()).has_table("table_versions"):
+        return
+    table_versions = op.create_table(
+        'table_versions',
+        sa.Column('table_name', sa.String(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('table_name'),
+    )
+    op.bulk_insert(table_versions, [
+        {"table_name": "users", "version": 1},
+        {"table_name": "blogs", "version": 1},
+    ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('table_versions')
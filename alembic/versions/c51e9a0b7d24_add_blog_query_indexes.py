@@ -0,0 +1,52 @@
+"""add blog query indexes
+
+Revision ID: c51e9a0b7d24
+Revises: 8f2d41c7a6b3
+Create Date: 2026-10-17 10:26:51.402117
+
+- ix_blogs_slug (unique): the per-create slug uniqueness lookup; also makes
+  the database enforce uniqueness under concurrent creates.
+- ix_blogs_author_id: author filters and nulling author_id on user delete.
+- ix_blogs_created_at_id: the (created_at, id) keyset scan behind list_blogs,
+  read backwards for newest-first pages.
+
+Fails early if duplicate slugs already exist, since the unique index could
+not be built; resolve those rows first. Indexes already created by
+Base.metadata.create_all are left alone.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c51e9a0b7d24'
+down_revision: Union[str, Sequence[str], None] = '8f2d41c7a6b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    existing = {index["name"] for index in sa.inspect(bind).get_indexes("blogs")}
+
+    if "ix_blogs_slug" not in existing:
+        duplicates = bind.execute(sa.text(
+            "SELECT slug FROM blogs GROUP BY slug HAVING count(*) > 1"
+        )).scalars().all()
+        if duplicates:
+            raise RuntimeError(f"Cannot add unique index on blogs.slug; duplicate slugs: {duplicates[:20]}")
+        op.create_index("ix_blogs_slug", "blogs", ["slug"], unique=True)
+    if "ix_blogs_author_id" not in existing:
+        op.create_index("ix_blogs_author_id", "blogs", ["author_id"], unique=False)
+    if "ix_blogs_created_at_id" not in existing:
+        op.create_index("ix_blogs_created_at_id", "blogs", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_blogs_created_at_id", table_name="blogs")
+    op.drop_index("ix_blogs_author_id", table_name="blogs")
+    op.drop_index("ix_blogs_slug", table_name="blogs")
@@ -0,0 +1,52 @@
+"""add blog full-text search index
+
+Revision ID: e7b3f05c92a8
+Revises: c51e9a0b7d24
+Create Date: 2026-10-17 10:41:17.885630
+
+Postgres: generated, weighted tsvector column with a GIN index.
+SQLite: FTS5 table, backfilled from existing blogs and maintained by
+BlogRepository.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3f05c92a8'
+down_revision: Union[str, Sequence[str], None] = 'c51e9a0b7d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("""
+            ALTER TABLE blogs ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(content, '')), 'B')
+            ) STORED
+        """)
+        op.execute("CREATE INDEX IF NOT EXISTS ix_blogs_search_vector ON blogs USING GIN (search_vector)")
+    elif dialect == "sqlite":
+        op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS blogs_fts USING fts5(title, content, tokenize='porter unicode61')")
+        op.execute("""
+            INSERT INTO blogs_fts (rowid, title, content)
+            SELECT id, title, coalesce(content, '') FROM blogs
+            WHERE id NOT IN (SELECT rowid FROM blogs_fts)
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_blogs_search_vector")
+        op.execute("ALTER TABLE blogs DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        op.execute("DROP TABLE IF EXISTS blogs_fts")
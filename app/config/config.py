@@ -5,7 +5,85 @@ load_dotenv()  # loads .env into environment
 
 class Settings:
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    # Comma-separated read replica URLs; reads from GET requests are spread over them.
+    DATABASE_REPLICA_URLS: list[str] = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+    REPLICA_STRATEGY: str = os.getenv("REPLICA_STRATEGY", "round_robin")
+    # After a write, that client's reads stay on the primary for this long.
+    STICKY_PRIMARY_SECONDS: int = int(os.getenv("STICKY_PRIMARY_SECONDS", 5))
+    # Connection pool per engine (primary, each replica, async). Checkouts wait up
+    # to DB_POOL_TIMEOUT_SECONDS once pool_size + max_overflow connections are in use.
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", 30))
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", 1800))
+    # Connections all server workers together may hold on the primary (e.g. Postgres
+    # max_connections minus reserved and other clients); app.server shrinks the pools to fit.
+    # 0 leaves the pool sizing as configured.
+    DB_MAX_CONNECTIONS: int = int(os.getenv("DB_MAX_CONNECTIONS", 0))
+    # Optional; derived from DATABASE_URL (asyncpg / aiosqlite driver) when unset.
+    ASYNC_DATABASE_URL: str | None = os.getenv("ASYNC_DATABASE_URL")
     SECRET_KEY: str = os.getenv("SECRET_KEY")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES = 60
+    IDENTITY_CACHE_TTL_SECONDS: int = int(os.getenv("IDENTITY_CACHE_TTL_SECONDS", 60))
+    IDENTITY_CACHE_MAX_SIZE: int = int(os.getenv("IDENTITY_CACHE_MAX_SIZE", 10_000))
+    # bcrypt worker processes; 0 hashes inline in the request thread.
+    HASHER_POOL_SIZE: int = int(os.getenv("HASHER_POOL_SIZE", os.cpu_count() or 1))
+    HASHER_TIMEOUT_SECONDS: float = float(os.getenv("HASHER_TIMEOUT_SECONDS", 5))
+    # Admission control for the bcrypt-heavy /auth/login and /auth/register routes.
+    AUTH_CONCURRENCY_LIMIT: int = int(os.getenv("AUTH_CONCURRENCY_LIMIT", max(HASHER_POOL_SIZE, 1) * 2))
+    AUTH_CONCURRENCY_MAX: int = int(os.getenv("AUTH_CONCURRENCY_MAX", AUTH_CONCURRENCY_LIMIT * 4))
+    AUTH_QUEUE_SIZE: int = int(os.getenv("AUTH_QUEUE_SIZE", 64))
+    AUTH_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("AUTH_QUEUE_TIMEOUT_SECONDS", 2))
+    AUTH_TARGET_LATENCY_MS: float = float(os.getenv("AUTH_TARGET_LATENCY_MS", 750))
+    # Default and maximum time the database may spend on one /blogs/search query.
+    SEARCH_BUDGET_MS: int = int(os.getenv("SEARCH_BUDGET_MS", 300))
+    SEARCH_MAX_BUDGET_MS: int = int(os.getenv("SEARCH_MAX_BUDGET_MS", 2000))
+    # Characters of content returned as `excerpt` by GET /blogs/?fields=...,excerpt.
+    BLOG_EXCERPT_LENGTH: int = int(os.getenv("BLOG_EXCERPT_LENGTH", 200))
+    # POST /blogs/bulk: rows per INSERT batch / savepoint, and items per request.
+    BULK_INSERT_CHUNK_SIZE: int = int(os.getenv("BULK_INSERT_CHUNK_SIZE", 500))
+    BULK_MAX_ITEMS: int = int(os.getenv("BULK_MAX_ITEMS", 10_000))
+    # Read-through cache for blog/user lookups by ID: "memory" (per process),
+    # "redis" (shared, needs CACHE_URL), "local-redis" (in-process stand-in) or "none".
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_URL: str | None = os.getenv("CACHE_URL")
+    CACHE_MAX_SIZE: int = int(os.getenv("CACHE_MAX_SIZE", 10_000))
+    BLOG_CACHE_TTL_SECONDS: int = int(os.getenv("BLOG_CACHE_TTL_SECONDS", 300))
+    USER_CACHE_TTL_SECONDS: int = int(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+    CACHE_NEGATIVE_TTL_SECONDS: int = int(os.getenv("CACHE_NEGATIVE_TTL_SECONDS", 10))
+    # gzip/brotli response compression: smallest body compressed, levels (lower is
+    # cheaper on CPU), and worker threads compressing large bodies at once.
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", 5))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+    COMPRESSION_WORKERS: int = int(os.getenv("COMPRESSION_WORKERS", 2))
+    # GET /blogs/{id} keeps compressed bodies of at least COMPRESSED_CACHE_MIN_SIZE bytes.
+    COMPRESSED_CACHE_MAX_SIZE: int = int(os.getenv("COMPRESSED_CACHE_MAX_SIZE", 1000))
+    COMPRESSED_CACHE_MIN_SIZE: int = int(os.getenv("COMPRESSED_CACHE_MIN_SIZE", 8192))
+    # Logging: records go through a bounded queue to a background thread ("json" or "text").
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", 10_000))
+    # Per call site, below WARNING: records per second after a burst; 0 disables the limit.
+    LOG_INFO_RATE_PER_SECOND: float = float(os.getenv("LOG_INFO_RATE_PER_SECOND", 10))
+    LOG_INFO_BURST: int = int(os.getenv("LOG_INFO_BURST", 50))
+    # GET /metrics requires "Authorization: Bearer <METRICS_TOKEN>"; unset, the endpoint answers 404.
+    METRICS_TOKEN: str | None = os.getenv("METRICS_TOKEN") or None
+    # On-demand profiling: requests with a matching X-Profile-Token header, plus one in
+    # PROFILE_SAMPLE_RATE requests (0 = never). Profiling is off unless one of them is set.
+    PROFILE_TOKEN: str | None = os.getenv("PROFILE_TOKEN") or None
+    PROFILE_SAMPLE_RATE: int = int(os.getenv("PROFILE_SAMPLE_RATE", 0))
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "profiles")
+    PROFILE_MAX_FILES: int = int(os.getenv("PROFILE_MAX_FILES", 50))
+    PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", 1))
+    # Production server (python -m app.server); workers come from WEB_CONCURRENCY or the CPU count.
+    SERVER_BIND: str = os.getenv("SERVER_BIND", "0.0.0.0:8000")
+    # Recycle a worker after this many requests (plus up to the jitter); 0 never recycles.
+    SERVER_MAX_REQUESTS: int = int(os.getenv("SERVER_MAX_REQUESTS", 1000))
+    SERVER_MAX_REQUESTS_JITTER: int = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", 100))
+    SERVER_TIMEOUT_SECONDS: int = int(os.getenv("SERVER_TIMEOUT_SECONDS", 60))
+    # On shutdown or recycle, workers get this long to finish in-flight requests.
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT_SECONDS", 30))
+    SERVER_KEEPALIVE_SECONDS: int = int(os.getenv("SERVER_KEEPALIVE_SECONDS", 5))
 settings = Settings()
@@ -0,0 +1,196 @@
+import threading
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.config.config import settings
+from app.config.logger import logger
+from app.utils.metrics import Counter, Histogram, current_db_stats
+
+
+class PoolMetrics:
+    """
+    Counters and gauges for one engine's connection pool.
+
+    Checkout wait time is measured by the pool class from
+    `instrumented_pool_class`; the rest comes from pool events.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkout_wait = Histogram()
+        self.checkouts = Counter()
+        self.checkout_timeouts = Counter()
+        self.connects = Counter()
+        self.invalidations = Counter()
+        self.in_use = 0
+        self.engine: Engine | None = None
+        self._lock = threading.Lock()
+
+    def attach(self, engine: Engine) -> None:
+        """Listen to `engine`'s pool events; call once, right after create_engine."""
+        # Listeners registered on the engine carry over when dispose() rebuilds the pool.
+        self.engine = engine
+        target = engine
+
+        @event.listens_for(target, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            self.connects.inc()
+
+        @event.listens_for(target, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            self.checkouts.inc()
+            with self._lock:
+                self.in_use += 1
+
+        @event.listens_for(target, "checkin")
+        def on_checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self.in_use -= 1
+
+        @event.listens_for(target, "invalidate")
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            self.invalidations.inc()
+            logger.warning("Pool %s: connection invalidated (%s).", self.name, exception)
+
+    def stats(self) -> dict:
+        """Return a snapshot of the pool counters, gauges and checkout-wait histogram."""
+        pool = self.engine.pool
+        queue_pool = isinstance(pool, QueuePool)
+        return {
+            "pool": self.name,
+            "size": pool.size() if queue_pool else None,
+            "max_overflow": pool._max_overflow if queue_pool else None,
+            "checked_out": self.in_use,
+            "checked_in": pool.checkedin() if queue_pool else None,
+            "overflow": max(0, pool.overflow()) if queue_pool else None,
+            "checkouts": self.checkouts.value,
+            "checkout_timeouts": self.checkout_timeouts.value,
+            "connects": self.connects.value,
+            "invalidations": self.invalidations.value,
+            "checkout_wait_seconds": self.checkout_wait.snapshot(),
+        }
+
+
+def instrumented_pool_class(metrics: PoolMetrics, base: type[QueuePool] = QueuePool) -> type[QueuePool]:
+    """
+    Return a QueuePool subclass that records how long each checkout waited.
+
+    The metrics live on the class rather than the instance because the pool
+    is rebuilt from its class on `engine.dispose()`.
+    """
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return base._do_get(self)
+        except PoolTimeoutError:
+            metrics.checkout_timeouts.inc()
+            logger.warning("Pool %s: checkout timed out with %s connections in use.",
+                           metrics.name, metrics.in_use)
+            raise
+        finally:
+            metrics.checkout_wait.observe(time.perf_counter() - start)
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def engine_options(url: str, metrics: PoolMetrics, is_async: bool = False) -> dict:
+    """
+    Build create_engine keyword arguments with the configured pool sizing.
+
+    In-memory SQLite keeps SQLAlchemy's default single-connection pool, which
+    the sizing options do not apply to.
+    """
+    options = {"pool_pre_ping": True}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        poolclass=instrumented_pool_class(metrics, AsyncAdaptedQueuePool if is_async else QueuePool),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    )
+    return options
+
+
+def pool_limits(max_connections: int, processes: int, engines_per_process: int,
+                pool_size: int, max_overflow: int) -> tuple[int, int]:
+    """
+    Fit per-engine pool sizing under a connection budget shared by all processes.
+
+    Sizing that already fits is returned unchanged; otherwise each engine gets
+    its share of the budget, split between pool_size and max_overflow in the
+    configured ratio.
+
+    Args:
+        max_connections (int): Connections every process together may hold on the server.
+        processes (int): Worker processes sharing the budget.
+        engines_per_process (int): Engines each process opens against that server.
+        pool_size (int): Configured pool size per engine.
+        max_overflow (int): Configured overflow per engine.
+
+    Returns:
+        tuple[int, int]: (pool_size, max_overflow) per engine.
+    """
+    per_engine = max_connections // (processes * engines_per_process)
+    if per_engine < 1:
+        raise ValueError(f"{max_connections} connections cannot give {processes} processes "
+                         f"{engines_per_process} engines with one connection each")
+    if pool_size + max_overflow <= per_engine:
+        return pool_size, max_overflow
+    size = max(1, per_engine * pool_size // (pool_size + max_overflow))
+    return size, per_engine - size
+
+
+def track_queries(engine: Engine) -> None:
+    """
+    Add each statement's count and duration to the current request's RequestDbStats.
+
+    Outside a request (no stats in context) the listeners only read a contextvar.
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if current_db_stats.get() is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = current_db_stats.get()
+        started = getattr(context, "_query_started", None)
+        if stats is not None and started is not None:
+            stats.queries += 1
+            stats.seconds += time.perf_counter() - started
+
+
+# Every engine's PoolMetrics by name ("primary", "replica-0", "async", ...).
+pool_metrics: dict[str, PoolMetrics] = {}
+
+
+def create_instrumented_engine(name: str, url: str) -> Engine:
+    """
+    Create an engine with configured pool sizing and register its PoolMetrics under `name`.
+
+    Args:
+        name (str): Label for the pool in stats and logs.
+        url (str): Database URL.
+    """
+    metrics = PoolMetrics(name)
+    engine = create_engine(url, **engine_options(url, metrics))
+    metrics.attach(engine)
+    track_queries(engine)
+    pool_metrics[name] = metrics
+    return engine
+
+
+def create_instrumented_async_engine(name: str, url: str) -> AsyncEngine:
+    """Asyncio counterpart of create_instrumented_engine."""
+    metrics = PoolMetrics(name)
+    engine = create_async_engine(url, **engine_options(url, metrics, is_async=True))
+    metrics.attach(engine.sync_engine)
+    track_queries(engine.sync_engine)
+    pool_metrics[name] = metrics
+    return engine
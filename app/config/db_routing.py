@@ -0,0 +1,130 @@
+import itertools
+import threading
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+# Set per request by ReadWriteRoutingMiddleware: True sends every statement to the primary.
+use_primary: ContextVar[bool] = ContextVar("use_primary", default=False)
+
+STRATEGIES = ("round_robin", "least_connections")
+
+
+class ReplicaSet:
+    """
+    Picks a read replica engine, round-robin or by fewest checked-out connections.
+    """
+
+    def __init__(self, engines: list[Engine], strategy: str = "round_robin"):
+        """
+        Args:
+            engines (list[Engine]): One engine per replica.
+            strategy (str): "round_robin" or "least_connections".
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown replica strategy '{strategy}'; expected one of {STRATEGIES}")
+        self.engines = engines
+        self.strategy = strategy
+        self._cycle = itertools.cycle(range(len(engines)))
+        self._lock = threading.Lock()
+        self.in_use = [0] * len(engines)
+        self.picks = [0] * len(engines)
+        for index, engine in enumerate(engines):
+            event.listen(engine, "checkout", self._on_checkout(index))
+            event.listen(engine, "checkin", self._on_checkin(index))
+
+    def _on_checkout(self, index: int):
+        def checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self.in_use[index] += 1
+        return checkout
+
+    def _on_checkin(self, index: int):
+        def checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self.in_use[index] -= 1
+        return checkin
+
+    def pick(self) -> Engine:
+        """Return the replica engine the next read session should use."""
+        with self._lock:
+            if self.strategy == "least_connections":
+                index = min(range(len(self.engines)), key=lambda i: (self.in_use[i], self.picks[i]))
+            else:
+                index = next(self._cycle)
+            self.picks[index] += 1
+        return self.engines[index]
+
+    def stats(self) -> list[dict]:
+        """Return per-replica pick counts and connections currently checked out."""
+        with self._lock:
+            return [
+                {"replica": engine.url.render_as_string(hide_password=True), "picks": picks, "in_use": in_use}
+                for engine, picks, in_use in zip(self.engines, self.picks, self.in_use)
+            ]
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to a replica and everything else to the primary.
+
+    Goes to the primary for: requests flagged through `use_primary`, flushes,
+    INSERT/UPDATE/DELETE statements, SELECT ... FOR UPDATE, and every
+    statement after the session's first write, so a request reads its own
+    writes. Reads pick one replica per session, so a request never mixes
+    snapshots from two replicas. SET statements only configure the
+    connection, so they follow the reads: they never count as a write.
+    A statement run with `bind_arguments=primary_bind_arguments(session)`
+    goes to the primary without making the session stick to it.
+    """
+
+    def __init__(self, bind=None, *, primary: Engine, replicas: ReplicaSet, **kwargs):
+        # `bind` is accepted for sessionmaker compatibility; the primary is always the default bind.
+        super().__init__(bind=primary, **kwargs)
+        self.primary = primary
+        self.replicas = replicas
+        self._replica: Engine | None = None
+        self._wrote = False
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is not None:
+            return bind
+        if self._is_setting(clause):
+            return self.primary if self._wrote or use_primary.get() else self._read_bind()
+        if self._wrote or self._flushing or use_primary.get() or self._is_write(clause):
+            self._wrote = True
+            return self.primary
+        return self._read_bind()
+
+    def _read_bind(self) -> Engine:
+        if self._replica is None:
+            self._replica = self.replicas.pick()
+        return self._replica
+
+    @staticmethod
+    def _is_setting(clause) -> bool:
+        text = getattr(clause, "text", None)
+        return text is not None and text.lstrip().upper().startswith(("SET ", "RESET "))
+
+    @staticmethod
+    def _is_write(clause) -> bool:
+        if clause is None:
+            return False
+        if getattr(clause, "is_dml", False) or getattr(clause, "_for_update_arg", None) is not None:
+            return True
+        # Raw SQL is only trusted as a read when it is a SELECT.
+        if getattr(clause, "is_select", False):
+            return False
+        text = getattr(clause, "text", None)
+        return text is not None and not text.lstrip().upper().startswith(("SELECT", "WITH"))
+
+
+def primary_bind_arguments(db: Session) -> dict | None:
+    """
+    `bind_arguments` that run one statement on the primary when `db` routes
+    reads to replicas; None (the default bind) for any other session.
+    """
+    if isinstance(db, RoutingSession):
+        return {"bind": db.primary}
+    return None
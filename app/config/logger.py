@@ -1,25 +1,202 @@
+import atexit
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Callable
+from app.config.config import settings
 
 LOG_DIR = "logs"
 LOG_FILE = os.path.join(LOG_DIR, "app.log")
 
-os.makedirs(LOG_DIR, exist_ok=True)
+# Set per request by RequestIdMiddleware and stamped on every record logged meanwhile.
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
 
-logger = logging.getLogger("app_logger")
-logger.setLevel(logging.INFO)
+# Attributes every LogRecord has; anything else came in through `extra=` and becomes a JSON field.
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id", "suppressed"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, level, logger, message, request_id, any
+    `extra=` fields, and the traceback when there is one.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per call site (file and line) for records below WARNING.
+
+    A site may emit `burst` records at once and `rate` per second after
+    that; the next record it gets through carries `suppressed`, the number
+    dropped in between. Warnings and errors always pass. A `rate` of 0
+    disables the limit.
+    """
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        # (pathname, lineno) -> [tokens, last refill, suppressed since last pass]
+        self._buckets: dict[tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate <= 0:
+            return True
+        key = (record.pathname, record.lineno)
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.setdefault(key, [self.burst, now, 0])
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+                self.suppressed += 1
+                return False
+            bucket[0] = tokens - 1
+            record.suppressed, bucket[2] = bucket[2], 0
+        return True
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    Hand records to the listener thread, which formats them and does the I/O.
+
+    Unlike the stdlib QueueHandler this does not format in the caller, so
+    `%`-style arguments are merged on the listener thread; pass plain values
+    (not ORM objects) as arguments. When the queue is full the record is
+    dropped and counted rather than blocking the request.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.request_id = request_id.get()
+        if record.exc_info:
+            # Tracebacks reference live frames; render them before the caller moves on.
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return
+        with self._lock:
+            self.enqueued += 1
+
+
+class LazyRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that creates the log directory and opens the file on the first record, not at import."""
+
+    def __init__(self, filename: str, **kwargs):
+        super().__init__(filename, delay=True, **kwargs)
 
-formatter = logging.Formatter(
-    "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-)
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class DrainingQueueListener(QueueListener):
+    """QueueListener whose stop() waits for room in a full queue instead of raising."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+def build_formatter(kind: str) -> logging.Formatter:
+    """Return the formatter for LOG_FORMAT: "json" or "text"."""
+    if kind == "json":
+        return JsonFormatter()
+    return logging.Formatter("%(asctime)s [%(levelname)s] %(name)s [%(request_id)s]: %(message)s")
+
+
+log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+formatter = build_formatter(settings.LOG_FORMAT)
 
 console_handler = logging.StreamHandler()
 console_handler.setFormatter(formatter)
 
-file_handler = RotatingFileHandler(LOG_FILE, maxBytes=5_000_000, backupCount=3)
+file_handler = LazyRotatingFileHandler(LOG_FILE, maxBytes=5_000_000, backupCount=3)
 file_handler.setFormatter(formatter)
 
+queue_handler = AsyncQueueHandler(log_queue)
+rate_limit = RateLimitFilter(settings.LOG_INFO_RATE_PER_SECOND, settings.LOG_INFO_BURST)
+queue_handler.addFilter(rate_limit)
+listener = DrainingQueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+
+logger = logging.getLogger("app_logger")
+logger.setLevel(settings.LOG_LEVEL)
+
+
+def log_stats() -> dict:
+    """Return the pipeline's counters: records queued, dropped on a full queue, rate limited, and backlog."""
+    return {
+        "enqueued": queue_handler.enqueued,
+        "dropped": queue_handler.dropped,
+        "rate_limited": rate_limit.suppressed,
+        "backlog": log_queue.qsize(),
+        "capacity": log_queue.maxsize,
+    }
+
+
+def restart_logging() -> None:
+    """
+    Give a forked worker process its own queue and listener thread.
+
+    The parent's listener thread does not survive fork(), and the inherited
+    queue may have been locked mid-put when the parent forked.
+    """
+    global log_queue
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler.queue = log_queue
+    listener.queue = log_queue
+    listener._thread = None
+    listener.start()
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread; called at interpreter exit."""
+    if listener._thread is not None:
+        listener.stop()
+
+
 if not logger.handlers:
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    logger.addHandler(queue_handler)
+    listener.start()
+    atexit.register(stop_logging)
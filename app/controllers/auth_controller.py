@@ -1,23 +1,41 @@
 import jwt
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
-from app.models.user_model import User
+from app.repositories.async_user_repository import AsyncUserRepository
 from app.utils.hashing import Hasher
 from app.schemas.auth_schema import TokenData
+from app.schemas.user_schema import UserCreate
 from app.config.config import settings
 from app.config.logger import logger
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = db.query(User).filter(User.email == email).first()
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    """
+    Return the user matching the credentials, or None.
+
+    The bcrypt check is awaited on the hashing process pool, so no request
+    thread is held while it runs.
+    """
+    user = await AsyncUserRepository(db).get_by_email(email)
     if not user:
-        logger.warning(f"Authentication failed: User not found for {email}")
+        logger.warning("Authentication failed: User not found for %s", email)
         return None
-    if not Hasher.verify_password(password, user.password):
-        logger.warning(f"Authentication failed: Incorrect password for {email}")
+    if not await Hasher.verify_password_async(password, user.password):
+        logger.warning("Authentication failed: Incorrect password for %s", email)
         return None
     return user
 
+async def register_user(db: AsyncSession, user_create: UserCreate):
+    """
+    Create a new user account, hashing the password on the hashing process pool.
+    """
+    try:
+        logger.info("Controller: registering user %s", user_create.email)
+        return await AsyncUserRepository(db).create(user_create)
+    except Exception as e:
+        logger.error("Controller error in register_user: %s", e)
+        raise
+
 def create_access_token(subject: str, expires_delta: timedelta | None = None) -> str:
     """
     Create a JWT access token with email as the subject.
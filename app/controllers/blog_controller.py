@@ -1,41 +1,127 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.repositories.blog_repository import BlogRepository
-from app.schemas.blog_schema import BlogCreate, BlogUpdate
+from app.repositories.async_blog_repository import AsyncBlogRepository
+from app.repositories.async_user_repository import AsyncUserRepository
+from app.repositories.blog_repository import BlogRepository, list_columns
+from app.repositories.user_repository import UserRepository
+from app.repositories.blog_search_repository import BlogSearchRepository
+from app.schemas.blog_schema import BlogCreate, BlogUpdate, BlogBulkCreate
+from app.config.config import settings
 from app.config.logger import logger
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.fast_json import rows_as_dicts
+
+def page_arguments(after: str | None, before: str | None, fields: list[str] | None) -> dict:
+    """Decode get_blogs' cursors and `fields` into keyword arguments for get_page."""
+    return {
+        "after": decode_cursor(after) if after else None,
+        "before": decode_cursor(before) if before else None,
+        "columns": list_columns(fields, settings.BLOG_EXCERPT_LENGTH) if fields else None,
+    }
+
+def page_response(blogs: list, has_more: bool, arguments: dict, as_rows: bool, fields: list[str] | None) -> dict:
+    """Shape a page from get_page into get_blogs' result, with cursors for the adjacent pages."""
+    if arguments["before"] is not None:
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, arguments["after"] is not None
+    next_cursor = encode_cursor(blogs[-1].created_at, blogs[-1].id) if blogs and has_next else None
+    prev_cursor = encode_cursor(blogs[0].created_at, blogs[0].id) if blogs and has_prev else None
+    if as_rows or fields:
+        blogs = rows_as_dicts(blogs)
+    if fields and "excerpt" in fields:
+        length = settings.BLOG_EXCERPT_LENGTH
+        for blog in blogs:
+            if blog["excerpt"] is not None and len(blog["excerpt"]) > length:
+                blog["excerpt"] = blog["excerpt"][:length].rstrip() + "…"
+    return {"items": blogs, "next_cursor": next_cursor, "prev_cursor": prev_cursor}
 
 class BlogController:
     """Blog Controller to manage crud"""
     def __init__(self, db: Session):
         self.blog_repository = BlogRepository(db)
+        self.user_repository = UserRepository(db)
+        self.search_repository = BlogSearchRepository(db)
 
-    def get_blogs(self):
-        """Return all blogs."""
+    def get_versions(self, include_author: bool = False) -> dict[str, int]:
+        """Return the versions of the tables a blog read response depends on, for its ETag."""
         try:
-            blogs = self.blog_repository.get_all()
-            logger.info("Controller: returned all blogs.")
-            return blogs
+            versions = {"blogs": self.blog_repository.get_version()}
+            if include_author:
+                versions["users"] = self.user_repository.get_version()
+            return versions
         except Exception as e:
-            logger.error(f"Controller error in get_blogs: {e}")
+            logger.error("Controller error in get_versions: %s", e)
             raise
 
-    def get_blog(self, blog_id: int):
-        """Return a single blog by ID."""
+    def get_blogs(self, limit: int, after: str | None = None, before: str | None = None,
+                  include_author: bool = False, as_rows: bool = False, fields: list[str] | None = None):
+        """
+        Return one page of blogs along with cursors for the adjacent pages.
+
+        With `as_rows` the items are plain dicts of BlogResponse's fields, ready
+        for fast_json.dumps, instead of Blog objects. `fields` (names from
+        LIST_FIELDS) narrows those dicts to the named fields plus id and
+        created_at, selecting nothing else; a long `excerpt` ends in "…".
+        """
         try:
-            blog = self.blog_repository.get_by_id(blog_id)
+            arguments = page_arguments(after, before, fields)
+            blogs, has_more = self.blog_repository.get_page(limit, with_author=include_author, as_rows=as_rows,
+                                                        **arguments)
+            logger.info("Controller: returned page of blogs.")
+            return page_response(blogs, has_more, arguments, as_rows, fields)
+        except Exception as e:
+            logger.error("Controller error in get_blogs: %s", e)
+            raise
+
+    def search_blogs(self, q: str, limit: int, offset: int, budget_ms: int):
+        """Return one page of ranked search results with the offset of the next page."""
+        try:
+            items = self.search_repository.search(q, limit, offset, budget_ms)
+            next_offset = offset + limit if len(items) == limit else None
+            return {"items": items, "next_offset": next_offset}
+        except Exception as e:
+            logger.error("Controller error in search_blogs(%s): %s", q, e)
+            raise
+
+    def export_blogs(self, batch_size: int):
+        """Return a lazy iterator over every blog row for export."""
+        logger.info("Controller: exporting blogs.")
+        return self.blog_repository.iter_export(batch_size)
+
+    def get_blog(self, blog_id: int, include_author: bool = False, versions: dict[str, int] | None = None):
+        """Return a single blog by ID, cached only under the given table `versions` (see get_versions)."""
+        try:
+            blog = self.blog_repository.get_by_id(blog_id, with_author=include_author, versions=versions)
             if not blog:
-                logger.warning(f"Controller: blog {blog_id} not found.")
+                logger.warning("Controller: blog %s not found.", blog_id)
             return blog
         except Exception as e:
-            logger.error(f"Controller error in get_blog({blog_id}): {e}")
+            logger.error("Controller error in get_blog(%s): %s", blog_id, e)
             raise
 
     def create_blog(self, blog_create: BlogCreate,author_id:int):
         """Create a new blog entry."""
         try:
-            logger.info(f"Controller: creating blog {blog_create.title}")
+            logger.info("Controller: creating blog %s", blog_create.title)
             return self.blog_repository.create(blog_create,author_id)
         except Exception as e:
-            logger.error(f"Controller error in create_blog: {e}")
+            logger.error("Controller error in create_blog: %s", e)
+            raise
+
+    def bulk_create_blogs(self, payload: BlogBulkCreate, author_id: int):
+        """Create many blogs at once and report a status per item."""
+        try:
+            logger.info("Controller: bulk creating %s blogs (%s).", len(payload.items), payload.mode)
+            results = self.blog_repository.bulk_create(
+                payload.items, author_id,
+                chunk_size=settings.BULK_INSERT_CHUNK_SIZE,
+                atomic=payload.mode == "atomic",
+            )
+            created = sum(1 for result in results if result["status"] == "created")
+            return {"created": created, "failed": len(results) - created, "items": results}
+        except Exception as e:
+            logger.error("Controller error in bulk_create_blogs: %s", e)
             raise
 
     def update_blog(self, blog_id: int, blog_update: BlogUpdate):
@@ -43,11 +129,11 @@ class BlogController:
         try:
             blog = self.blog_repository.get_by_id(blog_id)
             if not blog:
-                logger.warning(f"Controller: blog {blog_id} not found for update.")
+                logger.warning("Controller: blog %s not found for update.", blog_id)
                 return None
             return self.blog_repository.update(blog, blog_update)
         except Exception as e:
-            logger.error(f"Controller error in update_blog({blog_id}): {e}")
+            logger.error("Controller error in update_blog(%s): %s", blog_id, e)
             raise
 
     def delete_blog(self, blog_id: int):
@@ -55,9 +141,51 @@ class BlogController:
         try:
             blog = self.blog_repository.get_by_id(blog_id)
             if not blog:
-                logger.warning(f"Controller: blog {blog_id} not found for deletion.")
+                logger.warning("Controller: blog %s not found for deletion.", blog_id)
                 return None
             return self.blog_repository.delete(blog)
         except Exception as e:
-            logger.error(f"Controller error in delete_blog({blog_id}): {e}")
+            logger.error("Controller error in delete_blog(%s): %s", blog_id, e)
+            raise
+
+
+class AsyncBlogController:
+    """The blog reads of BlogController for `async def` routes, on an AsyncSession."""
+    def __init__(self, db: AsyncSession):
+        self.blog_repository = AsyncBlogRepository(db)
+        self.user_repository = AsyncUserRepository(db)
+
+    async def get_versions(self, include_author: bool = False) -> dict[str, int]:
+        """Return the versions of the tables a blog read response depends on, for its ETag."""
+        try:
+            versions = {"blogs": await self.blog_repository.get_version()}
+            if include_author:
+                versions["users"] = await self.user_repository.get_version()
+            return versions
+        except Exception as e:
+            logger.error("Controller error in get_versions: %s", e)
+            raise
+
+    async def get_blogs(self, limit: int, after: str | None = None, before: str | None = None,
+                        include_author: bool = False, as_rows: bool = False, fields: list[str] | None = None):
+        """Return one page of blogs along with cursors for the adjacent pages (see BlogController.get_blogs)."""
+        try:
+            arguments = page_arguments(after, before, fields)
+            blogs, has_more = await self.blog_repository.get_page(limit, with_author=include_author,
+                                                              as_rows=as_rows, **arguments)
+            logger.info("Controller: returned page of blogs.")
+            return page_response(blogs, has_more, arguments, as_rows, fields)
+        except Exception as e:
+            logger.error("Controller error in get_blogs: %s", e)
+            raise
+
+    async def get_blog(self, blog_id: int, include_author: bool = False, versions: dict[str, int] | None = None):
+        """Return a single blog by ID, cached only under the given table `versions` (see get_versions)."""
+        try:
+            blog = await self.blog_repository.get_by_id(blog_id, with_author=include_author, versions=versions)
+            if not blog:
+                logger.warning("Controller: blog %s not found.", blog_id)
+            return blog
+        except Exception as e:
+            logger.error("Controller error in get_blog(%s): %s", blog_id, e)
             raise
@@ -1,52 +1,146 @@
+import time
+from typing import Iterable
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.repositories.async_user_repository import AsyncUserRepository
 from app.repositories.user_repository import UserRepository
 from app.schemas.user_schema import UserCreate, UserUpdate
 from app.config.logger import logger
+from app.utils.hashing import Hasher, HashingService
+from app.utils.fast_json import rows_as_dicts
 
 class UserController:
     def __init__(self, db: Session):
         self.user_repository = UserRepository(db)
 
-    def get_users(self):
-        """Return all users."""
+    def get_versions(self) -> dict[str, int]:
+        """Return the versions of the tables a user read response depends on, for its ETag."""
         try:
-            users = self.user_repository.get_all()
+            return {"users": self.user_repository.get_version()}
+        except Exception as e:
+            logger.error("Controller error in get_versions: %s", e)
+            raise
+
+    def get_users(self, as_rows: bool = False):
+        """Return all users; with `as_rows`, as plain dicts of UserResponse's fields."""
+        try:
+            users = self.user_repository.get_all(as_rows=as_rows)
             logger.info("Controller: returned all users.")
-            return users
+            return rows_as_dicts(users) if as_rows else users
         except Exception as e:
-            logger.error(f"Controller error in get_users: {e}")
+            logger.error("Controller error in get_users: %s", e)
             raise
 
-    def get_user(self, user_id: int):
-        """Return a single user by ID."""
+    def export_users(self, batch_size: int):
+        """Return a lazy iterator over every user row (without passwords) for export."""
+        logger.info("Controller: exporting users.")
+        return self.user_repository.iter_export(batch_size)
+
+    def get_user(self, user_id: int, versions: dict[str, int] | None = None):
+        """Return a single user by ID, cached only under the given table `versions` (see get_versions)."""
         try:
-            user = self.user_repository.get_by_id(user_id)
+            user = self.user_repository.get_by_id(user_id, versions=versions)
             if not user:
-                logger.warning(f"Controller: user {user_id} not found.")
+                logger.warning("Controller: user %s not found.", user_id)
             return user
         except Exception as e:
-            logger.error(f"Controller error in get_user({user_id}): {e}")
+            logger.error("Controller error in get_user(%s): %s", user_id, e)
             raise
 
     def create_user(self, user_create: UserCreate):
         """Create a new user entry."""
         try:
-            logger.info(f"Controller: creating user {user_create.email}")
+            logger.info("Controller: creating user %s", user_create.email)
             return self.user_repository.create(user_create)
         except Exception as e:
-            logger.error(f"Controller error in create_user: {e}")
+            logger.error("Controller error in create_user: %s", e)
             raise
 
+    def import_users(self, records: Iterable[tuple[int, dict]], hashing: HashingService, chunk_size: int):
+        """
+        Validate, de-duplicate, hash and insert a batch of user records.
+
+        Emails are checked against the table in set-based queries before any
+        hashing, so duplicates cost no bcrypt work; passwords are then hashed
+        in parallel on `hashing` and rows inserted `chunk_size` at a time.
+
+        Args:
+            records (Iterable[tuple[int, dict]]): (line number, raw record) pairs;
+                a record that is not a dict is reported as malformed.
+            hashing (HashingService): Pool used to hash the passwords.
+            chunk_size (int): Rows per INSERT batch and per email lookup.
+
+        Returns:
+            dict: total/created/failed counts, elapsed seconds, rows_per_second
+            and a list of per-row errors (line, email, error).
+        """
+        started = time.perf_counter()
+        errors = []
+        valid: list[tuple[int, UserCreate]] = []
+        seen = set()
+        total = 0
+        for line, record in records:
+            total += 1
+            if not isinstance(record, dict):
+                errors.append({"line": line, "email": None, "error": "Malformed record"})
+                continue
+            try:
+                user = UserCreate(**record)
+            except ValidationError as e:
+                error = e.errors()[0]
+                field = ".".join(str(part) for part in error["loc"])
+                errors.append({"line": line, "email": record.get("email"), "error": f"{field}: {error['msg']}"})
+                continue
+            if user.email in seen:
+                errors.append({"line": line, "email": user.email, "error": "Duplicate email in import file"})
+                continue
+            seen.add(user.email)
+            valid.append((line, user))
+
+        try:
+            existing = self.user_repository.find_existing_emails([user.email for _, user in valid], chunk_size)
+            fresh = []
+            for line, user in valid:
+                if user.email in existing:
+                    errors.append({"line": line, "email": user.email, "error": "User already exists"})
+                else:
+                    fresh.append((line, user))
+
+            hashes = Hasher.get_password_hashes([user.password for _, user in fresh], service=hashing)
+            rows = [{"email": user.email, "full_name": user.full_name, "password": hashed}
+                    for (_, user), hashed in zip(fresh, hashes)]
+            ids = self.user_repository.bulk_insert(rows, chunk_size)
+        except Exception as e:
+            logger.error("Controller error in import_users: %s", e)
+            raise
+
+        for (line, user), user_id in zip(fresh, ids):
+            if user_id is None:
+                errors.append({"line": line, "email": user.email, "error": "Conflicting write, retry this row"})
+        created = sum(1 for user_id in ids if user_id is not None)
+        elapsed = time.perf_counter() - started
+        errors.sort(key=lambda error: error["line"])
+        logger.info("Controller: imported %s of %s users in %.1fs.", created, total, elapsed)
+        return {
+            "total": total,
+            "created": created,
+            "failed": total - created,
+            "elapsed_seconds": elapsed,
+            "rows_per_second": total / elapsed if elapsed else 0.0,
+            "errors": errors,
+        }
+
     def update_user(self, user_id: int, user_update: UserUpdate):
         """Update an existing user."""
         try:
             user = self.user_repository.get_by_id(user_id)
             if not user:
-                logger.warning(f"Controller: user {user_id} not found for update.")
+                logger.warning("Controller: user %s not found for update.", user_id)
                 return None
             return self.user_repository.update(user, user_update)
         except Exception as e:
-            logger.error(f"Controller error in update_user({user_id}): {e}")
+            logger.error("Controller error in update_user(%s): %s", user_id, e)
             raise
 
     def delete_user(self, user_id: int):
@@ -54,9 +148,33 @@ class UserController:
         try:
             user = self.user_repository.get_by_id(user_id)
             if not user:
-                logger.warning(f"Controller: user {user_id} not found for deletion.")
+                logger.warning("Controller: user %s not found for deletion.", user_id)
                 return None
             return self.user_repository.delete(user)
         except Exception as e:
-            logger.error(f"Controller error in delete_user({user_id}): {e}")
+            logger.error("Controller error in delete_user(%s): %s", user_id, e)
+            raise
+
+class AsyncUserController:
+    """The user reads of UserController for `async def` routes, on an AsyncSession."""
+    def __init__(self, db: AsyncSession):
+        self.user_repository = AsyncUserRepository(db)
+
+    async def get_versions(self) -> dict[str, int]:
+        """Return the versions of the tables a user read response depends on, for its ETag."""
+        try:
+            return {"users": await self.user_repository.get_version()}
+        except Exception as e:
+            logger.error("Controller error in get_versions: %s", e)
+            raise
+
+    async def get_user(self, user_id: int, versions: dict[str, int] | None = None):
+        """Return a single user by ID, cached only under the given table `versions` (see get_versions)."""
+        try:
+            user = await self.user_repository.get_by_id(user_id, versions=versions)
+            if not user:
+                logger.warning("Controller: user %s not found.", user_id)
+            return user
+        except Exception as e:
+            logger.error("Controller error in get_user(%s): %s", user_id, e)
             raise
@@ -1,34 +1,71 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.config.dbconf import SessionLocal, engine
-from app.routes import user_routes, blog_route, auth_route
-from app.models import Base
-
-
-app = FastAPI(title="User CRUD API")
+from app.config.config import settings
+from app.config.dbconf import SessionLocal, database
+from app.routes import user_routes, blog_route, auth_route, metrics_route
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.db_routing import ReadWriteRoutingMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.request_id import RequestIdMiddleware
+from app.utils.hashing import hashing_service
+from app.utils.profiling import ProfileStore, profiling_enabled
 
 origins = [
     "http://localhost:8501",
     "http://127.0.0.1:8501",
 ]
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-Base.metadata.create_all(bind=engine)
-
-app.include_router(user_routes.router)
-app.include_router(blog_route.router)
-app.include_router(auth_route.router)
-
-@app.get("/")
-def root():
-    db = SessionLocal()
-    try:
-        return {"message": "User CRUD API is running!"}
-    finally:
-        db.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    hashing_service.shutdown()
+    await database.dispose_async()
+    database.dispose()
+
+
+def create_app() -> FastAPI:
+    """
+    Build the API application.
+
+    Building it does not touch the database: engines are created by the first
+    request that needs one and disposed on shutdown, and the schema is applied
+    with `alembic upgrade head`. Serve with `uvicorn app.main:create_app --factory`.
+    """
+    app = FastAPI(title="User CRUD API", lifespan=lifespan)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    if settings.DATABASE_REPLICA_URLS:
+        app.add_middleware(ReadWriteRoutingMiddleware, sticky_seconds=settings.STICKY_PRIMARY_SECONDS)
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE,
+                       max_workers=settings.COMPRESSION_WORKERS)
+    if profiling_enabled():
+        app.add_middleware(ProfilingMiddleware, token=settings.PROFILE_TOKEN, sample_rate=settings.PROFILE_SAMPLE_RATE,
+                           store=ProfileStore(settings.PROFILE_DIR, settings.PROFILE_MAX_FILES),
+                           interval=settings.PROFILE_INTERVAL_MS / 1000)
+    app.add_middleware(RequestIdMiddleware)
+    # Added last so it is outermost and times the whole stack.
+    app.add_middleware(MetricsMiddleware)
+
+    app.include_router(user_routes.router)
+    app.include_router(blog_route.router)
+    app.include_router(auth_route.router)
+    app.include_router(metrics_route.router)
+
+    @app.get("/")
+    def root():
+        db = SessionLocal()
+        try:
+            return {"message": "User CRUD API is running!"}
+        finally:
+            db.close()
+
+    return app
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from collections import deque
+from fastapi import HTTPException, status
+from app.config.config import settings
+from app.config.logger import logger
+
+
+class AdmissionController:
+    """
+    Adaptive concurrency limiter with a bounded FIFO wait queue.
+
+    At most `limit` requests run at once; up to `queue_size` more wait for a
+    slot for at most `queue_timeout` seconds. Anything beyond that fails fast
+    with 503 + Retry-After instead of piling up CPU work.
+
+    The limit adapts AIMD-style to observed latency: it shrinks by
+    `decrease_factor` whenever a request takes longer than `target_latency`
+    and grows by roughly one slot per `limit` fast requests while saturated.
+    All state is touched from the event loop only, so no locking is needed.
+    """
+
+    def __init__(self, name: str, initial_limit: int, min_limit: int, max_limit: int,
+                 queue_size: int, queue_timeout: float, target_latency: float,
+                 decrease_factor: float = 0.9):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.target_latency = target_latency
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _reject(self, reason: str) -> HTTPException:
+        logger.warning("Admission control (%s): rejecting request, %s (limit=%s, in_flight=%s, queued=%s).",
+                       self.name, reason, int(self.limit), self.in_flight, len(self._waiters))
+        retry_after = max(1, round(self.target_latency * (len(self._waiters) + 1) / max(self.limit, 1)))
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    async def acquire(self) -> None:
+        """Wait for a slot, or raise a 503 HTTPException if the queue is full or the wait times out."""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.queue_size:
+            self.rejected += 1
+            raise self._reject("queue full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.queue_timeout)
+        except BaseException as exc:
+            granted = waiter.done() and not waiter.cancelled()
+            if granted and isinstance(exc, asyncio.TimeoutError):
+                # The slot was handed over just as the wait timed out; take it.
+                self.admitted += 1
+                return
+            if granted:
+                self.in_flight -= 1
+                self._wake_waiters()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(exc, asyncio.TimeoutError):
+                self.timeouts += 1
+                raise self._reject("queue wait timed out")
+            raise
+        self.admitted += 1
+
+    def release(self, latency: float) -> None:
+        """Return a slot and feed the request's latency (seconds) into the limit."""
+        if latency > self.target_latency:
+            self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        elif self.in_flight >= int(self.limit):
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self.in_flight -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def stats(self) -> dict:
+        """Return the current limit, occupancy and admission counters."""
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+        }
+
+
+auth_admission = AdmissionController(
+    name="auth",
+    initial_limit=settings.AUTH_CONCURRENCY_LIMIT,
+    min_limit=1,
+    max_limit=settings.AUTH_CONCURRENCY_MAX,
+    queue_size=settings.AUTH_QUEUE_SIZE,
+    queue_timeout=settings.AUTH_QUEUE_TIMEOUT_SECONDS,
+    target_latency=settings.AUTH_TARGET_LATENCY_MS / 1000,
+)
+
+
+async def limit_auth_concurrency():
+    """
+    Dependency that admits a request through `auth_admission` for its whole lifetime.
+    """
+    await auth_admission.acquire()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        auth_admission.release(time.perf_counter() - start)
@@ -1,17 +1,18 @@
 from fastapi import Request, HTTPException, Depends
 from app.config.config import settings
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import jwt
-from app.config.dbconf import get_db
+from app.config.db_routing import primary_bind_arguments
+from app.config.dbconf import get_async_db, get_db
 from app.models.user_model import User
+from app.repositories.table_version_repository import TableVersionRepository
+from app.utils.identity_cache import CurrentUser, identity_cache
 
 
-
-def get_current_user(request: Request, db: Session = Depends(get_db)):
-    """
-    Middleware-like dependency to verify JWT token from cookies
-    and return the authenticated user.
-    """
+def token_subject(request: Request) -> str:
+    """Verify the JWT in the access_token cookie and return its subject (the user's email)."""
     token = request.cookies.get("access_token")
 
     if not token:
@@ -29,10 +30,48 @@ def get_current_user(request: Request, db: Session = Depends(get_db)):
         raise HTTPException(status_code=401, detail="Token has expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    return email
+
+
+def load_identity(db: Session, email: str) -> CurrentUser:
+    """
+    Return the user with this email, from the identity cache when possible.
+
+    A hit costs one primary-key read of the users version instead of a user
+    query. Entries are stamped with that version and discarded once it
+    moves, so an update or delete in any worker process takes effect on the
+    next request everywhere. UserRepository also evicts the entries it
+    changes, freeing them at once.
+    """
+    # Both reads go to the primary: a lagging replica would report the version
+    # from before a delete and keep authenticating the deleted user.
+    version = TableVersionRepository(db).get("users", bind_arguments=primary_bind_arguments(db))
+    cached = identity_cache.get(email)
+    if cached is not None and cached[0] == version:
+        return cached[1]
 
-    # Fetch user from DB
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
+    # Fetch user from DB, after the version, so the row is never older than its stamp
+    db_user = db.scalars(select(User).where(User.email == email).limit(1),
+                         bind_arguments=primary_bind_arguments(db)).first()
+    if not db_user:
         raise HTTPException(status_code=401, detail="User not found")
 
+    user = CurrentUser.from_user(db_user)
+    identity_cache.set(email, (version, user))
     return user
+
+
+def get_current_user(request: Request, db: Session = Depends(get_db)):
+    """
+    Middleware-like dependency to verify JWT token from cookies
+    and return the authenticated user (see load_identity).
+    """
+    return load_identity(db, token_subject(request))
+
+
+async def get_current_user_async(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    get_current_user for `async def` routes: the lookup runs on the request's
+    AsyncSession, so authentication holds no worker thread.
+    """
+    return await db.run_sync(load_identity, token_subject(request))
@@ -0,0 +1,90 @@
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from app.utils.compression import StreamCompressor, compress, is_compressible, negotiate
+
+# Bodies up to this size are compressed on the event loop; larger ones in a worker thread.
+INLINE_LIMIT = 16 * 1024
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with gzip or brotli, as negotiated by Accept-Encoding.
+
+    Only JSON/NDJSON/text bodies of at least `minimum_size` bytes that do
+    not already carry a Content-Encoding are compressed, so precompressed
+    responses pass through untouched. Single-chunk bodies are compressed
+    whole; streamed ones chunk by chunk. CPU is bounded by the configured
+    levels and by running at most `max_workers` large compressions at once.
+    """
+
+    def __init__(self, app, minimum_size: int, max_workers: int):
+        """
+        Args:
+            app: The ASGI application to wrap.
+            minimum_size (int): Smallest body, in bytes, worth compressing.
+            max_workers (int): Worker threads that may compress large bodies concurrently.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.limiter = anyio.CapacityLimiter(max_workers)
+
+    async def _compress(self, body: bytes, encoding: str) -> bytes:
+        if len(body) <= INLINE_LIMIT:
+            return compress(body, encoding)
+        return await anyio.to_thread.run_sync(compress, body, encoding, limiter=self.limiter)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        stream: StreamCompressor | None = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, stream, passthrough
+            if passthrough or message["type"] not in ("http.response.start", "http.response.body"):
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # Hold the headers until the first body chunk shows how large the response is.
+                start_message = message
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if stream is not None:
+                chunk = stream.compress(body) if more_body else stream.compress(body) + stream.finish()
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            if "content-encoding" in headers or not is_compressible(headers.get("content-type")):
+                passthrough = True
+            elif not more_body and len(body) < self.minimum_size:
+                passthrough = True
+                headers.add_vary_header("Accept-Encoding")
+            if passthrough:
+                await send(start_message)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+                stream = StreamCompressor(encoding)
+                await send(start_message)
+                await send({"type": "http.response.body", "body": stream.compress(body), "more_body": True})
+                return
+            compressed = await self._compress(body, encoding)
+            headers["Content-Length"] = str(len(compressed))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
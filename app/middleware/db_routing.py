@@ -0,0 +1,50 @@
+from http.cookies import SimpleCookie
+from app.config.db_routing import use_primary
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+STICKY_COOKIE = "db_primary"
+
+
+class ReadWriteRoutingMiddleware:
+    """
+    Decide per request whether RoutingSession may read from a replica.
+
+    Non-read methods always use the primary. A successful write also sets a
+    short-lived cookie; while it is present the client's reads stay on the
+    primary as well, so it sees its own writes despite replication lag.
+    """
+
+    def __init__(self, app, sticky_seconds: int):
+        """
+        Args:
+            app: The ASGI application to wrap.
+            sticky_seconds (int): How long a client's reads stay on the primary after a write.
+        """
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    @staticmethod
+    def _has_sticky_cookie(scope) -> bool:
+        for name, value in scope.get("headers", []):
+            if name == b"cookie" and STICKY_COOKIE in SimpleCookie(value.decode("latin-1")):
+                return True
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        is_write = scope["method"] not in READ_METHODS
+        token = use_primary.set(is_write or self._has_sticky_cookie(scope))
+
+        async def send_with_cookie(message):
+            if is_write and message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = f"{STICKY_COOKIE}=1; Max-Age={self.sticky_seconds}; Path=/; HttpOnly; SameSite=Lax"
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            use_primary.reset(token)
@@ -0,0 +1,75 @@
+import time
+from app.utils.metrics import Counter, Family, Gauge, Histogram, RequestDbStats, current_db_stats
+
+# Statements per request: 1-2 for a cached read, dozens hints at an N+1.
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+UNMATCHED_ROUTE = "<unmatched>"
+
+http_request_duration = Family(
+    "http_request_duration_seconds", "Request latency by route template.",
+    ("method", "route"), Histogram,
+)
+http_requests = Family(
+    "http_requests_total", "Completed requests by route template and status code.",
+    ("method", "route", "status"), Counter,
+)
+# The route template is only known once routing has run, so in-flight is per method.
+http_in_flight = Family(
+    "http_requests_in_flight", "Requests currently being served.",
+    ("method",), Gauge,
+)
+db_queries_per_request = Family(
+    "db_queries_per_request", "SQL statements executed per request.",
+    ("method", "route"), lambda: Histogram(QUERY_COUNT_BUCKETS),
+)
+db_seconds_per_request = Family(
+    "db_seconds_per_request", "Time spent executing SQL per request.",
+    ("method", "route"), Histogram,
+)
+
+HTTP_FAMILIES = (http_request_duration, http_requests, http_in_flight, db_queries_per_request, db_seconds_per_request)
+
+
+class MetricsMiddleware:
+    """
+    Record latency, status and SQL counts for every HTTP request.
+
+    Pure ASGI (no BaseHTTPMiddleware) so streaming responses are not
+    buffered; routes are labelled by template ("/blogs/{blog_id}"), never by
+    raw path, to keep label cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_flight = http_in_flight.child(method)
+        db_stats = RequestDbStats()
+        token = current_db_stats.set(db_stats)
+        status_code = 500
+        start = time.perf_counter()
+        in_flight.inc()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_flight.dec()
+            current_db_stats.reset(token)
+            route = scope.get("route")
+            template = getattr(route, "path", None) or UNMATCHED_ROUTE
+            http_request_duration.child(method, template).observe(elapsed)
+            http_requests.child(method, template, str(status_code)).inc()
+            db_queries_per_request.child(method, template).observe(db_stats.queries)
+            db_seconds_per_request.child(method, template).observe(db_stats.seconds)
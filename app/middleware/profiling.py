@@ -0,0 +1,85 @@
+import hmac
+import itertools
+import threading
+import time
+import uuid
+import anyio
+from app.config.logger import logger
+from app.middleware.metrics import UNMATCHED_ROUTE
+from app.utils.profiling import Profile, ProfileStore, current_profile
+
+PROFILE_HEADER = b"x-profile-token"
+
+
+class ProfilingMiddleware:
+    """
+    Profile the requests that carry a valid X-Profile-Token header, plus one
+    in every `sample_rate` requests, and write each profile to `store`.
+
+    Header-triggered responses name their file in X-Profile-File. At most
+    `max_concurrent` requests are profiled at once; others run unprofiled.
+    Only added to the app when profiling is configured.
+    """
+
+    def __init__(self, app, token: str | None, sample_rate: int, store: ProfileStore,
+                 interval: float, max_concurrent: int = 1):
+        """
+        Args:
+            app: The ASGI application to wrap.
+            token (str | None): Secret expected in X-Profile-Token; None disables the header.
+            sample_rate (int): Profile one request in this many; 0 disables sampling.
+            store (ProfileStore): Where .folded files are written.
+            interval (float): Seconds between stack samples.
+            max_concurrent (int): Profiles allowed to run at the same time.
+        """
+        self.app = app
+        self.token = token.encode("latin-1") if token else None
+        self.sample_rate = sample_rate
+        self.store = store
+        self.interval = interval
+        self._requests = itertools.count(1)
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+
+    def _authorized(self, scope) -> bool:
+        if self.token is None:
+            return False
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return hmac.compare_digest(value, self.token)
+        return False
+
+    def _sampled(self) -> bool:
+        return self.sample_rate > 0 and next(self._requests) % self.sample_rate == 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        by_header = self._authorized(scope)
+        if not (by_header or self._sampled()) or not self._slots.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        name = f"{time.time_ns() // 1_000_000:013d}-{uuid.uuid4().hex[:8]}.folded"
+
+        async def send_with_name(message):
+            if by_header and message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-profile-file", name.encode("latin-1"))]
+            await send(message)
+
+        profile = Profile(self.interval)
+        token = current_profile.set(profile)
+        start = time.perf_counter()
+        profile.start()
+        try:
+            await self.app(scope, receive, send_with_name)
+        finally:
+            profile.stop()
+            current_profile.reset(token)
+            self._slots.release()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            profile.label = f"{scope['method']} {route}"
+            path = await anyio.to_thread.run_sync(self.store.write, name, profile)
+            logger.info("Profiled %s in %.1f ms: %s samples written to %s",
+                        profile.label, elapsed_ms, profile.samples, str(path))
@@ -0,0 +1,40 @@
+import re
+import uuid
+from starlette.datastructures import Headers
+from app.config.logger import request_id
+
+REQUEST_ID_HEADER = "X-Request-ID"
+# Client-supplied IDs are reused only when short and free of characters that could forge log lines.
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,64}")
+
+
+class RequestIdMiddleware:
+    """
+    Give every request an ID, stamp it on the log records written while it
+    runs, and echo it in the X-Request-ID response header.
+
+    A well-formed incoming X-Request-ID (e.g. from a proxy) is kept, so one
+    ID follows the request across services.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = Headers(scope=scope).get(REQUEST_ID_HEADER)
+        rid = incoming if incoming and _VALID_REQUEST_ID.fullmatch(incoming) else uuid.uuid4().hex
+        token = request_id.set(rid)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", rid.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id.reset(token)
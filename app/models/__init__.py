@@ -1,3 +1,4 @@
 from .user_model import User
 from .blog_model import Blog
+from .table_version_model import TableVersion
 from .base import Base
@@ -1,11 +1,18 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, Text, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Text, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
 
 class Blog(Base):
     __tablename__ = "blogs"
+    __table_args__ = (
+        # Slug uniqueness check on create, author lookups (and FK maintenance
+        # on user delete), and the (created_at, id) keyset used by list_blogs.
+        Index("ix_blogs_slug", "slug", unique=True),
+        Index("ix_blogs_author_id", "author_id"),
+        Index("ix_blogs_created_at_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True)
     title = Column(String, nullable=False)
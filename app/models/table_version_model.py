@@ -0,0 +1,14 @@
+from sqlalchemy import BigInteger, Column, String
+
+from app.models.base import Base
+
+
+class TableVersion(Base):
+    """
+    A change counter per table, bumped in the same transaction as every write
+    to it. Read endpoints derive their ETags from it.
+    """
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
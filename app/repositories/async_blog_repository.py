@@ -0,0 +1,47 @@
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.blog_repository import BlogRepository
+
+class AsyncBlogRepository:
+    """
+    The blog reads of the async routes (list and get), run on a session
+    provided by `get_async_db`. Each method runs the BlogRepository query
+    through `AsyncSession.run_sync`, so the SQL, the entity cache and the
+    replica routing stay in one place. Writes use the sync BlogRepository.
+    """
+    def __init__(self, db: AsyncSession):
+        """
+        Initialize the AsyncBlogRepository with an async database session.
+
+        Args:
+            db (AsyncSession): SQLAlchemy asyncio database session.
+        """
+        self.db = db
+
+    async def get_version(self) -> int:
+        """Return the current version of the blogs table (see BlogRepository.get_version)."""
+        return await self.db.run_sync(lambda session: BlogRepository(session).get_version())
+
+    async def get_page(self, limit: int, after: tuple[datetime, int] | None = None,
+                       before: tuple[datetime, int] | None = None, with_author: bool = False,
+                       as_rows: bool = False, columns: list | None = None):
+        """
+        Retrieve one page of blogs ordered newest first (see BlogRepository.get_page).
+
+        Returns:
+            tuple[list[Blog | Row], bool]: The blogs in newest-first order and whether
+            more rows exist beyond the page in the direction of travel. Errors
+            are logged by BlogRepository and re-raised.
+        """
+        return await self.db.run_sync(lambda session: BlogRepository(session).get_page(
+            limit, after=after, before=before, with_author=with_author, as_rows=as_rows, columns=columns))
+
+    async def get_by_id(self, blog_id: int, with_author: bool = False, versions: dict[str, int] | None = None):
+        """
+        Retrieve a single blog by its ID, through the entity cache (see BlogRepository.get_by_id).
+
+        Returns:
+            Blog | None: The Blog object if found, otherwise None.
+        """
+        return await self.db.run_sync(
+            lambda session: BlogRepository(session).get_by_id(blog_id, with_author=with_author, versions=versions))
@@ -0,0 +1,99 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user_model import User
+from app.schemas.user_schema import UserCreate
+from app.config.logger import logger
+from fastapi import HTTPException, status
+from app.utils.hashing import Hasher
+from app.repositories.table_version_repository import TableVersionRepository
+from app.repositories.user_repository import UserRepository
+from app.utils.entity_cache import user_cache
+
+class AsyncUserRepository:
+    """
+    The user queries of the async routes (login, registration and user get),
+    run on a session provided by `get_async_db`. Reads by ID run the
+    UserRepository query through `AsyncSession.run_sync`, so they share its
+    entity cache. Everything else uses the sync UserRepository.
+    """
+    def __init__(self, db: AsyncSession):
+        """
+        Initialize the AsyncUserRepository with an async database session.
+
+        Args:
+            db (AsyncSession): SQLAlchemy asyncio database session.
+        """
+        self.db = db
+
+    async def get_version(self) -> int:
+        """Return the current version of the users table (see UserRepository.get_version)."""
+        return await self.db.run_sync(lambda session: UserRepository(session).get_version())
+
+    async def get_by_id(self, user_id: int, versions: dict[str, int] | None = None):
+        """
+        Retrieve a single user by their ID, through the entity cache (see UserRepository.get_by_id).
+
+        Returns:
+            User | None: The User object if found, otherwise None.
+        """
+        return await self.db.run_sync(lambda session: UserRepository(session).get_by_id(user_id, versions=versions))
+
+    async def get_by_email(self, email: str):
+        """
+        Retrieve a single user by their email address.
+
+        Args:
+            email (str): The email of the user to fetch.
+
+        Returns:
+            User | None: The User object if found, otherwise None.
+
+        Raises:
+            Exception: If a database error occurs during the query.
+        """
+        try:
+            return await self.db.scalar(select(User).where(User.email == email).limit(1))
+        except Exception as e:
+            logger.exception("Error fetching user %s: %s", email, e)
+            raise
+
+    async def create(self, user_create: UserCreate):
+        """
+        Create a new user in the database.
+
+        Args:
+            user_create (UserCreate): A Pydantic schema containing the user data (email, full_name, password, etc).
+
+        Returns:
+            User: The newly created User object.
+
+        Raises:
+            HTTPException: If a user with the given email already exists.
+            Exception: If there’s an unexpected error during user creation.
+        """
+        try:
+            existing_user = await self.db.scalar(select(User.id).where(User.email == user_create.email).limit(1))
+            if existing_user:
+                logger.info("User already exists with email: %s", user_create.email)
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"User already exists with email: {user_create.email}"
+                )
+            hashed_password = await Hasher.get_password_hash_async(user_create.password)
+
+            user = User(
+                email=user_create.email,
+                full_name=user_create.full_name,
+                password=hashed_password
+            )
+            self.db.add(user)
+            await self.db.run_sync(lambda session: TableVersionRepository(session).bump("users"))
+            await self.db.commit()
+            user_cache.invalidate(user.id)
+            await self.db.refresh(user)
+            logger.info("User created successfully: %s", user.email)
+            return user
+        except Exception as e:
+            await self.db.rollback()
+            logger.exception("Error creating user %s: %s", user_create.email, e)
+            raise
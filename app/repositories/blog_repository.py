@@ -1,9 +1,44 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from app.models.blog_model import Blog
+from app.repositories.blog_search_repository import BlogSearchRepository
+from app.repositories.table_version_repository import TableVersionRepository
 from app.schemas.blog_schema import BlogCreate, BlogUpdate
 from app.config.logger import logger
+from app.utils.entity_cache import blog_cache, user_cache
+from app.utils.compression import compressed_blogs
 from fastapi import HTTPException, status
 
+EXPORT_COLUMNS = ["id", "title", "slug", "content", "author_id", "created_at"]
+# BlogResponse's fields, in its declared order, for the column-only list path.
+RESPONSE_COLUMNS = [Blog.title, Blog.slug, Blog.content, Blog.id, Blog.author_id, Blog.created_at]
+# Fields a sparse listing may ask for: BlogResponse's, plus an excerpt cut from content in SQL.
+LIST_FIELDS = [column.key for column in RESPONSE_COLUMNS] + ["excerpt"]
+# The keyset cursor is built from these, so sparse listings always select them.
+CURSOR_FIELDS = ("id", "created_at")
+
+
+def list_columns(fields: list[str], excerpt_length: int) -> list:
+    """
+    Build the select list for a sparse listing.
+
+    Args:
+        fields (list[str]): Names from LIST_FIELDS; CURSOR_FIELDS are always added.
+        excerpt_length (int): Characters of content in `excerpt`. One extra
+            character is selected so callers can tell the excerpt was cut.
+
+    Returns:
+        list: Columns in BlogResponse order, with `excerpt` last.
+    """
+    wanted = set(fields).union(CURSOR_FIELDS)
+    columns = [column for column in RESPONSE_COLUMNS if column.key in wanted]
+    if "excerpt" in wanted:
+        columns.append(func.substr(Blog.content, 1, excerpt_length + 1).label("excerpt"))
+    return columns
+
 class BlogRepository:
     """
     Repository class for performing CRUD operations on the Blog model.
@@ -16,6 +51,17 @@ class BlogRepository:
             db (Session): SQLAlchemy database session.
         """
         self.db = db
+        self.search_index = BlogSearchRepository(db)
+        self.versions = TableVersionRepository(db)
+
+    def get_version(self) -> int:
+        """
+        Return the change counter of the blogs table, for building ETags.
+
+        Returns:
+            int: Incremented by every committed write to blogs.
+        """
+        return self.versions.get("blogs")
 
     def get_all(self):
         """
@@ -32,29 +78,124 @@ class BlogRepository:
             logger.info("Fetched all blogs from database.")
             return blogs
         except Exception as e:
-            logger.exception(f"Error fetching blogs: {e}")
+            logger.exception("Error fetching blogs: %s", e)
             raise
 
-    def get_by_id(self, blog_id: int):
+    def iter_export(self, batch_size: int):
+        """
+        Stream every blog as a plain dict without building ORM objects.
+
+        Rows are read through a server-side cursor in batches of `batch_size`,
+        so memory use stays flat regardless of table size.
+
+        Args:
+            batch_size (int): Number of rows fetched from the cursor at a time.
+
+        Yields:
+            dict: One blog row keyed by the names in EXPORT_COLUMNS.
+
+        Raises:
+            Exception: If a database or query error occurs.
+        """
+        try:
+            columns = [getattr(Blog, name) for name in EXPORT_COLUMNS]
+            result = self.db.execute(
+                select(*columns)
+                .order_by(Blog.id)
+                .execution_options(stream_results=True, yield_per=batch_size)
+            )
+            count = 0
+            for row in result.mappings():
+                count += 1
+                yield dict(row)
+            logger.info("Exported %s blogs from database.", count)
+        except Exception as e:
+            logger.exception("Error exporting blogs: %s", e)
+            raise
+
+    def get_page(self, limit: int, after: tuple[datetime, int] | None = None,
+                 before: tuple[datetime, int] | None = None, with_author: bool = False,
+                 as_rows: bool = False, columns: list | None = None):
+        """
+        Retrieve one page of blogs ordered newest first using keyset pagination.
+
+        Pages are addressed by the (created_at, id) of a boundary row rather than
+        by OFFSET, so every page costs a single index range scan regardless of depth.
+
+        Args:
+            limit (int): Maximum number of blogs to return.
+            after (tuple[datetime, int] | None): Return blogs older than this position.
+            before (tuple[datetime, int] | None): Return blogs newer than this position.
+            with_author (bool): Load each blog's author with one extra IN query
+                for the whole page, instead of one lazy query per blog.
+            as_rows (bool): Select only RESPONSE_COLUMNS and return Core rows
+                instead of hydrating Blog objects.
+            columns (list | None): Select these (see list_columns) instead of
+                RESPONSE_COLUMNS; implies `as_rows`. They must include CURSOR_FIELDS.
+
+        Returns:
+            tuple[list[Blog | Row], bool]: The blogs in newest-first order and whether
+            more rows exist beyond the page in the direction of travel.
+
+        Raises:
+            Exception: If a database or query error occurs.
+        """
+        try:
+            key = tuple_(Blog.created_at, Blog.id)
+            as_rows = as_rows or bool(columns)
+            query = self.db.query(*(columns or RESPONSE_COLUMNS)) if as_rows else self.db.query(Blog)
+            if with_author and not as_rows:
+                query = query.options(selectinload(Blog.author))
+            if before is not None:
+                query = query.filter(key > tuple_(*before)).order_by(Blog.created_at.asc(), Blog.id.asc())
+            else:
+                if after is not None:
+                    query = query.filter(key < tuple_(*after))
+                query = query.order_by(Blog.created_at.desc(), Blog.id.desc())
+            blogs = query.limit(limit + 1).all()
+            has_more = len(blogs) > limit
+            blogs = blogs[:limit]
+            if before is not None:
+                blogs.reverse()
+            logger.info("Fetched page of %s blogs from database.", len(blogs))
+            return blogs, has_more
+        except Exception as e:
+            logger.exception("Error fetching blog page: %s", e)
+            raise
+
+    def get_by_id(self, blog_id: int, with_author: bool = False, versions: dict[str, int] | None = None):
         """
         Retrieve a single blog by its ID.
 
         Args:
             blog_id (int): The ID of the blog to retrieve.
+            with_author (bool): Also load the author, so `blog.author` is
+                resolved from the session without a lazy query.
+            versions (dict[str, int] | None): Table versions the caller already
+                read (e.g. for its ETag), so the cached row matches them; the
+                ones needed are read here when omitted.
 
         Returns:
-            Blog | None: The Blog object if found, otherwise None.
+            Blog | None: The Blog object if found, otherwise None. Served from
+            blog_cache when possible.
 
         Raises:
             Exception: If a database or query error occurs.
         """
         try:
-            blog = self.db.query(Blog).filter(Blog.id == blog_id).first()
+            versions = versions or {}
+            blogs_version = versions["blogs"] if "blogs" in versions else self.get_version()
+            blog = blog_cache.load(self.db, blog_id, blogs_version)
             if not blog:
-                logger.warning(f"Blog with id {blog_id} not found.")
+                logger.warning("Blog with id %s not found.", blog_id)
+            elif with_author and blog.author_id is not None:
+                users_version = versions["users"] if "users" in versions else self.versions.get("users")
+                # Attach the (usually cached) author as already-loaded state so
+                # `blog.author` neither queries nor marks the blog dirty.
+                set_committed_value(blog, "author", user_cache.load(self.db, blog.author_id, users_version))
             return blog
         except Exception as e:
-            logger.exception(f"Error fetching blog {blog_id}: {e}")
+            logger.exception("Error fetching blog %s: %s", blog_id, e)
             raise
 
     def create(self, blog_create: BlogCreate,author_id: int):
@@ -78,7 +219,6 @@ class BlogRepository:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Blog with slug '{blog_create.slug}' already exists"
                 )
-            print("author_id: int",author_id)
             blog = Blog(
                 title=blog_create.title,
                 slug=blog_create.slug,
@@ -86,13 +226,110 @@ class BlogRepository:
                 author_id=author_id,
             )
             self.db.add(blog)
+            self.db.flush()
+            self.search_index.index(blog)
+            self.versions.bump("blogs")
             self.db.commit()
+            blog_cache.invalidate(blog.id)
             self.db.refresh(blog)
-            logger.info(f"Blog created successfully: {blog.title}")
+            logger.info("Blog created successfully: %s", blog.title)
             return blog
         except Exception as e:
             self.db.rollback()
-            logger.exception(f"Error creating blog {blog_create.title}: {e}")
+            logger.exception("Error creating blog %s: %s", blog_create.title, e)
+            raise
+
+    def find_existing_slugs(self, slugs: list[str], chunk_size: int) -> set[str]:
+        """
+        Return which of `slugs` are already taken, using one IN query per chunk.
+
+        Args:
+            slugs (list[str]): Candidate slugs.
+            chunk_size (int): Maximum number of bound parameters per query.
+
+        Returns:
+            set[str]: The subset of `slugs` that already exists.
+        """
+        existing = set()
+        for start in range(0, len(slugs), chunk_size):
+            chunk = slugs[start:start + chunk_size]
+            existing.update(self.db.execute(select(Blog.slug).where(Blog.slug.in_(chunk))).scalars())
+        return existing
+
+    def bulk_create(self, items: list[BlogCreate], author_id: int, chunk_size: int, atomic: bool):
+        """
+        Insert many blogs with set-based conflict detection and batched inserts.
+
+        Slug conflicts (against the table or earlier items in the same payload)
+        are found before anything is written. Rows are then inserted with
+        multi-row INSERT ... RETURNING statements of `chunk_size` rows each.
+        In atomic mode any conflict or error inserts nothing; otherwise each
+        chunk runs in its own savepoint so a failing chunk does not undo others.
+
+        Args:
+            items (list[BlogCreate]): The blogs to create.
+            author_id (int): The ID of the user authoring the blogs.
+            chunk_size (int): Rows per INSERT batch (and per savepoint).
+            atomic (bool): All-or-nothing when True, partial success when False.
+
+        Returns:
+            list[dict]: One result per item, in request order, with index, slug,
+            status ("created", "conflict", "failed" or "skipped"), id and error.
+
+        Raises:
+            Exception: In atomic mode, if an unexpected error occurs while inserting.
+        """
+        results = [{"index": i, "slug": item.slug, "status": "skipped", "id": None, "error": None}
+                   for i, item in enumerate(items)]
+        try:
+            existing = self.find_existing_slugs(list({item.slug for item in items}), chunk_size)
+            seen = set()
+            pending = []
+            for i, item in enumerate(items):
+                if item.slug in existing:
+                    results[i].update(status="conflict", error=f"Blog with slug '{item.slug}' already exists")
+                elif item.slug in seen:
+                    results[i].update(status="conflict", error=f"Slug '{item.slug}' is repeated in this request")
+                else:
+                    seen.add(item.slug)
+                    pending.append(i)
+
+            conflicts = len(items) - len(pending)
+            if atomic and conflicts:
+                logger.warning("Bulk create aborted: %s slug conflicts.", conflicts)
+                return results
+
+            for start in range(0, len(pending), chunk_size):
+                chunk = pending[start:start + chunk_size]
+                rows = [{"title": items[i].title, "slug": items[i].slug, "content": items[i].content,
+                         "author_id": author_id} for i in chunk]
+                statement = insert(Blog).returning(Blog.id, sort_by_parameter_order=True)
+                if atomic:
+                    ids = self.db.execute(statement, rows).scalars().all()
+                else:
+                    try:
+                        with self.db.begin_nested():
+                            ids = self.db.execute(statement, rows).scalars().all()
+                    except IntegrityError as e:
+                        logger.warning("Bulk create chunk at item %s failed: %s", chunk[0], e.orig)
+                        for i in chunk:
+                            results[i].update(status="failed", error="Conflicting write, retry this item")
+                        continue
+                for i, row, blog_id in zip(chunk, rows, ids):
+                    row["id"] = blog_id
+                    results[i].update(status="created", id=blog_id)
+                self.search_index.index_many(rows)
+
+            created = sum(1 for result in results if result["status"] == "created")
+            if created:
+                self.versions.bump("blogs")
+            self.db.commit()
+            blog_cache.invalidate(*(result["id"] for result in results if result["status"] == "created"))
+            logger.info("Bulk created %s of %s blogs.", created, len(items))
+            return results
+        except Exception as e:
+            self.db.rollback()
+            logger.exception("Error bulk creating blogs: %s", e)
             raise
 
     def update(self, blog: Blog, blog_update: BlogUpdate):
@@ -112,13 +349,18 @@ class BlogRepository:
         try:
             for key, value in blog_update.dict(exclude_unset=True).items():
                 setattr(blog, key, value)
+            self.db.flush()
+            self.search_index.index(blog)
+            self.versions.bump("blogs")
             self.db.commit()
+            blog_cache.invalidate(blog.id)
+            compressed_blogs.invalidate(blog.id)
             self.db.refresh(blog)
-            logger.info(f"Blog updated successfully: {blog.id}")
+            logger.info("Blog updated successfully: %s", blog.id)
             return blog
         except Exception as e:
             self.db.rollback()
-            logger.exception(f"Error updating blog {blog.id}: {e}")
+            logger.exception("Error updating blog %s: %s", blog.id, e)
             raise
 
     def delete(self, blog: Blog):
@@ -135,11 +377,15 @@ class BlogRepository:
             Exception: If an error occurs during deletion.
         """
         try:
+            self.search_index.remove(blog.id)
             self.db.delete(blog)
+            self.versions.bump("blogs")
             self.db.commit()
-            logger.info(f"Blog deleted successfully: {blog.id}")
+            blog_cache.invalidate(blog.id)
+            compressed_blogs.invalidate(blog.id)
+            logger.info("Blog deleted successfully: %s", blog.id)
             return blog
         except Exception as e:
             self.db.rollback()
-            logger.exception(f"Error deleting blog {blog.id}: {e}")
+            logger.exception("Error deleting blog %s: %s", blog.id, e)
             raise
@@ -0,0 +1,235 @@
+import html
+import re
+import time
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from app.models.blog_model import Blog
+from app.config.logger import logger
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+# The database brackets matches with these control characters; the snippet is
+# then HTML-escaped and they become HIGHLIGHT_START / HIGHLIGHT_STOP, so the
+# author's own markup is never passed through.
+MATCH_START = "\x02"
+MATCH_STOP = "\x03"
+
+# Postgres: a stored generated tsvector (title weighted above content) with a GIN index.
+POSTGRES_SCHEMA = [
+    """
+    ALTER TABLE blogs ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_blogs_search_vector ON blogs USING GIN (search_vector)",
+]
+
+# SQLite: an FTS5 table keyed by blog id, maintained by the repository write paths.
+SQLITE_SCHEMA = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS blogs_fts USING fts5(title, content, tokenize='porter unicode61')",
+    """
+    INSERT INTO blogs_fts (rowid, title, content)
+    SELECT id, title, coalesce(content, '') FROM blogs
+    WHERE id NOT IN (SELECT rowid FROM blogs_fts)
+    """,
+]
+
+POSTGRES_HEADLINE_OPTIONS = (
+    f'MaxFragments=2, MaxWords=20, MinWords=5, FragmentDelimiter=" … ", '
+    f'StartSel={MATCH_START}, StopSel={MATCH_STOP}'
+)
+
+POSTGRES_SEARCH = """
+    SELECT b.id, b.title, b.slug, b.author_id, b.created_at, hits.rank,
+           ts_headline('english', b.title || ' … ' || coalesce(b.content, ''), hits.query,
+                       :headline_options) AS snippet
+    FROM (
+        SELECT id, query, ts_rank_cd(search_vector, query) AS rank
+        FROM blogs, websearch_to_tsquery('english', :q) AS query
+        WHERE search_vector @@ query
+        ORDER BY rank DESC, id DESC
+        LIMIT :limit OFFSET :offset
+    ) AS hits
+    JOIN blogs b ON b.id = hits.id
+    ORDER BY hits.rank DESC, b.id DESC
+"""
+
+SQLITE_SEARCH = """
+    SELECT b.id, b.title, b.slug, b.author_id, b.created_at,
+           -bm25(blogs_fts, 10.0, 1.0) AS rank,
+           snippet(blogs_fts, -1, :match_start, :match_stop, ' … ', 20) AS snippet
+    FROM blogs_fts
+    JOIN blogs b ON b.id = blogs_fts.rowid
+    WHERE blogs_fts MATCH :q
+    ORDER BY rank DESC, b.id DESC
+    LIMIT :limit OFFSET :offset
+"""
+
+
+class BlogSearchRepository:
+    """
+    Full-text search over blog titles and content.
+
+    Uses a generated tsvector column with a GIN index on Postgres and an
+    FTS5 virtual table on SQLite. On Postgres the index maintains itself; on
+    SQLite `index` / `remove` must run in the same transaction as the blog
+    write, which BlogRepository does.
+    """
+    def __init__(self, db: Session):
+        """
+        Initialize the BlogSearchRepository with a database session.
+
+        Args:
+            db (Session): SQLAlchemy database session.
+        """
+        self.db = db
+
+    @staticmethod
+    def ensure_schema(bind: Engine | Connection):
+        """
+        Create the dialect-specific search column/table and index if missing.
+
+        Not run at startup: migration e7b3f05c92a8 creates the same objects,
+        and tests call this on databases built with create_all.
+
+        Args:
+            bind (Engine | Connection): Engine or connection to run the DDL on.
+        """
+        statements = {"postgresql": POSTGRES_SCHEMA, "sqlite": SQLITE_SCHEMA}.get(bind.dialect.name)
+        if statements is None:
+            logger.warning("Full-text search is not supported on %s.", bind.dialect.name)
+            return
+        if isinstance(bind, Engine):
+            with bind.begin() as conn:
+                for statement in statements:
+                    conn.execute(text(statement))
+        else:
+            for statement in statements:
+                bind.execute(text(statement))
+
+    def _dialect(self) -> str:
+        return self.db.get_bind(clause=Blog.__table__.select()).dialect.name
+
+    def index(self, blog: Blog):
+        """
+        Add or refresh a blog in the search index. The blog must have been flushed.
+
+        Args:
+            blog (Blog): The blog whose title/content should be searchable.
+        """
+        if self._dialect() != "sqlite":
+            return
+        self.db.execute(text("DELETE FROM blogs_fts WHERE rowid = :id"), {"id": blog.id})
+        self.db.execute(
+            text("INSERT INTO blogs_fts (rowid, title, content) VALUES (:id, :title, :content)"),
+            {"id": blog.id, "title": blog.title, "content": blog.content or ""},
+        )
+
+    def index_many(self, rows: list[dict]):
+        """
+        Add freshly inserted blogs to the search index in one batch.
+
+        Args:
+            rows (list[dict]): Dicts with id, title and content keys.
+        """
+        if not rows or self._dialect() != "sqlite":
+            return
+        self.db.execute(
+            text("INSERT INTO blogs_fts (rowid, title, content) VALUES (:id, :title, :content)"),
+            [{"id": row["id"], "title": row["title"], "content": row["content"] or ""} for row in rows],
+        )
+
+    def remove(self, blog_id: int):
+        """
+        Remove a blog from the search index.
+
+        Args:
+            blog_id (int): The ID of the blog being deleted.
+        """
+        if self._dialect() != "sqlite":
+            return
+        self.db.execute(text("DELETE FROM blogs_fts WHERE rowid = :id"), {"id": blog_id})
+
+    @staticmethod
+    def _highlight(snippet: str | None) -> str | None:
+        # Escape the stored text first, then turn the match brackets into markup.
+        if snippet is None:
+            return None
+        escaped = html.escape(snippet)
+        return escaped.replace(MATCH_START, HIGHLIGHT_START).replace(MATCH_STOP, HIGHLIGHT_STOP)
+
+    @staticmethod
+    def _fts5_query(q: str) -> str:
+        # Quote every term so user input can never be parsed as FTS5 syntax.
+        return " ".join(f'"{term}"' for term in re.findall(r"\w+", q))
+
+    def search(self, q: str, limit: int, offset: int, budget_ms: int):
+        """
+        Rank blogs matching `q` and return highlighted snippets.
+
+        Args:
+            q (str): Free-text query.
+            limit (int): Maximum number of results.
+            offset (int): Number of ranked results to skip.
+            budget_ms (int): Time the database may spend on the query.
+
+        Returns:
+            list[dict]: Matching blogs (id, title, slug, author_id, created_at,
+            rank, snippet), best match first. The snippet is cut from the title
+            or the content, whichever matched best, so title-only matches are
+            highlighted too. It is HTML: the text is escaped and only the
+            HIGHLIGHT_START / HIGHLIGHT_STOP tags are markup.
+
+        Raises:
+            HTTPException: 504 error if the query exceeds its latency budget.
+            Exception: If a database or query error occurs.
+        """
+        dialect = self._dialect()
+        params = {"q": q, "limit": limit, "offset": offset}
+        try:
+            if dialect == "postgresql":
+                self.db.execute(text(f"SET LOCAL statement_timeout = {int(budget_ms)}"))
+                params["headline_options"] = POSTGRES_HEADLINE_OPTIONS
+                rows = self.db.execute(text(POSTGRES_SEARCH), params).mappings().all()
+            elif dialect == "sqlite":
+                params["q"] = self._fts5_query(q)
+                if not params["q"]:
+                    return []
+                params.update(match_start=MATCH_START, match_stop=MATCH_STOP)
+                rows = self._run_sqlite_with_budget(text(SQLITE_SEARCH), params, budget_ms)
+            else:
+                raise HTTPException(
+                    status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                    detail="Search is not available on this database"
+                )
+            logger.info("Search for '%s' returned %s blogs.", q, len(rows))
+            return [{**row, "snippet": self._highlight(row["snippet"])} for row in rows]
+        except OperationalError as e:
+            if "statement timeout" in str(e) or "interrupted" in str(e):
+                logger.warning("Search for '%s' exceeded its %s ms budget.", q, budget_ms)
+                raise HTTPException(
+                    status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                    detail="Search exceeded its latency budget; refine the query"
+                )
+            logger.exception("Error searching blogs for '%s': %s", q, e)
+            raise
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.exception("Error searching blogs for '%s': %s", q, e)
+            raise
+
+    def _run_sqlite_with_budget(self, statement, params: dict, budget_ms: int):
+        # SQLite has no statement timeout; abort from its progress callback instead.
+        dbapi_conn = self.db.connection().connection.dbapi_connection
+        deadline = time.perf_counter() + budget_ms / 1000
+        dbapi_conn.set_progress_handler(lambda: int(time.perf_counter() > deadline), 1000)
+        try:
+            return self.db.execute(statement, params).mappings().all()
+        finally:
+            dbapi_conn.set_progress_handler(None, 0)
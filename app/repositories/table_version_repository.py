@@ -0,0 +1,70 @@
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.table_version_model import TableVersion
+from app.config.logger import logger
+
+
+class TableVersionRepository:
+    """
+    Reads and bumps the per-table change counters behind conditional GETs.
+
+    Writers call `bump` before committing, so a reader that sees a version
+    also sees every row written under it. The cost is that the bump's row
+    lock is held until commit: on Postgres, concurrent writes to the same
+    table queue on its version row for the rest of their transaction. Keep
+    writes short after `bump`, and call it as late as possible before commit.
+    """
+    def __init__(self, db: Session):
+        """
+        Initialize the TableVersionRepository with a database session.
+
+        Args:
+            db (Session): SQLAlchemy database session.
+        """
+        self.db = db
+
+    def get(self, table_name: str, bind_arguments: dict | None = None) -> int:
+        """
+        Return the current version of a table (0 if it was never written).
+
+        Args:
+            table_name (str): Name of the table, e.g. "blogs".
+            bind_arguments (dict | None): Passed to the session, e.g.
+                primary_bind_arguments(db) to read the primary's counter.
+
+        Returns:
+            int: The table's change counter.
+
+        Raises:
+            Exception: If a database or query error occurs.
+        """
+        try:
+            version = self.db.scalar(select(TableVersion.version).where(TableVersion.table_name == table_name),
+                                     bind_arguments=bind_arguments)
+            return version or 0
+        except Exception as e:
+            logger.exception("Error reading version of table %s: %s", table_name, e)
+            raise
+
+    def bump(self, *table_names: str):
+        """
+        Increment the version of each table inside the caller's transaction.
+
+        Args:
+            *table_names (str): Names of the tables that were written.
+        """
+        for table_name in table_names:
+            statement = (
+                update(TableVersion)
+                .where(TableVersion.table_name == table_name)
+                .values(version=TableVersion.version + 1)
+            )
+            if self.db.execute(statement).rowcount:
+                continue
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(TableVersion).values(table_name=table_name, version=1))
+            except IntegrityError:
+                # Another writer created the row first; count on top of it.
+                self.db.execute(statement)
@@ -1,9 +1,20 @@
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.models.user_model import User
 from app.schemas.user_schema import UserCreate, UserUpdate
 from app.config.logger import logger
 from fastapi import HTTPException, status
 from app.utils.hashing import Hasher
+from app.repositories.table_version_repository import TableVersionRepository
+from app.utils.entity_cache import blog_cache, user_cache
+from app.utils.compression import compressed_blogs
+from app.utils.identity_cache import evict_identity
+
+# The password hash is deliberately never exported.
+EXPORT_COLUMNS = ["id", "email", "full_name", "created_at", "updated_at"]
+# UserResponse's fields, in its declared order, for the column-only list path.
+RESPONSE_COLUMNS = [User.email, User.full_name, User.id, User.created_at, User.updated_at]
 
 class UserRepository:
     """
@@ -17,45 +28,96 @@ class UserRepository:
             db (Session): SQLAlchemy database session for performing queries.
         """
         self.db = db
+        self.versions = TableVersionRepository(db)
+
+    def get_version(self) -> int:
+        """
+        Return the change counter of the users table, for building ETags.
+
+        Returns:
+            int: Incremented by every committed write to users.
+        """
+        return self.versions.get("users")
 
-    def get_all(self):
+    def get_all(self, as_rows: bool = False):
         """
         Retrieve all users from the database.
 
+        Args:
+            as_rows (bool): Select only RESPONSE_COLUMNS (never the password) and
+                return Core rows instead of hydrating User objects.
+
         Returns:
-            list[User]: A list of all User objects stored in the database.
+            list[User | Row]: All users stored in the database.
 
         Raises:
             Exception: If a database or query error occurs.
         """
         try:
-            users = self.db.query(User).all()
+            users = self.db.query(*RESPONSE_COLUMNS).all() if as_rows else self.db.query(User).all()
             logger.info("Fetched all users from database.")
             return users
         except Exception as e:
-            logger.exception(f"Error fetching users: {e}")
+            logger.exception("Error fetching users: %s", e)
+            raise
+
+    def iter_export(self, batch_size: int):
+        """
+        Stream every user as a plain dict without building ORM objects.
+
+        Rows are read through a server-side cursor in batches of `batch_size`,
+        so memory use stays flat regardless of table size.
+
+        Args:
+            batch_size (int): Number of rows fetched from the cursor at a time.
+
+        Yields:
+            dict: One user row keyed by the names in EXPORT_COLUMNS.
+
+        Raises:
+            Exception: If a database or query error occurs.
+        """
+        try:
+            columns = [getattr(User, name) for name in EXPORT_COLUMNS]
+            result = self.db.execute(
+                select(*columns)
+                .order_by(User.id)
+                .execution_options(stream_results=True, yield_per=batch_size)
+            )
+            count = 0
+            for row in result.mappings():
+                count += 1
+                yield dict(row)
+            logger.info("Exported %s users from database.", count)
+        except Exception as e:
+            logger.exception("Error exporting users: %s", e)
             raise
 
-    def get_by_id(self, user_id: int):
+    def get_by_id(self, user_id: int, versions: dict[str, int] | None = None):
         """
         Retrieve a single user by their ID.
 
         Args:
             user_id (int): The ID of the user to fetch.
+            versions (dict[str, int] | None): Table versions the caller already
+                read (e.g. for its ETag); the users version is read here when omitted.
 
         Returns:
-            User | None: The User object if found, otherwise None.
+            User | None: The User object if found, otherwise None. Served from
+            user_cache when possible.
 
         Raises:
             Exception: If a database error occurs during the query.
         """
         try:
-            user = self.db.query(User).filter(User.id == user_id).first()
+            versions = versions or {}
+            users_version = versions["users"] if "users" in versions else self.get_version()
+            user = user_cache.load(self.db, user_id, users_version)
             if not user:
-                logger.warning(f"User with id {user_id} not found.")
+                logger.warning("User with id %s not found.", user_id)
             return user
         except Exception as e:
-            logger.exception(f"Error fetching user {user_id}: {e}")
+            logger.exception("Error fetching user %s: %s", user_id, e)
             raise
 
     def create(self, user_create: UserCreate):
@@ -75,7 +137,7 @@ class UserRepository:
         try:
             existing_user = self.db.query(User).filter(User.email == user_create.email).first()
             if existing_user:
-                logger.info(f"User already exists with email: {user_create.email}")
+                logger.info("User already exists with email: %s", user_create.email)
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"User already exists with email: {user_create.email}"
@@ -88,13 +150,71 @@ class UserRepository:
                 password=hashed_password
             )
             self.db.add(user)
+            self.versions.bump("users")
             self.db.commit()
+            user_cache.invalidate(user.id)
             self.db.refresh(user)
-            logger.info(f"User created successfully: {user.email}")
+            logger.info("User created successfully: %s", user.email)
             return user
         except Exception as e:
             self.db.rollback()
-            logger.exception(f"Error creating user {user_create.email}: {e}")
+            logger.exception("Error creating user %s: %s", user_create.email, e)
+            raise
+
+    def find_existing_emails(self, emails: list[str], chunk_size: int) -> set[str]:
+        """
+        Return which of `emails` are already registered, using one IN query per chunk.
+
+        Args:
+            emails (list[str]): Candidate emails.
+            chunk_size (int): Maximum number of bound parameters per query.
+
+        Returns:
+            set[str]: The subset of `emails` that already exists.
+        """
+        existing = set()
+        for start in range(0, len(emails), chunk_size):
+            chunk = emails[start:start + chunk_size]
+            existing.update(self.db.execute(select(User.email).where(User.email.in_(chunk))).scalars())
+        return existing
+
+    def bulk_insert(self, rows: list[dict], chunk_size: int):
+        """
+        Insert pre-validated users with already-hashed passwords in batches.
+
+        Each batch is one multi-row INSERT ... RETURNING inside its own
+        savepoint, so a batch that hits a concurrent duplicate fails alone.
+
+        Args:
+            rows (list[dict]): Dicts with email, full_name and password (hashed).
+            chunk_size (int): Rows per INSERT batch.
+
+        Returns:
+            list[int | None]: The new user ID for each row, or None if its batch failed.
+
+        Raises:
+            Exception: If an unexpected database error occurs.
+        """
+        ids = []
+        try:
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                try:
+                    with self.db.begin_nested():
+                        statement = insert(User).returning(User.id, sort_by_parameter_order=True)
+                        ids.extend(self.db.execute(statement, chunk).scalars().all())
+                except IntegrityError as e:
+                    logger.warning("Bulk user insert batch at row %s failed: %s", start, e.orig)
+                    ids.extend([None] * len(chunk))
+            if any(ids):
+                self.versions.bump("users")
+            self.db.commit()
+            user_cache.invalidate(*(user_id for user_id in ids if user_id is not None))
+            logger.info("Bulk inserted %s of %s users.", sum(1 for i in ids if i), len(rows))
+            return ids
+        except Exception as e:
+            self.db.rollback()
+            logger.exception("Error bulk inserting users: %s", e)
             raise
 
     def update(self, user: User, user_update: UserUpdate):
@@ -112,15 +232,19 @@ class UserRepository:
             Exception: If a database error occurs during the update.
         """
         try:
+            previous_email = user.email
             for key, value in user_update.dict().items():
                 setattr(user, key, value)
+            self.versions.bump("users")
             self.db.commit()
+            evict_identity(previous_email, user_update.email)
+            user_cache.invalidate(user.id)
             self.db.refresh(user)
-            logger.info(f"User updated successfully: {user.id}")
+            logger.info("User updated successfully: %s", user.id)
             return user
         except Exception as e:
             self.db.rollback()
-            logger.exception(f"Error updating user {user.id}: {e}")
+            logger.exception("Error updating user %s: %s", user.id, e)
             raise
 
     def delete(self, user: User):
@@ -137,11 +261,18 @@ class UserRepository:
             Exception: If a database error occurs during deletion.
         """
         try:
+            # Deleting a user also clears author_id on their blogs.
+            blog_ids = [blog.id for blog in user.blogs]
             self.db.delete(user)
+            self.versions.bump("users", "blogs")
             self.db.commit()
-            logger.info(f"User deleted successfully: {user.id}")
+            evict_identity(user.email)
+            user_cache.invalidate(user.id)
+            blog_cache.invalidate(*blog_ids)
+            compressed_blogs.invalidate(*blog_ids)
+            logger.info("User deleted successfully: %s", user.id)
             return user
         except Exception as e:
             self.db.rollback()
-            logger.exception(f"Error deleting user {user.id}: {e}")
+            logger.exception("Error deleting user %s: %s", user.id, e)
             raise
@@ -1,19 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlalchemy.orm import Session
-from app.config.dbconf import SessionLocal
-from app.controllers.auth_controller import authenticate_user, create_access_token
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.controllers.auth_controller import authenticate_user, create_access_token, register_user
 from app.schemas.auth_schema import Token, LoginSchema
 from app.config.config import settings
 from app.schemas.user_schema import UserCreate, UserUpdate, UserResponse
-from app.controllers.user_controller import UserController
-from app.config.dbconf import get_db
+from app.config.dbconf import get_async_db
+from app.middleware.admission_control import limit_auth_concurrency
+from app.utils.profiling import ProfiledRoute
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=ProfiledRoute)
 
 
-@router.post("/login", response_model=Token)
-def login(response: Response, payload: LoginSchema, db: Session = Depends(get_db)):
-    user = authenticate_user(db, payload.email, payload.password)
+@router.post("/login", response_model=Token, dependencies=[Depends(limit_auth_concurrency)])
+async def login(response: Response, payload: LoginSchema, db: AsyncSession = Depends(get_async_db)):
+    user = await authenticate_user(db, payload.email, payload.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -32,20 +32,19 @@ def login(response: Response, payload: LoginSchema, db: Session = Depends(get_db
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-@router.post("/register", response_model=UserResponse)
-def create_user(user_create: UserCreate, db: Session = Depends(get_db)):
+@router.post("/register", response_model=UserResponse, dependencies=[Depends(limit_auth_concurrency)])
+async def create_user(user_create: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new user record in the database.
 
     Args:
         user_create (UserCreate): Schema containing user creation data (e.g., email, password).
-        db (Session): Database session provided by the dependency injection system.
+        db (AsyncSession): Async database session provided by the dependency injection system.
 
     Returns:
         UserResponse: The newly created user's details.
     """
-    controller = UserController(db)
-    return controller.create_user(user_create)
+    return await register_user(db, user_create)
 
 @router.post("/logout")
 def logout(response: Response):
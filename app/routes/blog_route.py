@@ -1,52 +1,178 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.config.dbconf import SessionLocal
-from app.controllers.blog_controller import BlogController
-from app.schemas.blog_schema import BlogCreate, BlogUpdate, BlogResponse
-from app.middleware.auth_middleware import get_current_user
+from app.controllers.blog_controller import AsyncBlogController, BlogController
+from app.schemas.blog_schema import BlogCreate, BlogUpdate, BlogResponse, BlogPage, BlogSearchPage, BlogBulkCreate, BlogBulkResult, BlogWithAuthor, BlogPageWithAuthor
+from app.middleware.auth_middleware import get_current_user, get_current_user_async
 from app.schemas.user_schema import UserResponse
-from app.config.dbconf import get_db
+from app.config.dbconf import get_async_db, get_db
+from app.config.config import settings
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.export import ExportFormat, EXPORT_BATCH_SIZE, export_response
+from app.utils.etag import make_etag, check_etag
+from app.utils.fast_json import dumps, json_response
+from app.utils.fieldsets import parse_fields
+from app.utils.compression import compressed_blogs, compressed_response, negotiate
+from app.repositories.blog_repository import EXPORT_COLUMNS, LIST_FIELDS
+from app.utils.profiling import ProfiledRoute
 
-router = APIRouter(prefix="/blogs", tags=["Blogs"])
+router = APIRouter(prefix="/blogs", tags=["Blogs"], route_class=ProfiledRoute)
 
-@router.get("/", response_model=list[BlogResponse])
-def list_blogs(db: Session = Depends(get_db),current_user: UserResponse = Depends(get_current_user)):
+Include = Literal["author"]
+
+def expanded_response(model, data, response: Response) -> Response:
+    """
+    Serialize `data` as `model`, which extends the route's response_model
+    with embedded relations, keeping headers already set on `response`.
+    """
+    body = model.model_validate(data, from_attributes=True).model_dump_json()
+    return json_response(body.encode("utf-8"), response)
+
+@router.get("/", response_model=BlogPage)
+async def list_blogs(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
+    before: str | None = None,
+    include: Include | None = None,
+    fields: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserResponse = Depends(get_current_user_async),
+):
+    """
+    Retrieve a page of blogs, newest first, using cursor pagination.
+
+    Args:
+        limit (int): Maximum number of blogs to return in the page.
+        after (str | None): Opaque cursor; return blogs older than it (next page).
+        before (str | None): Opaque cursor; return blogs newer than it (previous page).
+        include (str | None): "author" embeds each blog's author (id, email,
+            full_name), loaded with one extra query for the whole page.
+        fields (str | None): Comma-separated subset of BlogResponse's fields and
+            "excerpt" (the first BLOG_EXCERPT_LENGTH characters of content).
+            Only those columns, plus id and created_at, are selected and returned.
+        db (AsyncSession): The async SQLAlchemy session dependency for database access.
+
+    Returns:
+        BlogPage: The blogs in the page plus `next_cursor` / `prev_cursor`
+        values to pass as `after` / `before` for the adjacent pages. Tagged
+        with an ETag; a matching If-None-Match gets an empty 304 instead.
+
+    Raises:
+        HTTPException: 400 error if both cursors are given, a cursor is malformed,
+        a field is unknown, or `fields` is combined with `include`.
     """
-    Retrieve a list of all blogs from the database.
+    if after and before:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only one of 'after' or 'before' may be given"
+        )
+    if fields is not None and include:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'fields' cannot be combined with 'include'"
+        )
+    field_names = parse_fields(fields, LIST_FIELDS) if fields is not None else None
+    include_author = include == "author"
+    controller = AsyncBlogController(db)
+    not_modified = check_etag(request, response, make_etag(await controller.get_versions(include_author)))
+    if not_modified:
+        return not_modified
+    if include_author:
+        page = await controller.get_blogs(limit, after=after, before=before, include_author=True)
+        return expanded_response(BlogPageWithAuthor, page, response)
+    # Fast path: column rows encoded straight to JSON, skipping ORM objects and re-validation.
+    page = await controller.get_blogs(limit, after=after, before=before, as_rows=True, fields=field_names)
+    return json_response(dumps(page), response)
+
+@router.get("/search", response_model=BlogSearchPage)
+def search_blogs(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=1000),
+    budget_ms: int | None = Query(None, ge=1, le=settings.SEARCH_MAX_BUDGET_MS),
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """
+    Full-text search over blog titles and content, best match first.
 
     Args:
+        q (str): Free-text query; on Postgres it accepts web-search syntax
+            ("quoted phrases", -excluded, OR).
+        limit (int): Maximum number of results in the page.
+        offset (int): Number of ranked results to skip (use `next_offset`).
+        budget_ms (int | None): Latency budget for the query; defaults to SEARCH_BUDGET_MS.
         db (Session): The SQLAlchemy session dependency for database access.
 
     Returns:
-        list[BlogResponse]: A list of blog objects containing details such as
-        title, content, author, and timestamps.
+        BlogSearchPage: Ranked results with highlighted snippets.
 
     Raises:
-        HTTPException: None explicitly raised here, but may propagate from the controller.
+        HTTPException: 504 error if the search exceeds its latency budget.
+    """
+    controller = BlogController(db)
+    return controller.search_blogs(q, limit, offset, budget_ms or settings.SEARCH_BUDGET_MS)
+
+@router.get("/export")
+def export_blogs(fmt: ExportFormat = Query("ndjson", alias="format"), db: Session = Depends(get_db),current_user: UserResponse = Depends(get_current_user)):
+    """
+    Stream every blog as NDJSON or CSV.
+
+    Rows are read through a server-side cursor and written to the client in
+    batches, so memory use does not grow with the size of the table.
+
+    Args:
+        fmt (str): Output format, "ndjson" (default) or "csv".
+        db (Session): The SQLAlchemy session dependency for database access.
+
+    Returns:
+        StreamingResponse: The exported rows as an attachment.
     """
     controller = BlogController(db)
-    return controller.get_blogs()
+    rows = controller.export_blogs(EXPORT_BATCH_SIZE)
+    return export_response(rows, EXPORT_COLUMNS, fmt, "blogs")
 
 @router.get("/{blog_id}", response_model=BlogResponse)
-def get_blog(blog_id: int, db: Session = Depends(get_db),current_user: UserResponse = Depends(get_current_user)):
+async def get_blog(blog_id: int, request: Request, response: Response, include: Include | None = None, db: AsyncSession = Depends(get_async_db),current_user: UserResponse = Depends(get_current_user_async)):
     """
     Retrieve a specific blog by its ID.
 
     Args:
         blog_id (int): The unique identifier of the blog to retrieve.
-        db (Session): The SQLAlchemy session dependency for database access.
+        include (str | None): "author" embeds the blog's author (id, email, full_name).
+        db (AsyncSession): The async SQLAlchemy session dependency for database access.
 
     Returns:
-        BlogResponse: The details of the requested blog.
+        BlogResponse: The details of the requested blog, tagged with an ETag;
+        a matching If-None-Match gets an empty 304 instead. Large bodies are
+        compressed once per distinct body and encoding, off the event loop,
+        and then served from compressed_blogs.
 
     Raises:
         HTTPException: 404 error if the blog with the given ID is not found.
     """
-    controller = BlogController(db)
-    blog = controller.get_blog(blog_id)
+    include_author = include == "author"
+    controller = AsyncBlogController(db)
+    versions = await controller.get_versions(include_author)
+    not_modified = check_etag(request, response, make_etag(versions, resource=f"blog-{blog_id}"))
+    if not_modified:
+        return not_modified
+    # The same versions select the cached row, so the body never predates its ETag.
+    blog = await controller.get_blog(blog_id, include_author=include_author, versions=versions)
     if not blog:
         raise HTTPException(status_code=404, detail="Blog not found")
-    return blog
+    if include_author:
+        return expanded_response(BlogWithAuthor, blog, response)
+    encoding = negotiate(request.headers.get("accept-encoding", ""))
+    if not encoding:
+        return blog
+    body = BlogResponse.model_validate(blog, from_attributes=True).model_dump_json().encode("utf-8")
+    if len(body) < settings.COMPRESSION_MIN_SIZE:
+        return json_response(body, response)
+    return compressed_response(await compressed_blogs.compress_async(blog_id, encoding, body), encoding, response)
 
 @router.post("/", response_model=BlogResponse)
 def create_blog(blog_create: BlogCreate, db: Session = Depends(get_db),current_user: UserResponse = Depends(get_current_user)):
@@ -67,6 +193,30 @@ def create_blog(blog_create: BlogCreate, db: Session = Depends(get_db),current_u
 
     return controller.create_blog(BlogCreate(**blog_data),author_id=current_user.id)
 
+@router.post("/bulk", response_model=BlogBulkResult)
+def bulk_create_blogs(payload: BlogBulkCreate, response: Response, db: Session = Depends(get_db),current_user: UserResponse = Depends(get_current_user)):
+    """
+    Create many blogs in one request.
+
+    Slug conflicts are checked with one set-based query and rows are inserted
+    in batches of BULK_INSERT_CHUNK_SIZE. In "atomic" mode (default) nothing
+    is inserted unless every item can be; in "partial" mode valid items are
+    inserted and the rest reported.
+
+    Args:
+        payload (BlogBulkCreate): The blogs to create and the bulk mode.
+        db (Session): The SQLAlchemy session dependency for database access.
+
+    Returns:
+        BlogBulkResult: Counts plus a per-item status. Responds 409 when an
+        atomic request was rejected because of conflicts.
+    """
+    controller = BlogController(db)
+    result = controller.bulk_create_blogs(payload, author_id=current_user.id)
+    if payload.mode == "atomic" and result["failed"]:
+        response.status_code = status.HTTP_409_CONFLICT
+    return result
+
 @router.put("/{blog_id}", response_model=BlogResponse)
 def update_blog(blog_id: int, blog_update: BlogUpdate, db: Session = Depends(get_db),current_user: UserResponse = Depends(get_current_user)):
     """
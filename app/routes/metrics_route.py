@@ -0,0 +1,144 @@
+import hmac
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from app.config.config import settings
+from app.config.db_pool import pool_metrics
+from app.config.dbconf import database
+from app.config.logger import log_stats
+from app.middleware.admission_control import auth_admission
+from app.middleware.metrics import HTTP_FAMILIES
+from app.utils.compression import compressed_blogs
+from app.utils.entity_cache import blog_cache, user_cache
+from app.utils.hashing import hashing_service
+from app.utils.identity_cache import identity_cache
+from app.utils.prometheus import CONTENT_TYPE, render_family, render_samples
+from app.utils.profiling import ProfiledRoute
+
+router = APIRouter(tags=["Metrics"], route_class=ProfiledRoute)
+
+# (metric suffix, stats key, help, type) for the per-pool series.
+POOL_SERIES = [
+    ("size", "size", "Configured pool size.", "gauge"),
+    ("checked_out", "checked_out", "Connections currently checked out.", "gauge"),
+    ("overflow", "overflow", "Overflow connections currently open.", "gauge"),
+    ("checkouts_total", "checkouts", "Connection checkouts.", "counter"),
+    ("checkout_timeouts_total", "checkout_timeouts", "Checkouts that timed out waiting for a connection.", "counter"),
+    ("connects_total", "connects", "New DBAPI connections opened.", "counter"),
+    ("invalidations_total", "invalidations", "Connections invalidated (e.g. after a disconnect).", "counter"),
+]
+ADMISSION_SERIES = [
+    ("limit", "limit", "Current adaptive concurrency limit.", "gauge"),
+    ("in_flight", "in_flight", "Admitted requests running.", "gauge"),
+    ("queued", "queued", "Requests waiting for a slot.", "gauge"),
+    ("admitted_total", "admitted", "Requests admitted.", "counter"),
+    ("rejected_total", "rejected", "Requests shed with 503.", "counter"),
+    ("timeouts_total", "timeouts", "Requests that timed out in the queue.", "counter"),
+]
+HASHING_SERIES = [
+    ("workers", "workers", "Hashing worker processes.", "gauge"),
+    ("in_flight", "in_flight", "Hash calls submitted and not finished.", "gauge"),
+    ("queue_depth", "queue_depth", "Hash calls waiting for a worker.", "gauge"),
+    ("completed_total", "completed", "Hash calls finished.", "counter"),
+    ("timeouts_total", "timeouts", "Hash calls that timed out.", "counter"),
+]
+
+
+def _series(prefix: str, series: list, label: str, stats_by_label: dict[str, dict]) -> list[str]:
+    lines = []
+    for suffix, key, help, kind in series:
+        samples = [({label: name}, stats[key]) for name, stats in stats_by_label.items()]
+        lines.extend(render_samples(f"{prefix}_{suffix}", help, kind, samples))
+    return lines
+
+
+def _cache_lines() -> list[str]:
+    identity = identity_cache.stats()
+    lookups = [
+        ({"cache": "identity", "result": "hit"}, identity["hits"]),
+        ({"cache": "identity", "result": "miss"}, identity["misses"]),
+    ]
+    entries = [({"cache": "identity"}, identity["size"])]
+    evictions = [({"cache": "identity"}, identity["evictions"])]
+    memory = []
+    backends = {}
+    for name, cache in (("blog", blog_cache), ("user", user_cache)):
+        stats = cache.stats()
+        for result in ("hit", "negative_hit", "miss"):
+            lookups.append(({"cache": name, "result": result}, stats[f"{result}s" if result != "miss" else "misses"]))
+        if stats["backend"] is not None:
+            backends[stats["backend"]["backend"]] = stats["backend"]
+    for backend, stats in backends.items():
+        memory.append(({"backend": backend}, stats.get("memory_bytes")))
+        if "size" in stats:
+            entries.append(({"cache": f"entity-{backend}"}, stats["size"]))
+            evictions.append(({"cache": f"entity-{backend}"}, stats["evictions"]))
+    compressed = compressed_blogs.stats()
+    lookups.append(({"cache": "blog-compressed", "result": "hit"}, compressed["hits"]))
+    lookups.append(({"cache": "blog-compressed", "result": "miss"}, compressed["misses"]))
+    entries.append(({"cache": "blog-compressed"}, compressed["size"]))
+    evictions.append(({"cache": "blog-compressed"}, compressed["evictions"]))
+    memory.append(({"backend": "blog-compressed"}, compressed["memory_bytes"]))
+    return [
+        *render_samples("cache_lookups_total", "Cache lookups by result.", "counter", lookups),
+        *render_samples("cache_entries", "Entries currently cached.", "gauge", entries),
+        *render_samples("cache_evictions_total", "Entries evicted for capacity.", "counter", evictions),
+        *render_samples("cache_memory_bytes", "Approximate memory held by cached values.", "gauge", memory),
+    ]
+
+
+def require_metrics_token(request: Request):
+    """
+    Allow the scrape only with "Authorization: Bearer <METRICS_TOKEN>".
+
+    The metrics name routes, pools, replicas and cache sizes, so they are not
+    public: without a configured token the endpoint does not exist (404).
+
+    Raises:
+        HTTPException: 404 if METRICS_TOKEN is unset, 401 if the token is missing or wrong.
+    """
+    if settings.METRICS_TOKEN is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+def metrics():
+    """
+    Expose request, database, pool, cache, hashing and admission metrics in
+    the Prometheus text format.
+
+    Returns:
+        Response: text/plain exposition for a Prometheus scrape.
+    """
+    lines = []
+    for family in HTTP_FAMILIES:
+        lines.extend(render_family(family))
+
+    pools = {name: metrics.stats() for name, metrics in pool_metrics.items()}
+    lines.extend(_series("db_pool", POOL_SERIES, "pool", pools))
+    lines.extend(render_samples(
+        "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.", "histogram",
+        [({"pool": name}, stats["checkout_wait_seconds"]) for name, stats in pools.items()],
+    ))
+    if database.replicas is not None:
+        lines.extend(render_samples(
+            "db_replica_picks_total", "Sessions routed to each read replica.", "counter",
+            [({"replica": stats["replica"]}, stats["picks"]) for stats in database.replicas.stats()],
+        ))
+
+    lines.extend(_cache_lines())
+    lines.extend(_series("password_hashing", HASHING_SERIES, "pool", {"bcrypt": hashing_service.stats()}))
+    lines.extend(_series("admission", ADMISSION_SERIES, "controller", {auth_admission.name: auth_admission.stats()}))
+    logs = log_stats()
+    lines.extend(render_samples(
+        "log_records_total", "Log records by outcome: queued, dropped on a full queue, or rate limited.", "counter",
+        [({"outcome": outcome}, logs[outcome]) for outcome in ("enqueued", "dropped", "rate_limited")],
+    ))
+    lines.extend(render_samples("log_queue_backlog", "Log records waiting for the writer thread.", "gauge",
+                                [({}, logs["backlog"])]))
+    return Response("\n".join(lines) + "\n", media_type=CONTENT_TYPE)
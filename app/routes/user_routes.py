@@ -1,16 +1,21 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
-from app.config.dbconf import SessionLocal
-from app.controllers.user_controller import UserController
+from app.controllers.user_controller import AsyncUserController, UserController
 from app.schemas.user_schema import UserCreate, UserUpdate, UserResponse
-from app.middleware.auth_middleware import get_current_user
-from app.config.dbconf import get_db
+from app.middleware.auth_middleware import get_current_user, get_current_user_async
+from app.config.dbconf import get_async_db, get_db
+from app.utils.export import ExportFormat, EXPORT_BATCH_SIZE, export_response
+from app.repositories.user_repository import EXPORT_COLUMNS
+from app.utils.etag import make_etag, check_etag
+from app.utils.fast_json import dumps, json_response
+from app.utils.profiling import ProfiledRoute
 
-router = APIRouter(prefix="/users", tags=["Users"])
+router = APIRouter(prefix="/users", tags=["Users"], route_class=ProfiledRoute)
 
 @router.get("/", response_model=list[UserResponse])
-def list_users(db: Session = Depends(get_db),current_user: UserResponse = Depends(get_current_user)):
+def list_users(request: Request, response: Response, db: Session = Depends(get_db),current_user: UserResponse = Depends(get_current_user)):
     """
     Retrieve a list of all registered users.
 
@@ -18,31 +23,58 @@ def list_users(db: Session = Depends(get_db),current_user: UserResponse = Depend
         db (Session): Database session provided by the dependency injection system.
 
     Returns:
-        list[UserResponse]: A list of user details, including email, and profile data.
+        list[UserResponse]: A list of user details, including email, and profile data,
+        tagged with an ETag; a matching If-None-Match gets an empty 304 instead.
 
     Raises:
         HTTPException: May be raised by controller methods if database access fails.
     """
     controller = UserController(db)
-    return controller.get_users()
+    not_modified = check_etag(request, response, make_etag(controller.get_versions()))
+    if not_modified:
+        return not_modified
+    # Fast path: column rows encoded straight to JSON, skipping ORM objects and re-validation.
+    return json_response(dumps(controller.get_users(as_rows=True)), response)
+
+@router.get("/export")
+def export_users(fmt: ExportFormat = Query("ndjson", alias="format"), db: Session = Depends(get_db),current_user: UserResponse = Depends(get_current_user)):
+    """
+    Stream every user as NDJSON or CSV. Password hashes are never included.
+
+    Args:
+        fmt (str): Output format, "ndjson" (default) or "csv".
+        db (Session): Database session provided by the dependency injection system.
+
+    Returns:
+        StreamingResponse: The exported rows as an attachment.
+    """
+    controller = UserController(db)
+    rows = controller.export_users(EXPORT_BATCH_SIZE)
+    return export_response(rows, EXPORT_COLUMNS, fmt, "users")
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db),current_user: UserResponse = Depends(get_current_user)):
+async def get_user(user_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db),current_user: UserResponse = Depends(get_current_user_async)):
     """
     Retrieve details of a specific user by ID.
 
     Args:
         user_id (int): The unique identifier of the user.
-        db (Session): Database session provided by the dependency injection system.
+        db (AsyncSession): Async database session provided by the dependency injection system.
 
     Returns:
-        UserResponse: The user’s details if found.
+        UserResponse: The user’s details if found, tagged with an ETag; a
+        matching If-None-Match gets an empty 304 instead.
 
     Raises:
         HTTPException: 404 error if the user with the given ID does not exist.
     """
-    controller = UserController(db)
-    user = controller.get_user(user_id)
+    controller = AsyncUserController(db)
+    versions = await controller.get_versions()
+    not_modified = check_etag(request, response, make_etag(versions, resource=f"user-{user_id}"))
+    if not_modified:
+        return not_modified
+    # The same versions select the cached row, so the body never predates its ETag.
+    user = await controller.get_user(user_id, versions=versions)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -1,6 +1,7 @@
 from datetime import datetime
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+from app.config.config import settings
 
 class BlogBase(BaseModel):
     title: str
@@ -19,3 +20,49 @@ class BlogResponse(BlogBase):
     id: int
     author_id: int
     created_at: datetime
+
+class AuthorSummary(BaseModel):
+    id: int
+    email: str
+    full_name: str
+
+class BlogWithAuthor(BlogResponse):
+    author: Optional[AuthorSummary] = None
+
+class BlogPage(BaseModel):
+    items: list[BlogResponse]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+class BlogPageWithAuthor(BlogPage):
+    items: list[BlogWithAuthor]
+
+class BlogSearchResult(BaseModel):
+    id: int
+    title: str
+    slug: str
+    author_id: Optional[int] = None
+    created_at: datetime
+    rank: float
+    snippet: Optional[str] = None
+
+class BlogSearchPage(BaseModel):
+    items: list[BlogSearchResult]
+    next_offset: Optional[int] = None
+
+class BlogBulkCreate(BaseModel):
+    items: list[BlogCreate] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    # "atomic": insert everything or nothing; "partial": insert what can be inserted.
+    mode: Literal["atomic", "partial"] = "atomic"
+
+class BlogBulkItemResult(BaseModel):
+    index: int
+    slug: str
+    status: Literal["created", "conflict", "failed", "skipped"]
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class BlogBulkResult(BaseModel):
+    created: int
+    failed: int
+    items: list[BlogBulkItemResult]
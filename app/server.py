@@ -0,0 +1,145 @@
+"""
+Production server: gunicorn managing uvicorn workers.
+
+    python -m app.server
+    WEB_CONCURRENCY=4 DB_MAX_CONNECTIONS=90 python -m app.server
+
+One worker per CPU available to the container unless WEB_CONCURRENCY says
+otherwise. The app is built once in the master and forked into the workers
+(preload); building it opens no connections, so no pooled socket is shared
+across the fork. Workers are recycled after SERVER_MAX_REQUESTS requests,
+staggered by the jitter so they do not restart together. On SIGTERM (or a
+recycle) a worker stops accepting, finishes in-flight requests within
+SERVER_GRACEFUL_TIMEOUT_SECONDS, and its lifespan disposes the DB pools.
+
+Several workers need a shared entity cache: CACHE_BACKEND=redis with
+CACHE_URL (requires the redis package), or CACHE_BACKEND=none. The default
+per-process "memory" backend is refused unless WEB_CONCURRENCY=1.
+"""
+import math
+import os
+import sys
+from gunicorn.app.base import BaseApplication
+
+# Engines each worker opens on the primary: the sync engine and the async one used by
+# /auth and the blog/user read routes.
+ENGINES_PER_WORKER = 2
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on: the affinity mask, capped by a cgroup v2 CPU quota if any."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+def worker_count() -> int:
+    return int(os.environ.get("WEB_CONCURRENCY") or 0) or available_cpus()
+
+
+def split_hasher_pool() -> None:
+    """
+    Split the cores between the workers' bcrypt pools rather than giving each
+    worker all of them, unless HASHER_POOL_SIZE is set. Must run before
+    app.config is imported, which reads it; app.config is therefore only
+    imported inside the functions below.
+    """
+    os.environ.setdefault("HASHER_POOL_SIZE", str(max(1, available_cpus() // worker_count())))
+
+
+def check_cache_backend(workers: int) -> None:
+    """
+    Refuse CACHE_BACKEND=memory with more than one worker. Each worker would
+    hold its own copy of every cached row and, since entries are only served
+    at their table's current version, refill it after every write made in
+    any worker. A shared backend keeps one copy and fills it once.
+    """
+    from app.config.config import settings
+    if workers > 1 and settings.CACHE_BACKEND == "memory":
+        raise SystemExit(
+            f"CACHE_BACKEND=memory would give each of the {workers} workers its own blog/user cache. "
+            "Set CACHE_BACKEND=redis and CACHE_URL for a shared cache, CACHE_BACKEND=none, or WEB_CONCURRENCY=1."
+        )
+
+
+def post_fork(server, worker):
+    """In each new worker: start its own logging thread and drop any pool inherited from the master."""
+    from app.config.dbconf import database
+    from app.config.logger import restart_logging
+    restart_logging()
+    database.dispose(close=False)
+
+
+def when_ready(server):
+    from app.config.config import settings
+    workers = server.cfg.workers
+    per_engine = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    server.log.info(
+        "Serving on %s with %s workers; DB pool %s+%s per engine, at most %s connections to the primary",
+        settings.SERVER_BIND, workers, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW,
+        workers * ENGINES_PER_WORKER * per_engine,
+    )
+
+
+def server_options(workers: int) -> dict:
+    """gunicorn settings for `workers` uvicorn workers."""
+    from app.config.config import settings
+    return {
+        "bind": settings.SERVER_BIND,
+        "workers": workers,
+        "worker_class": "uvicorn_worker.UvicornWorker",
+        "preload_app": True,
+        "max_requests": settings.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVER_MAX_REQUESTS_JITTER,
+        "timeout": settings.SERVER_TIMEOUT_SECONDS,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "keepalive": settings.SERVER_KEEPALIVE_SECONDS,
+        "post_fork": post_fork,
+        "when_ready": when_ready,
+    }
+
+
+class Server(BaseApplication):
+    """gunicorn application serving `app.main.create_app()`."""
+
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import create_app
+        return create_app()
+
+
+def main() -> int:
+    split_hasher_pool()
+    from app.config.config import settings
+    from app.config.db_pool import pool_limits
+
+    workers = worker_count()
+    check_cache_backend(workers)
+    if settings.DB_MAX_CONNECTIONS:
+        # Workers inherit these through the fork; engines read them when first created.
+        settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW = pool_limits(
+            settings.DB_MAX_CONNECTIONS, workers, ENGINES_PER_WORKER,
+            settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW,
+        )
+    Server(server_options(workers)).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
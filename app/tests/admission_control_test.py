@@ -0,0 +1,50 @@
+import asyncio
+import unittest
+from fastapi import HTTPException
+from app.middleware.admission_control import AdmissionController
+
+
+def make_controller(**overrides):
+    options = dict(name="test", initial_limit=1, min_limit=1, max_limit=4,
+                   queue_size=1, queue_timeout=1, target_latency=0.5)
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+class TestAdmissionController(unittest.IsolatedAsyncioTestCase):
+    async def test_queues_then_sheds_load(self):
+        controller = make_controller()
+        await controller.acquire()
+        queued = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        with self.assertRaises(HTTPException) as ctx:
+            await controller.acquire()
+        self.assertEqual(ctx.exception.status_code, 503)
+        self.assertIn("Retry-After", ctx.exception.headers)
+
+        controller.release(0.01)
+        await queued
+        self.assertEqual(controller.stats()["in_flight"], 1)
+        self.assertEqual(controller.stats()["rejected"], 1)
+
+    async def test_queue_wait_times_out(self):
+        controller = make_controller(queue_timeout=0.01)
+        await controller.acquire()
+        with self.assertRaises(HTTPException):
+            await controller.acquire()
+        self.assertEqual(controller.stats()["queued"], 0)
+        self.assertEqual(controller.stats()["timeouts"], 1)
+
+    async def test_limit_adapts_to_latency(self):
+        controller = make_controller(initial_limit=4, max_limit=8)
+        for _ in range(4):
+            await controller.acquire()
+        controller.release(0.01)
+        self.assertGreater(controller.limit, 4)
+        for _ in range(3):
+            controller.release(5.0)
+        self.assertLess(controller.limit, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session
+from app.config.db_routing import RoutingSession
+from app.config.dbconf import Database
+from app.models import Base, Blog, User
+from app.repositories.blog_search_repository import BlogSearchRepository
+from app.repositories.async_blog_repository import AsyncBlogRepository
+from app.repositories.async_user_repository import AsyncUserRepository
+from app.schemas.user_schema import UserCreate
+from app.utils.entity_cache import blog_cache, user_cache
+
+
+class TestAsyncRepositories(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        blog_cache.clear()
+        user_cache.clear()
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(BlogSearchRepository.ensure_schema)
+        self.db = async_sessionmaker(bind=self.engine, expire_on_commit=False)()
+
+    async def asyncTearDown(self):
+        await self.db.close()
+        await self.engine.dispose()
+
+    async def test_register_then_look_up_by_email(self):
+        users = AsyncUserRepository(self.db)
+        user = await users.create(UserCreate(email="a@example.com", full_name="A", password="pw"))
+        self.assertNotEqual(user.password, "pw")
+        self.assertEqual((await users.get_by_email("a@example.com")).id, user.id)
+        self.assertIsNone(await users.get_by_email("b@example.com"))
+
+        with self.assertRaises(Exception) as ctx:
+            await users.create(UserCreate(email="a@example.com", full_name="A2", password="pw"))
+        self.assertEqual(ctx.exception.status_code, 400)
+
+    async def test_reads_go_through_the_sync_repositories(self):
+        user = await AsyncUserRepository(self.db).create(UserCreate(email="a@example.com", full_name="A", password="pw"))
+        self.db.add_all([Blog(title=f"t{i}", slug=f"s{i}", author_id=user.id) for i in range(3)])
+        await self.db.commit()
+        blogs = AsyncBlogRepository(self.db)
+
+        page, has_more = await blogs.get_page(2, with_author=True)
+        self.assertTrue(has_more)
+        self.assertEqual([blog.author.email for blog in page], ["a@example.com"] * 2)
+        versions = {"blogs": await blogs.get_version()}
+        self.assertEqual((await blogs.get_by_id(page[0].id, versions=versions)).slug, page[0].slug)
+        self.assertEqual(blog_cache.stats()["misses"], 1)
+        self.assertEqual((await blogs.get_by_id(page[0].id, versions=versions)).slug, page[0].slug)
+        self.assertEqual(blog_cache.stats()["hits"], 1)
+        users = AsyncUserRepository(self.db)
+        found = await users.get_by_id(user.id, versions={"users": await users.get_version()})
+        self.assertEqual(found.email, "a@example.com")
+
+
+class TestAsyncReplicaRouting(unittest.IsolatedAsyncioTestCase):
+    async def test_async_sessions_read_from_replicas(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        primary, replica = (f"sqlite:///{os.path.join(tmp.name, name)}.db" for name in ("primary", "replica"))
+        for url in (primary, replica):
+            engine = create_engine(url)
+            Base.metadata.create_all(engine)
+            engine.dispose()
+        # Only the replica has this blog, so finding it proves where the read went.
+        engine = create_engine(replica)
+        with Session(engine) as db:
+            db.add(User(email="r@example.com", full_name="R", password="x"))
+            db.add(Blog(title="t", slug="on-replica", author_id=1))
+            db.commit()
+        engine.dispose()
+
+        database = Database(primary, [replica], "round_robin")
+        try:
+            async with database.async_session_factory() as db:
+                self.assertIsInstance(db.sync_session, RoutingSession)
+                page, _ = await AsyncBlogRepository(db).get_page(10)
+                self.assertEqual([blog.slug for blog in page], ["on-replica"])
+        finally:
+            await database.dispose_async()
+
+
+if __name__ == "__main__":
+    unittest.main()
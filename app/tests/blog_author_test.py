@@ -0,0 +1,59 @@
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.controllers.blog_controller import BlogController
+from app.models import Base, Blog, User
+from app.schemas.blog_schema import BlogPageWithAuthor, BlogWithAuthor
+from app.tests.query_guard import QueryCounter, assert_queries_do_not_scale
+from app.utils.entity_cache import blog_cache, user_cache
+
+
+class TestAuthorExpansion(unittest.TestCase):
+    def setUp(self):
+        blog_cache.clear()
+        user_cache.clear()
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        with self.Session() as db:
+            for i in range(20):
+                user = User(email=f"u{i}@example.com", full_name=f"User {i}", password="secret-hash")
+                db.add(user)
+                db.flush()
+                db.add(Blog(title=f"t{i}", slug=f"s{i}", content="c", author_id=user.id))
+            db.commit()
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def list_page(self, size, include_author=True):
+        with self.Session() as db:
+            page = BlogController(db).get_blogs(size, include_author=include_author)
+            return BlogPageWithAuthor.model_validate(page, from_attributes=True)
+
+    def test_list_embeds_authors_without_n_plus_one(self):
+        count = assert_queries_do_not_scale(self.engine, self.list_page)
+        self.assertEqual(count, 2)
+        page = self.list_page(3)
+        self.assertEqual(page.items[0].author.full_name, "User 19")
+        self.assertNotIn("password", page.model_dump_json())
+
+    def test_guard_catches_lazy_loading(self):
+        with self.assertRaises(AssertionError):
+            assert_queries_do_not_scale(self.engine, lambda size: self.list_page(size, include_author=False))
+
+    def test_get_blog_with_author_is_served_from_cache(self):
+        with self.Session() as db:
+            BlogController(db).get_blog(1, include_author=True)
+        with self.Session() as db:
+            controller = BlogController(db)
+            versions = controller.get_versions(include_author=True)  # read once per request, for the ETag
+            with QueryCounter(self.engine) as queries:
+                blog = controller.get_blog(1, include_author=True, versions=versions)
+                blog = BlogWithAuthor.model_validate(blog, from_attributes=True)
+        self.assertEqual(blog.author.email, "u0@example.com")
+        self.assertEqual(queries.count, 0, queries.statements)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+from unittest import mock
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.models import Blog, User
+from app.repositories.blog_repository import BlogRepository
+from app.routes import blog_route
+from app.schemas.blog_schema import BlogCreate
+from app.tests.route_client import route_client, shared_memory_engine
+from app.utils.entity_cache import blog_cache, user_cache
+
+
+def item(slug: str) -> dict:
+    return {"title": f"Title {slug}", "slug": slug, "content": "body"}
+
+
+class TestBulkCreate(unittest.TestCase):
+    def setUp(self):
+        blog_cache.clear()
+        user_cache.clear()
+        self.engine = shared_memory_engine()
+        self.addCleanup(self.engine.dispose)
+        with Session(self.engine, expire_on_commit=False) as db:
+            self.user = User(email="a@example.com", full_name="A", password="x")
+            db.add(self.user)
+            db.flush()
+            db.add(Blog(title="Taken", slug="taken", author_id=self.user.id))
+            db.commit()
+        self.client = route_client(self.engine, blog_route.router, user=self.user)
+
+    def post(self, slugs: list[str], mode: str):
+        return self.client.post("/blogs/bulk", json={"items": [item(slug) for slug in slugs], "mode": mode})
+
+    def slugs_in_db(self) -> set[str]:
+        with Session(self.engine) as db:
+            return set(db.scalars(select(Blog.slug)))
+
+    def version(self) -> int:
+        with Session(self.engine) as db:
+            return BlogRepository(db).get_version()
+
+    def test_atomic_conflict_inserts_nothing_and_returns_409(self):
+        res = self.post(["a", "taken", "b"], "atomic")
+        self.assertEqual(res.status_code, 409)
+        body = res.json()
+        self.assertEqual((body["created"], body["failed"]), (0, 3))
+        self.assertEqual([row["status"] for row in body["items"]], ["skipped", "conflict", "skipped"])
+        self.assertEqual(self.slugs_in_db(), {"taken"})
+        self.assertEqual(self.version(), 0)
+
+    def test_atomic_success_inserts_everything(self):
+        res = self.post(["a", "b", "c"], "atomic")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["created"], 3)
+        self.assertEqual(self.slugs_in_db(), {"taken", "a", "b", "c"})
+
+    def test_partial_reports_each_item_in_input_order(self):
+        res = self.post(["a", "taken", "b", "a", "c"], "partial")
+        self.assertEqual(res.status_code, 200)
+        body = res.json()
+        self.assertEqual((body["created"], body["failed"]), (3, 2))
+        self.assertEqual([row["index"] for row in body["items"]], [0, 1, 2, 3, 4])
+        self.assertEqual([row["slug"] for row in body["items"]], ["a", "taken", "b", "a", "c"])
+        self.assertEqual([row["status"] for row in body["items"]],
+                         ["created", "conflict", "created", "conflict", "created"])
+        self.assertIn("repeated in this request", body["items"][3]["error"])
+        created = {row["slug"]: row["id"] for row in body["items"] if row["status"] == "created"}
+        with Session(self.engine) as db:
+            rows = db.execute(select(Blog.slug, Blog.id).where(Blog.slug.in_(created))).tuples().all()
+        self.assertEqual(dict(rows), created)
+
+    def test_duplicates_within_the_payload_fail_atomic_mode(self):
+        res = self.post(["a", "a"], "atomic")
+        self.assertEqual(res.status_code, 409)
+        self.assertEqual([row["status"] for row in res.json()["items"]], ["skipped", "conflict"])
+        self.assertEqual(self.slugs_in_db(), {"taken"})
+
+    def test_partial_mode_keeps_other_chunks_when_one_fails(self):
+        # A slug taken by a concurrent writer after the conflict check fails only its own chunk.
+        items = [BlogCreate(**item(slug)) for slug in ["a", "b", "taken", "c", "d"]]
+        with Session(self.engine) as db, mock.patch.object(BlogRepository, "find_existing_slugs", return_value=set()):
+            results = BlogRepository(db).bulk_create(items, self.user.id, chunk_size=2, atomic=False)
+        self.assertEqual([row["status"] for row in results], ["created", "created", "failed", "failed", "created"])
+        self.assertEqual(self.slugs_in_db(), {"taken", "a", "b", "d"})
+
+    def test_insert_bumps_version_and_invalidates_cached_misses(self):
+        with Session(self.engine) as db:
+            blogs = BlogRepository(db)
+            negative_hits = blog_cache.negative_hits
+            self.assertIsNone(blogs.get_by_id(2))
+            self.assertIsNone(blogs.get_by_id(2))
+            self.assertEqual(blog_cache.negative_hits, negative_hits + 1)
+
+        self.post(["a", "b"], "partial")
+        self.assertEqual(self.version(), 1)
+        with Session(self.engine) as db:
+            self.assertEqual(BlogRepository(db).get_by_id(2).slug, "a")
+
+        self.post(["a"], "partial")  # nothing created: no bump
+        self.assertEqual(self.version(), 1)
+        with Session(self.engine) as db:
+            self.assertEqual(db.scalar(select(func.count()).select_from(Blog)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.config.config import settings
+from app.controllers.blog_controller import BlogController
+from app.models import Base, Blog, User
+from app.repositories.blog_repository import LIST_FIELDS
+from app.tests.query_guard import QueryCounter
+from app.utils.fieldsets import parse_fields
+
+
+class TestSparseBlogListing(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.long = "x" * (settings.BLOG_EXCERPT_LENGTH + 50)
+        with self.Session() as db:
+            db.add(User(email="a@example.com", full_name="A", password="x"))
+            db.flush()
+            for i in range(5):
+                db.add(Blog(title=f"t{i}", slug=f"s{i}", author_id=1,
+                            content=self.long if i == 4 else (None if i == 3 else "short")))
+            db.commit()
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def get_page(self, fields, **kwargs):
+        with self.Session() as db, QueryCounter(self.engine) as queries:
+            page = BlogController(db).get_blogs(2, fields=fields, **kwargs)
+        return page, queries.statements
+
+    def test_selects_only_requested_columns(self):
+        page, statements = self.get_page(["title"])
+        self.assertEqual(page["items"][0], {"title": "t4", "id": 5, "created_at": page["items"][0]["created_at"]})
+        self.assertEqual(len(statements), 1)
+        self.assertNotIn("content", statements[0])
+
+    def test_excerpt_is_truncated_in_sql(self):
+        page, statements = self.get_page(["title", "excerpt"])
+        newest, null_content = page["items"]
+        self.assertEqual(newest["excerpt"], "x" * settings.BLOG_EXCERPT_LENGTH + "…")
+        self.assertIsNone(null_content["excerpt"])
+        self.assertIn("substr", statements[0])
+        self.assertNotIn("content", newest)
+
+    def test_cursors_work_on_sparse_pages(self):
+        page, _ = self.get_page(["slug"])
+        following, _ = self.get_page(["slug"], after=page["next_cursor"])
+        self.assertEqual([b["slug"] for b in following["items"]], ["s2", "s1"])
+        back, _ = self.get_page(["slug"], before=following["prev_cursor"])
+        self.assertEqual([b["slug"] for b in back["items"]], ["s4", "s3"])
+
+    def test_parse_fields(self):
+        self.assertEqual(parse_fields(" title,excerpt,title ,", LIST_FIELDS), ["title", "excerpt"])
+        for bad in ("", ",", "title,password"):
+            with self.assertRaises(HTTPException) as raised:
+                parse_fields(bad, LIST_FIELDS)
+            self.assertEqual(raised.exception.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models import Base, Blog, User
+from app.controllers.blog_controller import BlogController
+
+
+class TestBlogPagination(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        self.db.add(User(id=1, email="a@example.com", full_name="A", password="x"))
+        start = datetime(2025, 1, 1)
+        # Two blogs share a timestamp so the id tie-breaker is exercised.
+        for i in range(1, 8):
+            self.db.add(Blog(id=i, title=f"t{i}", slug=f"s{i}", author_id=1,
+                             created_at=start + timedelta(minutes=min(i, 6))))
+        self.db.commit()
+        self.controller = BlogController(self.db)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_walks_forward_and_back_without_gaps(self):
+        seen = []
+        page = self.controller.get_blogs(3)
+        self.assertIsNone(page["prev_cursor"])
+        while True:
+            seen.extend(blog.id for blog in page["items"])
+            if not page["next_cursor"]:
+                break
+            page = self.controller.get_blogs(3, after=page["next_cursor"])
+        self.assertEqual(seen, [7, 6, 5, 4, 3, 2, 1])
+
+        previous = self.controller.get_blogs(3, before=page["prev_cursor"])
+        self.assertEqual([blog.id for blog in previous["items"]], [4, 3, 2])
+        first = self.controller.get_blogs(3, before=previous["prev_cursor"])
+        self.assertEqual([blog.id for blog in first["items"]], [7, 6, 5])
+        self.assertIsNone(first["prev_cursor"])
+
+    def test_rejects_malformed_cursor(self):
+        with self.assertRaises(Exception) as ctx:
+            self.controller.get_blogs(3, after="not-a-cursor")
+        self.assertEqual(ctx.exception.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.models import Base
+from app.models.user_model import User
+from app.repositories.blog_repository import BlogRepository
+from app.repositories.blog_search_repository import BlogSearchRepository, HIGHLIGHT_START, HIGHLIGHT_STOP
+from app.schemas.blog_schema import BlogCreate, BlogUpdate
+from app.utils.entity_cache import blog_cache, user_cache
+
+
+class TestBlogSearch(unittest.TestCase):
+    def setUp(self):
+        blog_cache.clear()
+        user_cache.clear()
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        BlogSearchRepository.ensure_schema(self.engine)
+        self.db = Session(self.engine)
+        self.db.add(User(email="a@example.com", full_name="A", password="x"))
+        self.db.commit()
+        self.blogs = BlogRepository(self.db)
+        self.search = BlogSearchRepository(self.db)
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def ids(self, q: str):
+        return [row["id"] for row in self.search.search(q, limit=10, offset=0, budget_ms=1000)]
+
+    def test_title_matches_outrank_content_matches(self):
+        in_content = self.blogs.create(BlogCreate(title="Notes", slug="a", content="a post about gardening"), author_id=1)
+        in_title = self.blogs.create(BlogCreate(title="Gardening", slug="b", content="tomatoes"), author_id=1)
+        self.assertEqual(self.ids("gardening"), [in_title.id, in_content.id])
+        # Stemming: "gardens" and "gardening" share a stem.
+        self.assertEqual(set(self.ids("gardens")), {in_title.id, in_content.id})
+
+    def test_snippet_highlights_content_and_title_matches(self):
+        self.blogs.create(BlogCreate(title="Notes", slug="a", content="we planted basil today"), author_id=1)
+        self.blogs.create(BlogCreate(title="Basil pesto", slug="b", content="a recipe"), author_id=1)
+        self.blogs.create(BlogCreate(title="Title only", slug="c"), author_id=1)
+        rows = {row["slug"]: row for row in self.search.search("basil", 10, 0, 1000)}
+        self.assertIn(f"{HIGHLIGHT_START}basil{HIGHLIGHT_STOP}", rows["a"]["snippet"])
+        self.assertIn(f"{HIGHLIGHT_START}Basil{HIGHLIGHT_STOP}", rows["b"]["snippet"])
+        row = self.search.search("title", 10, 0, 1000)[0]
+        self.assertIn(f"{HIGHLIGHT_START}Title{HIGHLIGHT_STOP}", row["snippet"])
+
+    def test_snippet_escapes_the_author_markup(self):
+        self.blogs.create(BlogCreate(title="Notes", slug="a",
+                                     content='x <script>alert("danger")</script> & <img src=x onerror=1>'),
+                          author_id=1)
+        self.blogs.create(BlogCreate(title="<b>Warning</b>", slug="b", content="plain"), author_id=1)
+        snippet = self.search.search("danger", 10, 0, 1000)[0]["snippet"]
+        self.assertNotIn("<script>", snippet)
+        self.assertNotIn("<img", snippet)
+        self.assertIn(f"&lt;script&gt;alert(&quot;{HIGHLIGHT_START}danger{HIGHLIGHT_STOP}&quot;)&lt;/script&gt;", snippet)
+        self.assertIn("&amp;", snippet)
+        snippet = self.search.search("warning", 10, 0, 1000)[0]["snippet"]
+        self.assertEqual(snippet.split(" … ")[0], f"&lt;b&gt;{HIGHLIGHT_START}Warning{HIGHLIGHT_STOP}&lt;/b&gt;")
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.blogs.create(BlogCreate(title="Hello", slug="a", content="world"), author_id=1)
+        self.assertEqual(self.ids('hello" OR NOT *'), [])
+        self.assertEqual(self.ids("---"), [])
+
+    def test_index_follows_create_update_delete_and_bulk_create(self):
+        blog = self.blogs.create(BlogCreate(title="Original", slug="a", content="alpha"), author_id=1)
+        self.assertEqual(self.ids("alpha"), [blog.id])
+
+        self.blogs.update(blog, BlogUpdate(content="beta"))
+        self.assertEqual(self.ids("alpha"), [])
+        self.assertEqual(self.ids("beta"), [blog.id])
+
+        self.blogs.delete(blog)
+        self.assertEqual(self.ids("beta"), [])
+        self.assertEqual(self.ids("original"), [])
+
+        results = self.blogs.bulk_create([BlogCreate(title="Bulk", slug=f"b{i}", content="gamma") for i in range(3)],
+                                         author_id=1, chunk_size=2, atomic=True)
+        self.assertEqual(sorted(self.ids("gamma")), [result["id"] for result in results])
+
+    def test_failed_write_leaves_index_unchanged(self):
+        self.blogs.create(BlogCreate(title="t", slug="a", content="alpha"), author_id=1)
+        with self.assertRaises(HTTPException):
+            self.blogs.create(BlogCreate(title="t", slug="a", content="delta"), author_id=1)
+        self.assertEqual(self.ids("delta"), [])
+
+    def test_query_over_budget_is_aborted_with_504(self):
+        self.blogs.bulk_create([BlogCreate(title=f"Post {i}", slug=f"s{i}", content="common words " * 20)
+                                for i in range(300)], author_id=1, chunk_size=100, atomic=True)
+        with self.assertRaises(HTTPException) as ctx:
+            self.search.search("common", limit=10, offset=0, budget_ms=0)
+        self.assertEqual(ctx.exception.status_code, 504)
+        # The progress handler is removed afterwards: a generous budget succeeds.
+        self.assertEqual(len(self.ids("common")), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
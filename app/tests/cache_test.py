@@ -0,0 +1,47 @@
+import unittest
+from app.utils.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TTLCache(maxsize=2, ttl=10, clock=self.clock)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.cache.set("c", 3)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_entries_expire_after_ttl(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2, ttl=1)
+        self.clock.now = 5
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+        self.clock.now = 10
+        self.assertIsNone(self.cache.get("a"))
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["expirations"]), (1, 2, 2))
+
+    def test_delete_counts_invalidation(self):
+        self.cache.set("a", 1)
+        self.cache.delete("a")
+        self.cache.delete("missing")
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats()["invalidations"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import gzip
+import unittest
+import brotli
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.middleware.compression import CompressionMiddleware
+from app.models import Base
+from app.models.blog_model import Blog
+from app.models.user_model import User
+from app.repositories.blog_repository import BlogRepository
+from app.repositories.blog_search_repository import BlogSearchRepository
+from app.routes import blog_route
+from app.schemas.blog_schema import BlogCreate, BlogUpdate
+from app.tests.route_client import route_client, shared_memory_engine
+from app.utils.compression import CompressedBodyCache, compressed_blogs, compressed_response, negotiate
+from app.utils.entity_cache import blog_cache, user_cache
+
+BIG = b'{"content":"' + b"lorem ipsum " * 500 + b'"}'
+
+
+class TestNegotiate(unittest.TestCase):
+    def test_prefers_brotli_and_honours_q_values(self):
+        self.assertEqual(negotiate("gzip, deflate, br"), "br")
+        self.assertEqual(negotiate("br;q=0.5, gzip"), "gzip")
+        self.assertEqual(negotiate("br;q=0, gzip;q=0"), None)
+        self.assertEqual(negotiate("*"), "br")
+        self.assertEqual(negotiate("*;q=0, gzip"), "gzip")
+        self.assertEqual(negotiate("identity"), None)
+        self.assertEqual(negotiate(""), None)
+
+
+class TestCompressionMiddleware(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+
+        @app.get("/big")
+        def big():
+            return Response(BIG, media_type="application/json")
+
+        @app.get("/huge")
+        def huge():
+            # Above INLINE_LIMIT, so compressed in a worker thread.
+            return Response(BIG * 4, media_type="text/csv")
+
+        @app.get("/small")
+        def small():
+            return {"ok": True}
+
+        @app.get("/image")
+        def image():
+            return Response(BIG, media_type="image/png")
+
+        @app.get("/precompressed")
+        def precompressed():
+            return compressed_response(gzip.compress(BIG), "gzip", Response())
+
+        @app.get("/stream")
+        def stream():
+            return StreamingResponse((BIG for _ in range(3)), media_type="application/x-ndjson")
+
+        app.add_middleware(CompressionMiddleware, minimum_size=1024, max_workers=1)
+        self.client = TestClient(app)
+
+    def get(self, path, accept):
+        # `stream` keeps the body as sent, without the client's transparent decoding.
+        with self.client.stream("GET", path, headers={"Accept-Encoding": accept}) as res:
+            return res, b"".join(res.iter_raw())
+
+    def test_compresses_large_json(self):
+        res, body = self.get("/big", "gzip")
+        self.assertEqual(res.headers["content-encoding"], "gzip")
+        self.assertEqual(res.headers["vary"], "Accept-Encoding")
+        self.assertEqual(int(res.headers["content-length"]), len(body))
+        self.assertEqual(gzip.decompress(body), BIG)
+        res, body = self.get("/big", "br, gzip")
+        self.assertEqual(res.headers["content-encoding"], "br")
+        self.assertEqual(brotli.decompress(body), BIG)
+        res, body = self.get("/huge", "gzip")
+        self.assertEqual(gzip.decompress(body), BIG * 4)
+
+    def test_leaves_small_unknown_and_encoded_bodies_alone(self):
+        for path in ("/small", "/image"):
+            res, body = self.get(path, "gzip")
+            self.assertNotIn("content-encoding", res.headers)
+        res, body = self.get("/big", "identity")
+        self.assertEqual(body, BIG)
+        res, body = self.get("/precompressed", "gzip")
+        self.assertEqual(gzip.decompress(body), BIG)
+
+    def test_compresses_streamed_bodies(self):
+        for accept, decompress in (("gzip", gzip.decompress), ("br", brotli.decompress)):
+            res, body = self.get("/stream", accept)
+            self.assertEqual(res.headers["content-encoding"], accept)
+            self.assertNotIn("content-length", res.headers)
+            self.assertEqual(decompress(body), BIG * 3)
+
+
+class TestCompressedBodyCache(unittest.TestCase):
+    def test_served_only_for_the_same_body(self):
+        cache = CompressedBodyCache(maxsize=10, ttl=60, min_size=100)
+        compressed = cache.compress(1, "gzip", BIG)
+        self.assertIs(cache.compress(1, "gzip", BIG), compressed)
+        # The row changed (e.g. through another process): recompress, never serve the old body.
+        changed = BIG.replace(b"lorem", b"LOREM")
+        self.assertEqual(gzip.decompress(cache.compress(1, "gzip", changed)), changed)
+        self.assertEqual(brotli.decompress(cache.compress(1, "br", changed)), changed)
+        cache.compress(2, "gzip", b"{}")
+        self.assertEqual(cache.stats()["size"], 2)
+        cache.invalidate(1)
+        self.assertEqual(cache.stats()["size"], 0)
+        self.assertEqual((cache.stats()["hits"], cache.stats()["misses"]), (1, 3))
+
+    def test_repository_writes_invalidate(self):
+        blog_cache.clear()
+        user_cache.clear()
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        BlogSearchRepository.ensure_schema(engine)
+        self.addCleanup(engine.dispose)
+        with Session(engine) as db:
+            db.add(User(email="a@example.com", full_name="A", password="x"))
+            db.commit()
+            blogs = BlogRepository(db)
+            blog = blogs.create(BlogCreate(title="t", slug="s", content="c"), author_id=1)
+            compressed_blogs.compress(blog.id, "gzip", BIG * 2)
+            self.assertIsNotNone(compressed_blogs.cache.get((blog.id, "gzip")))
+            blogs.update(blog, BlogUpdate(title="u"))
+            self.assertIsNone(compressed_blogs.cache.get((blog.id, "gzip")))
+            compressed_blogs.compress(blog.id, "br", BIG * 2)
+            self.assertIsNotNone(compressed_blogs.cache.get((blog.id, "br")))
+            blogs.delete(blog)
+            self.assertIsNone(compressed_blogs.cache.get((blog.id, "br")))
+
+
+class TestCompressedBlogRoute(unittest.TestCase):
+    def setUp(self):
+        blog_cache.clear()
+        user_cache.clear()
+        compressed_blogs.clear()
+        self.engine = shared_memory_engine()
+        self.addCleanup(self.engine.dispose)
+        with Session(self.engine, expire_on_commit=False) as db:
+            user = User(email="a@example.com", full_name="A", password="x")
+            db.add(user)
+            db.flush()
+            db.add(Blog(title="t", slug="s", content="lorem ipsum " * 800, author_id=user.id))
+            db.commit()
+        self.client = route_client(self.engine, blog_route.router, user=user)
+
+    def get(self, accept: str, etag: str | None = None):
+        headers = {"Accept-Encoding": accept}
+        if etag:
+            headers["If-None-Match"] = etag
+        with self.client.stream("GET", "/blogs/1", headers=headers) as res:
+            return res, b"".join(res.iter_raw())
+
+    def test_one_weak_etag_for_every_encoding(self):
+        responses = {accept: self.get(accept) for accept in ("br", "gzip", "identity")}
+        etags = {res.headers["etag"] for res, _ in responses.values()}
+        self.assertEqual(len(etags), 1)
+        etag = etags.pop()
+        self.assertTrue(etag.startswith('W/"blog-1.'))
+        for accept in ("br", "gzip"):
+            res, body = responses[accept]
+            self.assertEqual(res.headers["content-encoding"], accept)
+            self.assertEqual(res.headers["vary"], "Accept-Encoding")
+        self.assertEqual(brotli.decompress(responses["br"][1]), responses["identity"][1])
+        # A copy stored under any encoding revalidates under any other.
+        self.assertEqual(self.get("gzip", etag)[0].status_code, 304)
+
+
+if __name__ == "__main__":
+    unittest.main()
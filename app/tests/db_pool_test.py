@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.config.db_pool import create_instrumented_engine, engine_options, pool_limits, pool_metrics, PoolMetrics
+from app.utils.metrics import Histogram
+
+
+class TestHistogram(unittest.TestCase):
+    def test_cumulative_buckets(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["buckets"], {0.1: 2, 1.0: 3, float("inf"): 4})
+        self.assertAlmostEqual(snapshot["sum"], 3.65)
+
+
+class TestPoolInstrumentation(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.engine = create_instrumented_engine("test", f"sqlite:///{os.path.join(tmp.name, 'pool.db')}")
+        self.addCleanup(self.engine.dispose)
+
+    def test_in_memory_sqlite_keeps_default_pool(self):
+        self.assertEqual(engine_options("sqlite://", PoolMetrics("mem")), {"pool_pre_ping": True})
+
+    def test_counts_checkouts_and_in_use(self):
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            self.assertEqual(self.stats()["checked_out"], 1)
+        stats = self.stats()
+        self.assertEqual((stats["checked_out"], stats["checkouts"]), (0, 1))
+        self.assertEqual(stats["checkout_wait_seconds"]["count"], 1)
+
+    def test_exhaustion_is_recorded(self):
+        self.engine.pool._timeout = 0.01
+        held = [self.engine.connect() for _ in range(self.engine.pool.size() + self.engine.pool._max_overflow)]
+        self.assertEqual(self.stats()["overflow"], self.engine.pool._max_overflow)
+        with self.assertRaises(PoolTimeoutError):
+            self.engine.connect()
+        for conn in held:
+            conn.close()
+        self.assertEqual(self.stats()["checkout_timeouts"], 1)
+
+    def stats(self):
+        return pool_metrics["test"].stats()
+
+
+class TestPoolLimits(unittest.TestCase):
+    def test_sizing_that_fits_is_kept(self):
+        self.assertEqual(pool_limits(100, 2, 2, 5, 10), (5, 10))
+
+    def test_shrinks_in_the_configured_ratio(self):
+        size, overflow = pool_limits(90, 4, 2, 5, 10)
+        self.assertEqual((size, overflow), (3, 8))
+        self.assertLessEqual(4 * 2 * (size + overflow), 90)
+
+    def test_budget_too_small_for_the_workers(self):
+        with self.assertRaises(ValueError):
+            pool_limits(7, 4, 2, 5, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import unittest
+from unittest import mock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, select, text
+from sqlalchemy.orm import sessionmaker
+from app.config.db_routing import ReplicaSet, RoutingSession, use_primary
+from app.middleware.db_routing import ReadWriteRoutingMiddleware
+from app.models import Base, User
+from app.repositories.blog_repository import BlogRepository
+from app.repositories.blog_search_repository import BlogSearchRepository
+from app.schemas.blog_schema import BlogUpdate
+from app.utils.entity_cache import blog_cache
+
+
+def make_engine(name):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (email, full_name, password) VALUES (:email, :name, 'x')"),
+                     {"email": f"{name}@example.com", "name": name})
+    return engine
+
+
+class TestRoutingSession(unittest.TestCase):
+    def setUp(self):
+        self.primary = make_engine("primary")
+        self.replicas = ReplicaSet([make_engine("replica1"), make_engine("replica2")])
+        self.Session = sessionmaker(class_=RoutingSession, primary=self.primary, replicas=self.replicas)
+
+    def names(self, db):
+        return db.scalars(select(User.full_name)).all()
+
+    def test_reads_round_robin_over_replicas(self):
+        with self.Session() as first, self.Session() as second:
+            self.assertEqual((self.names(first), self.names(first)), (["replica1"], ["replica1"]))
+            self.assertEqual(self.names(second), ["replica2"])
+        self.assertEqual([replica["picks"] for replica in self.replicas.stats()], [1, 1])
+
+    def test_writes_and_later_reads_use_primary(self):
+        with self.Session() as db:
+            db.add(User(email="new@example.com", full_name="new", password="x"))
+            db.commit()
+            self.assertEqual(self.names(db), ["primary", "new"])
+
+    def test_use_primary_flag(self):
+        token = use_primary.set(True)
+        try:
+            with self.Session() as db:
+                self.assertEqual(self.names(db), ["primary"])
+        finally:
+            use_primary.reset(token)
+
+    def test_session_settings_do_not_count_as_writes(self):
+        with self.Session() as db:
+            self.assertIs(db.get_bind(clause=text("SET statement_timeout = 5")), self.replicas.engines[0])
+            self.assertEqual(self.names(db), ["replica1"])
+
+    def search_binds(self, db) -> list[tuple[str, str]]:
+        """Run a budgeted Postgres-style search and return (engine, statement keyword) per statement."""
+        executed = []
+        engines = {"primary": self.primary, "replica1": self.replicas.engines[0], "replica2": self.replicas.engines[1]}
+
+        def recorder(name):
+            def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+                if statement.lstrip().upper().startswith("SET") or "ts_rank_cd" in statement:
+                    executed.append((name, statement.split()[0].upper()))
+                    # SQLite cannot run the Postgres statements; answer with an empty result.
+                    return "SELECT 1 AS id WHERE 0", ()
+                return statement, parameters
+            return before_cursor_execute
+
+        for name, engine in engines.items():
+            listener = recorder(name)
+            event.listen(engine, "before_cursor_execute", listener, retval=True)
+            self.addCleanup(event.remove, engine, "before_cursor_execute", listener)
+        with mock.patch.object(BlogSearchRepository, "_dialect", return_value="postgresql"):
+            BlogSearchRepository(db).search("hello", limit=10, offset=0, budget_ms=50)
+        return executed
+
+    def test_budgeted_search_in_write_transaction_stays_on_primary(self):
+        with self.Session() as db:
+            db.add(User(email="new@example.com", full_name="new", password="x"))
+            db.flush()
+            self.assertEqual(self.search_binds(db), [("primary", "SET"), ("primary", "SELECT")])
+
+    def test_budgeted_search_reads_from_one_replica(self):
+        with self.Session() as db:
+            self.assertEqual(self.search_binds(db), [("replica1", "SET"), ("replica1", "SELECT")])
+            self.assertEqual(self.names(db), ["replica1"])
+
+    def test_least_connections_avoids_busy_replica(self):
+        replicas = ReplicaSet(self.replicas.engines, "least_connections")
+        busy = replicas.engines[0].connect()
+        try:
+            self.assertIs(replicas.pick(), replicas.engines[1])
+            self.assertIs(replicas.pick(), replicas.engines[1])
+        finally:
+            busy.close()
+
+
+class TestCacheFill(unittest.TestCase):
+    def test_stale_replica_does_not_refill_cache_after_update(self):
+        primary, replica = make_engine("primary"), make_engine("replica")
+        BlogSearchRepository.ensure_schema(primary)
+        for engine in (primary, replica):
+            with engine.begin() as conn:
+                conn.execute(text("INSERT INTO blogs (title, slug, author_id) VALUES ('old', 's', 1)"))
+        Session = sessionmaker(class_=RoutingSession, primary=primary, replicas=ReplicaSet([replica]))
+        blog_cache.clear()
+
+        with Session() as db:
+            blogs = BlogRepository(db)
+            blogs.update(blogs.get_by_id(1), BlogUpdate(title="new"))
+        # The replica has not caught up; the invalidated entry must be refilled from the primary.
+        with Session() as db:
+            self.assertEqual(BlogRepository(db).get_by_id(1).title, "new")
+            # Only the fill went to the primary; the session keeps reading from its replica.
+            self.assertEqual(db.scalars(select(User.full_name)).all(), ["replica"])
+        with Session() as db:
+            self.assertEqual(BlogRepository(db).get_by_id(1).title, "new")
+
+
+class TestReadWriteRoutingMiddleware(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+
+        @app.get("/read")
+        def read():
+            return use_primary.get()
+
+        @app.post("/write")
+        def write():
+            return use_primary.get()
+
+        app.add_middleware(ReadWriteRoutingMiddleware, sticky_seconds=5)
+        self.client = TestClient(app)
+
+    def test_sticky_primary_after_write(self):
+        self.assertFalse(self.client.get("/read").json())
+        response = self.client.post("/write")
+        self.assertTrue(response.json())
+        self.assertIn("Max-Age=5", response.headers["set-cookie"])
+        self.assertTrue(self.client.get("/read").json())
+
+
+if __name__ == "__main__":
+    unittest.main()
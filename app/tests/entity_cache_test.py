@@ -0,0 +1,96 @@
+import unittest
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.orm import Session
+from app.models import Base, Blog, User
+from app.utils.entity_cache import EntityCache, LocalRedis, MemoryBackend, RedisBackend
+
+
+class EntityCacheTests:
+    """Shared cases, run against each backend."""
+
+    def make_backend(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        with Session(self.engine) as db:
+            db.add(User(id=1, email="a@example.com", full_name="A", password="hash"))
+            db.add(Blog(id=1, title="t", slug="s", content="c", author_id=1))
+            db.commit()
+        backend = self.make_backend()
+        self.blogs = EntityCache(Blog, backend, ttl=60, negative_ttl=5)
+        self.users = EntityCache(User, backend, ttl=60, negative_ttl=5, exclude=("password",))
+        self.selects = 0
+        event.listen(self.engine, "before_cursor_execute", self.count_select)
+
+    def count_select(self, conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.selects += 1
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def load(self, cache, entity_id, version=0):
+        with Session(self.engine) as db:
+            entity = cache.load(db, entity_id, version)
+            return entity and {column: getattr(entity, column) for column in ("id", "created_at")}
+
+    def test_read_through_and_invalidate(self):
+        first = self.load(self.blogs, 1)
+        self.assertEqual(self.load(self.blogs, 1), first)
+        self.assertEqual(self.selects, 1)
+        self.blogs.invalidate(1)
+        self.load(self.blogs, 1)
+        self.assertEqual(self.selects, 2)
+        self.assertEqual(self.blogs.stats()["hits"], 1)
+
+    def test_entries_are_only_served_at_their_table_version(self):
+        self.load(self.blogs, 1, version=3)
+        with Session(self.engine) as db:
+            # Another worker updates the row: it bumps the version but cannot
+            # invalidate this process's entries.
+            db.execute(update(Blog).where(Blog.id == 1).values(title="new"))
+            db.commit()
+        with Session(self.engine) as db:
+            self.assertEqual(self.blogs.load(db, 1, 4).title, "new")
+            self.assertEqual(self.selects, 2)
+            self.assertEqual(self.blogs.load(db, 1, 4).title, "new")
+            self.assertEqual(self.selects, 2)
+        self.assertEqual(self.blogs.stats()["stale"], 1)
+
+    def test_negative_caching(self):
+        self.assertIsNone(self.load(self.blogs, 99))
+        self.assertIsNone(self.load(self.blogs, 99))
+        self.assertEqual(self.selects, 1)
+        self.assertEqual(self.blogs.stats()["negative_hits"], 1)
+
+    def test_excluded_columns_load_lazily(self):
+        self.load(self.users, 1)
+        with Session(self.engine) as db:
+            user = self.users.load(db, 1, 0)
+            self.assertEqual(self.selects, 1)
+            self.assertEqual(user.password, "hash")
+            self.assertEqual(self.selects, 2)
+            user.full_name = "B"
+            db.commit()
+        with Session(self.engine) as db:
+            self.assertEqual(db.get(User, 1).full_name, "B")
+
+
+class TestMemoryBackend(EntityCacheTests, unittest.TestCase):
+    def make_backend(self):
+        return MemoryBackend(maxsize=10)
+
+    def test_memory_is_reported(self):
+        self.load(self.blogs, 1)
+        self.assertGreater(self.blogs.stats()["backend"]["memory_bytes"], 0)
+
+
+class TestRedisBackend(EntityCacheTests, unittest.TestCase):
+    def make_backend(self):
+        return RedisBackend(LocalRedis())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+from app.models import Base
+from app.models.blog_model import Blog
+from app.models.user_model import User
+from app.repositories.blog_repository import BlogRepository
+from app.repositories.blog_search_repository import BlogSearchRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.blog_schema import BlogCreate, BlogUpdate
+from app.utils.entity_cache import blog_cache, user_cache
+from app.routes import blog_route, user_routes
+from app.tests.route_client import route_client, shared_memory_engine
+from app.utils.etag import make_etag, check_etag
+
+
+class TestTableVersions(unittest.TestCase):
+    def setUp(self):
+        blog_cache.clear()
+        user_cache.clear()
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        BlogSearchRepository.ensure_schema(self.engine)
+        self.db = Session(self.engine)
+        self.db.add(User(email="a@example.com", full_name="A", password="x"))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_writes_bump_versions(self):
+        blogs = BlogRepository(self.db)
+        self.assertEqual(blogs.get_version(), 0)
+        blog = blogs.create(BlogCreate(title="t", slug="s"), author_id=1)
+        blogs.update(blog, BlogUpdate(title="u"))
+        self.assertEqual(blogs.get_version(), 2)
+
+        users = UserRepository(self.db)
+        users.delete(users.get_by_id(1))
+        self.assertEqual(users.get_version(), 1)
+        self.assertEqual(blogs.get_version(), 3)
+
+    def test_failed_write_does_not_bump(self):
+        blogs = BlogRepository(self.db)
+        blogs.create(BlogCreate(title="t", slug="s"), author_id=1)
+        with self.assertRaises(Exception):
+            blogs.create(BlogCreate(title="t", slug="s"), author_id=1)
+        self.assertEqual(blogs.get_version(), 1)
+
+
+class TestCheckEtag(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+        self.rendered = 0
+
+        @app.get("/items")
+        def items(request: Request, response: Response):
+            not_modified = check_etag(request, response, make_etag({"items": 3}))
+            if not_modified:
+                return not_modified
+            self.rendered += 1
+            return ["a", "b"]
+
+        self.client = TestClient(app)
+
+    def test_round_trip(self):
+        first = self.client.get("/items")
+        self.assertEqual(first.headers["etag"], 'W/"items-3"')
+        second = self.client.get("/items", headers={"If-None-Match": first.headers["etag"]})
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+        self.assertEqual(self.rendered, 1)
+
+    def test_mismatch_and_weak_match(self):
+        self.assertEqual(self.client.get("/items", headers={"If-None-Match": '"items-2"'}).status_code, 200)
+        self.assertEqual(self.client.get("/items", headers={"If-None-Match": 'W/"items-3", "x"'}).status_code, 304)
+        self.assertEqual(self.client.get("/items", headers={"If-None-Match": '"items-3"'}).status_code, 304)
+
+
+class TestSingleItemEtag(unittest.TestCase):
+    def setUp(self):
+        blog_cache.clear()
+        user_cache.clear()
+        self.engine = shared_memory_engine()
+        self.addCleanup(self.engine.dispose)
+        with Session(self.engine, expire_on_commit=False) as db:
+            self.user = User(email="a@example.com", full_name="A", password="x")
+            db.add(self.user)
+            db.flush()
+            db.add_all([Blog(title="one", slug="one", author_id=self.user.id),
+                        Blog(title="two", slug="two", author_id=self.user.id)])
+            db.commit()
+        self.client = route_client(self.engine, blog_route.router, user_routes.router, user=self.user)
+
+    def test_etag_names_the_item(self):
+        self.assertEqual(make_etag({"blogs": 4}, resource="blog-7"), 'W/"blog-7.blogs-4"')
+        first = self.client.get("/blogs/1").headers["etag"]
+        # Blog 2 must not be answered 304 with blog 1's ETag.
+        res = self.client.get("/blogs/2", headers={"If-None-Match": first})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["slug"], "two")
+        self.assertEqual(self.client.get("/blogs/1", headers={"If-None-Match": first}).status_code, 304)
+        user_etag = self.client.get(f"/users/{self.user.id}").headers["etag"]
+        self.assertTrue(user_etag.startswith(f'W/"user-{self.user.id}.'))
+
+    def test_write_in_another_worker_is_not_served_from_this_cache(self):
+        old = self.client.get("/blogs/1")
+        self.assertEqual(old.json()["title"], "one")
+        # What another worker's update does here: row and version change, but
+        # this process's blog_cache is never told.
+        with Session(self.engine) as db:
+            db.execute(update(Blog).where(Blog.id == 1).values(title="changed"))
+            BlogRepository(db).versions.bump("blogs")
+            db.commit()
+        res = self.client.get("/blogs/1", headers={"If-None-Match": old.headers["etag"]})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["title"], "changed")
+        self.assertEqual(self.client.get("/blogs/1", headers={"If-None-Match": res.headers["etag"]}).status_code, 304)
+
+
+if __name__ == "__main__":
+    unittest.main()
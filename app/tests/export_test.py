@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+import unittest
+from unittest import mock
+from sqlalchemy.orm import Session
+from app.models import Blog, User
+from app.repositories.blog_repository import EXPORT_COLUMNS as BLOG_COLUMNS, BlogRepository
+from app.repositories.user_repository import EXPORT_COLUMNS as USER_COLUMNS
+from app.routes import blog_route, user_routes
+from app.tests.route_client import route_client, shared_memory_engine
+from app.utils.export import _encode_ndjson
+
+TRICKY = 'Hello, "world"\nsecond line, with commas\r\nand a CRLF'
+PASSWORD_HASH = "$2b$12$never-exported-hash"
+
+
+class TestExports(unittest.TestCase):
+    def setUp(self):
+        self.engine = shared_memory_engine()
+        self.addCleanup(self.engine.dispose)
+        with Session(self.engine, expire_on_commit=False) as db:
+            self.user = User(email="a@example.com", full_name="A, Jr.", password=PASSWORD_HASH)
+            db.add(self.user)
+            db.flush()
+            for i in range(7):
+                db.add(Blog(title=f"t{i}", slug=f"s{i}", content=TRICKY if i == 3 else f"c{i}",
+                            author_id=self.user.id))
+            db.commit()
+        self.client = route_client(self.engine, blog_route.router, user_routes.router, user=self.user)
+
+    def export(self, path, fmt):
+        res = self.client.get(path, params={"format": fmt})
+        self.assertEqual(res.status_code, 200)
+        return res
+
+    def test_blogs_as_ndjson(self):
+        res = self.export("/blogs/export", "ndjson")
+        self.assertEqual(res.headers["content-type"], "application/x-ndjson")
+        self.assertIn('filename="blogs.ndjson"', res.headers["content-disposition"])
+        rows = [json.loads(line) for line in res.text.splitlines()]
+        self.assertEqual([row["id"] for row in rows], list(range(1, 8)))
+        self.assertEqual(list(rows[0]), BLOG_COLUMNS)
+        self.assertEqual(rows[3]["content"], TRICKY)
+
+    def test_blogs_as_csv_quote_commas_quotes_and_newlines(self):
+        res = self.export("/blogs/export", "csv")
+        self.assertTrue(res.headers["content-type"].startswith("text/csv"))
+        reader = csv.DictReader(io.StringIO(res.text, newline=""))
+        self.assertEqual(reader.fieldnames, BLOG_COLUMNS)
+        rows = list(reader)
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(rows[3]["content"], TRICKY)
+        self.assertEqual(rows[3]["slug"], "s3")
+
+    def test_user_exports_never_include_the_password(self):
+        for fmt in ("ndjson", "csv"):
+            body = self.export("/users/export", fmt).text
+            self.assertNotIn(PASSWORD_HASH, body)
+            self.assertNotIn("password", body)
+        row = json.loads(self.export("/users/export", "ndjson").text)
+        self.assertEqual(list(row), USER_COLUMNS)
+        self.assertEqual(next(csv.DictReader(io.StringIO(self.export("/users/export", "csv").text)))["full_name"],
+                         "A, Jr.")
+
+    def test_rows_are_complete_across_batch_boundaries(self):
+        with mock.patch.object(blog_route, "EXPORT_BATCH_SIZE", 3):
+            ndjson = [json.loads(line)["id"] for line in self.export("/blogs/export", "ndjson").text.splitlines()]
+            rows = list(csv.DictReader(io.StringIO(self.export("/blogs/export", "csv").text, newline="")))
+        self.assertEqual(ndjson, list(range(1, 8)))
+        self.assertEqual([int(row["id"]) for row in rows], list(range(1, 8)))
+        with Session(self.engine) as db:
+            self.assertEqual([row["id"] for row in BlogRepository(db).iter_export(batch_size=2)], list(range(1, 8)))
+
+    def test_ndjson_is_flushed_once_per_batch(self):
+        chunks = list(_encode_ndjson(({"id": i} for i in range(7)), batch_size=3))
+        self.assertEqual([chunk.count(b"\n") for chunk in chunks], [3, 3, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
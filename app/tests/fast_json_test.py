@@ -0,0 +1,87 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.controllers.blog_controller import BlogController
+from app.controllers.user_controller import UserController
+from app.models import Base, Blog, User
+from app.schemas.blog_schema import BlogPage
+from app.schemas.user_schema import UserResponse
+from app.tests.query_guard import QueryCounter
+from app.utils import fast_json
+from app.utils.entity_cache import blog_cache, user_cache
+
+# Non-ASCII, escapes and control characters that JSON encoders disagree on most often.
+AWKWARD = ['café — naïve', 'emoji 🚀 and 中文', 'quote " backslash \\ slash /',
+           'tab\tnewline\ncr\r nul\x00 bell\x07 del\x7f', 'line sep \u2028 para \u2029', '<script>&amp;</script>']
+
+
+def fastapi_body(model, data) -> bytes:
+    """What a route with `response_model=model` sends for `data`."""
+    return JSONResponse(TypeAdapter(model).dump_python(
+        TypeAdapter(model).validate_python(data, from_attributes=True), mode="json")).body
+
+
+class TestFastJsonCompat(unittest.TestCase):
+    def setUp(self):
+        blog_cache.clear()
+        user_cache.clear()
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        with self.Session() as db:
+            for i, text in enumerate(AWKWARD):
+                user = User(email=f"u{i}@example.com", full_name=text, password="secret-hash",
+                            created_at=datetime(2024, 1, 2, 3, 4, 5, i * 1000))
+                db.add(user)
+                db.flush()
+                db.add(Blog(title=text, slug=f"s{i}", content=None if i % 2 else text,
+                            author_id=user.id, created_at=datetime(2024, 5, 6, 7, 8, i)))
+            db.commit()
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def assert_pages_match(self):
+        with self.Session() as db:
+            expected = fastapi_body(BlogPage, BlogController(db).get_blogs(4))
+        with self.Session() as db:
+            fast = fast_json.dumps(BlogController(db).get_blogs(4, as_rows=True))
+        self.assertEqual(fast, expected)
+
+    def test_blog_page_bytes_match_response_model(self):
+        self.assert_pages_match()
+
+    def test_user_list_bytes_match_response_model(self):
+        with self.Session() as db:
+            expected = fastapi_body(list[UserResponse], UserController(db).get_users())
+        with self.Session() as db:
+            fast = fast_json.dumps(UserController(db).get_users(as_rows=True))
+        self.assertEqual(fast, expected)
+        self.assertNotIn(b"password", fast)
+
+    def test_stdlib_fallback_matches(self):
+        with mock.patch.object(fast_json, "orjson", None):
+            self.assert_pages_match()
+
+    def test_aware_datetimes_match_pydantic(self):
+        adapter = TypeAdapter(datetime)
+        for value in (datetime(2024, 1, 1, tzinfo=timezone.utc),
+                      datetime(2024, 1, 1, 12, 30, 0, 500, tzinfo=timezone(timedelta(hours=5, minutes=30)))):
+            expected = adapter.dump_json(value)
+            self.assertEqual(fast_json.dumps(value), expected)
+            with mock.patch.object(fast_json, "orjson", None):
+                self.assertEqual(fast_json.dumps(value), expected)
+
+    def test_row_path_selects_only_response_columns(self):
+        with self.Session() as db, QueryCounter(self.engine) as counter:
+            UserController(db).get_users(as_rows=True)
+        self.assertEqual(counter.count, 1)
+        self.assertNotIn("password", counter.statements[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
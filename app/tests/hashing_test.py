@@ -0,0 +1,25 @@
+import unittest
+from app.utils.hashing import HashingService, _checkpw, _hashpw
+
+
+class TestHashingService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.service = HashingService(max_workers=1, timeout=30)
+
+    def tearDown(self):
+        self.service.shutdown()
+
+    async def test_hash_and_verify_on_process_pool(self):
+        hashed = await self.service.run_async(_hashpw, b"secret")
+        self.assertTrue(await self.service.run_async(_checkpw, b"secret", hashed))
+        self.assertFalse(self.service.run(_checkpw, b"wrong", hashed))
+        self.assertEqual(self.service.stats()["timeouts"], 0)
+
+    async def test_inline_mode_without_workers(self):
+        service = HashingService(max_workers=0, timeout=30)
+        hashed = await service.run_async(_hashpw, b"secret")
+        self.assertTrue(service.run(_checkpw, b"secret", hashed))
+
+
+if __name__ == "__main__":
+    unittest.main()
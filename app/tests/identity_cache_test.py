@@ -0,0 +1,87 @@
+import unittest
+from fastapi import HTTPException, Request
+from sqlalchemy import create_engine, delete, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from app.controllers.auth_controller import create_access_token
+from app.middleware.auth_middleware import get_current_user, get_current_user_async
+from app.models import Base, User
+from app.repositories.table_version_repository import TableVersionRepository
+from app.tests.query_guard import QueryCounter
+from app.tests.route_client import shared_memory_engine
+from app.utils.identity_cache import identity_cache
+
+EMAIL = "a@example.com"
+
+
+class TestIdentityCache(unittest.TestCase):
+    def setUp(self):
+        identity_cache.clear()
+        self.engine = create_engine("sqlite://")
+        self.addCleanup(self.engine.dispose)
+        Base.metadata.create_all(self.engine)
+        with Session(self.engine) as db:
+            db.add(User(email=EMAIL, full_name="A", password="x"))
+            db.commit()
+        token = create_access_token(EMAIL)
+        self.request = Request({
+            "type": "http", "method": "GET", "path": "/",
+            "headers": [(b"cookie", f"access_token={token}".encode("latin-1"))],
+        })
+
+    def current(self):
+        with Session(self.engine) as db:
+            return get_current_user(self.request, db=db)
+
+    def write_in_another_worker(self, statement):
+        # Row and users version change, but this process's identity_cache is never told.
+        with Session(self.engine) as db:
+            db.execute(statement)
+            TableVersionRepository(db).bump("users")
+            db.commit()
+
+    def test_hit_reads_only_the_users_version(self):
+        self.current()
+        with QueryCounter(self.engine) as queries:
+            self.assertEqual(self.current().email, EMAIL)
+        self.assertEqual(queries.count, 1, queries.statements)
+        self.assertIn("table_versions", queries.statements[0])
+
+    def test_delete_in_another_worker_ends_the_identity(self):
+        self.current()
+        self.write_in_another_worker(delete(User).where(User.email == EMAIL))
+        with self.assertRaises(HTTPException) as ctx:
+            self.current()
+        self.assertEqual(ctx.exception.status_code, 401)
+
+    def test_update_in_another_worker_is_seen_on_the_next_request(self):
+        self.current()
+        self.write_in_another_worker(update(User).where(User.email == EMAIL).values(full_name="Renamed"))
+        self.assertEqual(self.current().full_name, "Renamed")
+
+
+class TestAsyncIdentity(unittest.IsolatedAsyncioTestCase):
+    async def test_async_dependency_shares_the_identity_cache(self):
+        identity_cache.clear()
+        engine = shared_memory_engine()
+        self.addCleanup(engine.dispose)
+        with Session(engine) as db:
+            db.add(User(email=EMAIL, full_name="A", password="x"))
+            db.commit()
+        request = Request({
+            "type": "http", "method": "GET", "path": "/",
+            "headers": [(b"cookie", f"access_token={create_access_token(EMAIL)}".encode("latin-1"))],
+        })
+        async_engine = create_async_engine(engine.url.set(drivername="sqlite+aiosqlite"), poolclass=NullPool)
+        async with AsyncSession(async_engine) as db:
+            self.assertEqual((await get_current_user_async(request, db=db)).email, EMAIL)
+        await async_engine.dispose()
+
+        with Session(engine) as db, QueryCounter(engine) as queries:
+            self.assertEqual(get_current_user(request, db=db).email, EMAIL)
+        self.assertEqual(queries.count, 1, queries.statements)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import io
+import json
+import logging
+import queue
+import unittest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.config.logger import (
+    AsyncQueueHandler, DrainingQueueListener, JsonFormatter, RateLimitFilter, request_id,
+)
+from app.middleware.request_id import RequestIdMiddleware
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Unprintable:
+    """Fails if formatted, to prove the caller thread never formats."""
+
+    def __str__(self):
+        raise AssertionError("formatted in the caller")
+
+
+class TestLoggingPipeline(unittest.TestCase):
+    def setUp(self):
+        self.queue = queue.Queue(maxsize=3)
+        self.handler = AsyncQueueHandler(self.queue)
+        self.logger = logging.getLogger(f"test.{self.id()}")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+
+    def test_records_are_formatted_on_the_listener_thread(self):
+        output = io.StringIO()
+        sink = logging.StreamHandler(output)
+        sink.setFormatter(JsonFormatter())
+        listener = DrainingQueueListener(self.queue, sink)
+        listener.start()
+        token = request_id.set("req-1")
+        try:
+            self.logger.info("Fetched page of %s blogs.", 3, extra={"route": "/blogs/"})
+        finally:
+            request_id.reset(token)
+        listener.stop()
+        entry = json.loads(output.getvalue())
+        self.assertEqual(entry["message"], "Fetched page of 3 blogs.")
+        self.assertEqual(entry["request_id"], "req-1")
+        self.assertEqual(entry["route"], "/blogs/")
+        self.assertEqual(entry["level"], "INFO")
+
+    def test_caller_does_not_format(self):
+        self.logger.info("value %s", Unprintable())
+        record = self.queue.get_nowait()
+        self.assertEqual(record.msg, "value %s")
+
+    def test_exceptions_are_rendered_before_enqueueing(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            self.logger.exception("failed")
+        record = self.queue.get_nowait()
+        self.assertIsNone(record.exc_info)
+        self.assertIn("ValueError: boom", json.loads(JsonFormatter().format(record))["exc_info"])
+
+    def test_full_queue_drops_and_counts(self):
+        for i in range(5):
+            self.logger.warning("w %s", i)
+        self.assertEqual((self.handler.enqueued, self.handler.dropped), (3, 2))
+
+    def test_rate_limit_per_call_site(self):
+        clock = FakeClock()
+        limit = RateLimitFilter(rate=1, burst=2, clock=clock)
+        self.handler.addFilter(limit)
+        self.handler.queue = queue.Queue()
+        self.emit_from_one_site(5)
+        self.logger.warning("never limited")
+        self.logger.info("another site")
+        clock.now = 1.0
+        self.emit_from_one_site(1)
+        self.assertEqual(
+            [(record.getMessage(), getattr(record, "suppressed", None)) for record in self.drain()],
+            [("site", 0), ("site", 0), ("never limited", None), ("another site", 0), ("site", 3)],
+        )
+        self.assertEqual(limit.suppressed, 3)
+
+    def emit_from_one_site(self, times):
+        for _ in range(times):
+            self.logger.info("site")
+
+    def drain(self):
+        records = []
+        while not self.handler.queue.empty():
+            records.append(self.handler.queue.get_nowait())
+        return records
+
+
+class TestRequestIdMiddleware(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+
+        @app.get("/")
+        def index():
+            return {"request_id": request_id.get()}
+
+        app.add_middleware(RequestIdMiddleware)
+        self.client = TestClient(app)
+
+    def test_generates_and_echoes_id(self):
+        res = self.client.get("/")
+        self.assertEqual(len(res.headers["x-request-id"]), 32)
+        self.assertEqual(res.json()["request_id"], res.headers["x-request-id"])
+
+    def test_keeps_well_formed_incoming_id_only(self):
+        res = self.client.get("/", headers={"X-Request-ID": "edge-123"})
+        self.assertEqual(res.json()["request_id"], "edge-123")
+        res = self.client.get("/", headers={"X-Request-ID": "bad id\nforged"})
+        self.assertNotEqual(res.headers["x-request-id"], "bad id\nforged")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from unittest import mock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from app.config.config import settings
+from app.config.db_pool import track_queries
+from app.routes import metrics_route
+from app.middleware.metrics import MetricsMiddleware, db_queries_per_request, http_requests, http_request_duration
+from app.utils.metrics import Counter, Family, Histogram
+from app.utils.prometheus import render_family
+
+
+class TestMetricsMiddleware(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        track_queries(engine)
+        app = FastAPI()
+
+        @app.get("/metrics-test/{item_id}")
+        def item(item_id: int):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+            return {"id": item_id}
+
+        app.add_middleware(MetricsMiddleware)
+        self.client = TestClient(app)
+
+    def test_labels_by_route_template(self):
+        self.client.get("/metrics-test/1")
+        self.client.get("/metrics-test/2")
+        self.client.get("/metrics-test/nope")
+        route = "/metrics-test/{item_id}"
+        self.assertEqual(http_requests.child("GET", route, "200").value, 2)
+        self.assertEqual(http_requests.child("GET", route, "422").value, 1)
+        self.assertEqual(http_request_duration.child("GET", route).snapshot()["count"], 3)
+        self.assertEqual(db_queries_per_request.child("GET", route).snapshot()["sum"], 4)
+
+    def test_unmatched_paths_share_one_label(self):
+        self.client.get("/missing/1")
+        self.client.get("/missing/2")
+        self.assertEqual(http_requests.child("GET", "<unmatched>", "404").value, 2)
+
+
+class TestPrometheusRendering(unittest.TestCase):
+    def test_histogram_exposition(self):
+        family = Family("latency_seconds", "Latency.", ("route",), lambda: Histogram((0.1, 1.0)))
+        family.child('/a"b').observe(0.5)
+        self.assertEqual(render_family(family), [
+            "# HELP latency_seconds Latency.",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{route="/a\\"b",le="0.1"} 0',
+            'latency_seconds_bucket{route="/a\\"b",le="1.0"} 1',
+            'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 1',
+            'latency_seconds_sum{route="/a\\"b"} 0.5',
+            'latency_seconds_count{route="/a\\"b"} 1',
+        ])
+
+    def test_family_without_samples_still_declares_its_type(self):
+        family = Family("jobs_total", "Jobs.", ("queue",), Counter)
+        self.assertEqual(render_family(family), ["# HELP jobs_total Jobs.", "# TYPE jobs_total counter"])
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+        app.include_router(metrics_route.router)
+        self.client = TestClient(app)
+
+    def scrape(self, token: str | None, configured: str | None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        with mock.patch.object(settings, "METRICS_TOKEN", configured):
+            return self.client.get("/metrics", headers=headers)
+
+    def test_hidden_without_a_configured_token(self):
+        self.assertEqual(self.scrape(None, None).status_code, 404)
+        self.assertEqual(self.scrape("anything", None).status_code, 404)
+
+    def test_requires_the_bearer_token(self):
+        self.assertEqual(self.scrape(None, "s3cret").status_code, 401)
+        self.assertEqual(self.scrape("wrong", "s3cret").status_code, 401)
+        res = self.scrape("s3cret", "s3cret")
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("# TYPE http_requests_total counter", res.text)
+
+
+if __name__ == "__main__":
+    unittest.main()
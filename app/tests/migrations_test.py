@@ -0,0 +1,71 @@
+import os
+import unittest
+from datetime import datetime
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+from app.models import Base
+from app.repositories.blog_repository import BlogRepository
+from app.schemas.blog_schema import BlogCreate
+from app.utils.entity_cache import blog_cache
+
+ALEMBIC_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "alembic")
+
+
+def ignore_search_objects(object, name, type_, reflected, compare_to):
+    return not (type_ == "table" and name.startswith("blogs_fts"))
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        blog_cache.clear()
+        self.engine = create_engine("sqlite://")
+        self.conn = self.engine.connect()
+        self.config = Config()
+        self.config.set_main_option("script_location", ALEMBIC_DIR)
+        self.config.attributes["connection"] = self.conn
+        command.upgrade(self.config, "head")
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+        self.engine.dispose()
+
+    def test_models_match_migrations(self):
+        context = MigrationContext.configure(self.conn, opts={"include_object": ignore_search_objects})
+        self.assertEqual(compare_metadata(context, Base.metadata), [])
+
+    def test_downgrade_to_base(self):
+        command.downgrade(self.config, "base")
+        self.assertFalse(self.engine.dialect.has_table(self.conn, "blogs"))
+
+    def test_repository_queries_use_indexes(self):
+        statements = []
+
+        @event.listens_for(self.conn, "before_cursor_execute")
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append((statement, parameters))
+
+        db = Session(bind=self.conn)
+        db.execute(text("INSERT INTO users (id, email, full_name, password) VALUES (1, 'a@b.c', 'A', 'x')"))
+        repository = BlogRepository(db)
+        repository.create(BlogCreate(title="t", slug="s"), author_id=1)
+        repository.get_page(10, after=(datetime(2100, 1, 1), 1))
+        repository.get_by_id(1)
+        event.remove(self.conn, "before_cursor_execute", capture)
+
+        self.assertGreaterEqual(len(statements), 3)
+        for statement, parameters in statements:
+            plan = [row[-1] for row in self.conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+            for step in plan:
+                if "blogs" in step:
+                    self.assertTrue(step.startswith("SEARCH") or "USING" in step, f"{statement!r} -> {plan}")
+        db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
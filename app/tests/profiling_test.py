@@ -0,0 +1,90 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.config.config import settings
+from app.middleware.profiling import ProfilingMiddleware
+from app.tests.route_client import shared_memory_engine
+from app.utils.profiling import Profile, ProfiledRoute, ProfileStore, profiled
+
+SLOW_QUERY = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 300000) SELECT count(*) FROM c"
+)
+
+
+def count_rows(engine):
+    with engine.connect() as conn:
+        return conn.execute(SLOW_QUERY).scalar()
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.engine = shared_memory_engine()
+        with mock.patch.object(settings, "PROFILE_SAMPLE_RATE", 3):
+            router = APIRouter(route_class=ProfiledRoute)
+
+            @router.get("/rows/{n}")
+            def rows(n: int):
+                return {"n": n, "count": count_rows(self.engine)}
+
+        app = FastAPI()
+        app.include_router(router)
+        self.store = ProfileStore(self.dir.name, max_files=2)
+        app.add_middleware(ProfilingMiddleware, token="secret", sample_rate=3, store=self.store, interval=0.001)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.dir.cleanup()
+
+    def files(self):
+        return sorted(Path(self.dir.name).glob("*.folded"))
+
+    def test_authorized_header_writes_a_folded_profile(self):
+        res = self.client.get("/rows/1", headers={"X-Profile-Token": "secret"})
+        self.assertEqual(res.json(), {"n": 1, "count": 300000})
+        path = Path(self.dir.name) / res.headers["x-profile-file"]
+        lines = path.read_text().splitlines()
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        self.assertGreater(int(count), 0)
+        frames = stack.split(";")
+        self.assertEqual(frames[0], "GET /rows/{n}")
+        self.assertIn("rows", frames[1])
+        self.assertTrue(any(frame.startswith("SQL WITH RECURSIVE") for frame in frames), frames)
+
+    def test_wrong_or_missing_token_is_not_profiled(self):
+        for headers in ({"X-Profile-Token": "guess"}, {}):
+            res = self.client.get("/rows/1", headers=headers)
+            self.assertNotIn("x-profile-file", res.headers)
+        self.assertEqual(self.files(), [])
+
+    def test_samples_one_request_in_n_without_naming_the_file(self):
+        for n in range(3):
+            res = self.client.get(f"/rows/{n}")
+            self.assertNotIn("x-profile-file", res.headers)
+        self.assertEqual(len(self.files()), 1)
+
+    def test_store_keeps_the_newest_files(self):
+        profile = Profile(interval=0.001)
+        for ts in (1, 2, 3):
+            self.store.write(f"{ts:013d}-x.folded", profile)
+        self.assertEqual([p.name for p in self.files()], ["0000000000002-x.folded", "0000000000003-x.folded"])
+
+
+class TestProfiledRoute(unittest.TestCase):
+    def test_plain_endpoint_when_profiling_is_off(self):
+        def index():
+            return {}
+
+        with mock.patch.object(settings, "PROFILE_TOKEN", None), mock.patch.object(settings, "PROFILE_SAMPLE_RATE", 0):
+            self.assertIs(ProfiledRoute("/", index).endpoint, index)
+        self.assertIsNot(profiled(index), index)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """
+    Context manager that records every SQL statement an engine executes.
+
+        with QueryCounter(engine) as queries:
+            ...
+        assert queries.count <= 2, queries.statements
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+
+def assert_queries_do_not_scale(engine: Engine, run, sizes: tuple[int, ...] = (1, 5, 20)) -> int:
+    """
+    Fail when the number of statements `run(size)` executes grows with `size`.
+
+    This is the N+1 guard: run the same code path for result sets of
+    different sizes and require an identical statement count.
+
+    Args:
+        engine (Engine): Engine whose statements are counted.
+        run: Callable taking a result size; it should fetch and serialize that many rows.
+        sizes (tuple[int, ...]): Result sizes to compare.
+
+    Returns:
+        int: The (constant) statement count.
+
+    Raises:
+        AssertionError: If any two sizes executed a different number of statements.
+    """
+    counts = {}
+    for size in sizes:
+        with QueryCounter(engine) as queries:
+            run(size)
+        counts[size] = queries
+    distinct = {queries.count for queries in counts.values()}
+    if len(distinct) > 1:
+        largest = counts[max(sizes)]
+        raise AssertionError(
+            "Statement count grows with result size (N+1?): "
+            + ", ".join(f"{size} rows -> {queries.count}" for size, queries in counts.items())
+            + "\nStatements for the largest run:\n  " + "\n  ".join(largest.statements)
+        )
+    return distinct.pop()
@@ -0,0 +1,59 @@
+import uuid
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
+from app.config.dbconf import get_async_db, get_db
+from app.middleware.auth_middleware import get_current_user, get_current_user_async
+from app.models import Base, User
+from app.repositories.blog_search_repository import BlogSearchRepository
+from app.utils.identity_cache import CurrentUser
+
+
+def shared_memory_engine() -> Engine:
+    """
+    In-memory SQLite with the full schema, shared by every thread (TestClient
+    runs sync routes in a pool). The database is named and in shared-cache
+    mode, so route_client's aiosqlite engine sees it too; it lives as long as
+    this engine's one static connection.
+    """
+    url = f"sqlite:///file:test-{uuid.uuid4().hex}?mode=memory&cache=shared&uri=true"
+    engine = create_engine(url, poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    BlogSearchRepository.ensure_schema(engine)
+    return engine
+
+
+def route_client(engine: Engine, *routers: APIRouter, user: User) -> TestClient:
+    """
+    A TestClient for `routers` whose sessions use `engine` and whose requests
+    are authenticated as `user`, without cookies or JWTs. Async routes get
+    aiosqlite sessions on the same database (see shared_memory_engine).
+    """
+    Session = sessionmaker(bind=engine, autoflush=False)
+    async_engine = create_async_engine(engine.url.set(drivername="sqlite+aiosqlite"), poolclass=NullPool)
+    AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    current = CurrentUser.from_user(user)
+
+    def override_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    app = FastAPI()
+    for router in routers:
+        app.include_router(router)
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_async_db] = override_async_db
+    app.dependency_overrides[get_current_user] = lambda: current
+    app.dependency_overrides[get_current_user_async] = lambda: current
+    return TestClient(app)
@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+from fastapi import FastAPI
+from app.config.config import settings
+from app.server import Server, available_cpus, check_cache_backend, post_fork, server_options, split_hasher_pool
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+class TestServer(unittest.TestCase):
+    def test_options_preload_and_recycle_uvicorn_workers(self):
+        options = server_options(3)
+        self.assertEqual(options["workers"], 3)
+        self.assertEqual(options["worker_class"], "uvicorn_worker.UvicornWorker")
+        self.assertTrue(options["preload_app"])
+        self.assertGreater(options["max_requests"], 0)
+        self.assertIs(options["post_fork"], post_fork)
+
+    def test_application_loads_the_factory_app(self):
+        server = Server(server_options(2))
+        self.assertEqual(server.cfg.workers, 2)
+        self.assertTrue(server.cfg.preload_app)
+        self.assertIsInstance(server.load(), FastAPI)
+
+    def test_available_cpus(self):
+        self.assertGreaterEqual(available_cpus(), 1)
+
+    def test_import_leaves_the_environment_alone(self):
+        env = {key: value for key, value in os.environ.items() if key != "HASHER_POOL_SIZE"}
+        result = subprocess.run(
+            [sys.executable, "-c", "import os, app.server; print(os.environ.get('HASHER_POOL_SIZE'))"],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "None")
+
+    def test_hasher_pool_is_split_between_workers_unless_set(self):
+        with mock.patch.dict(os.environ, {"WEB_CONCURRENCY": "2"}), \
+                mock.patch("app.server.available_cpus", return_value=8):
+            os.environ.pop("HASHER_POOL_SIZE", None)
+            split_hasher_pool()
+            self.assertEqual(os.environ["HASHER_POOL_SIZE"], "4")
+            os.environ["HASHER_POOL_SIZE"] = "1"
+            split_hasher_pool()
+            self.assertEqual(os.environ["HASHER_POOL_SIZE"], "1")
+
+    def test_per_process_cache_is_refused_with_several_workers(self):
+        with mock.patch.object(settings, "CACHE_BACKEND", "memory"):
+            check_cache_backend(1)
+            with self.assertRaises(SystemExit) as ctx:
+                check_cache_backend(4)
+            self.assertIn("CACHE_BACKEND=redis", str(ctx.exception))
+        for backend in ("redis", "none"):
+            with mock.patch.object(settings, "CACHE_BACKEND", backend):
+                check_cache_backend(4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from app.cli import import_users
+from app.config.db_routing import ReplicaSet, RoutingSession
+from app.controllers.user_controller import UserController
+from app.models import Base
+from app.models.user_model import User
+from app.utils.hashing import Hasher, HashingService
+
+
+class TestUserImport(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = Session(self.engine)
+        self.db.add(User(email="taken@example.com", full_name="Taken", password="x"))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_import_reports_per_row_errors(self):
+        records = [
+            (1, {"email": "a@example.com", "full_name": "A", "password": "secret"}),
+            (2, {"email": "taken@example.com", "full_name": "T", "password": "secret"}),
+            (3, {"email": "a@example.com", "full_name": "A2", "password": "secret"}),
+            (4, {"email": "not-an-email", "full_name": "B", "password": "secret"}),
+            (5, None),
+            (6, {"email": "c@example.com", "full_name": "C", "password": "other"}),
+        ]
+        report = UserController(self.db).import_users(records, HashingService(max_workers=0, timeout=0), chunk_size=2)
+
+        self.assertEqual((report["total"], report["created"], report["failed"]), (6, 2, 4))
+        self.assertEqual([error["line"] for error in report["errors"]], [2, 3, 4, 5])
+        user = self.db.query(User).filter_by(email="c@example.com").one()
+        self.assertTrue(Hasher.verify_password("other", user.password))
+
+    def test_cli_checks_existing_emails_on_the_primary(self):
+        # The replica has not caught up with taken@example.com yet.
+        replica = create_engine("sqlite://")
+        Base.metadata.create_all(replica)
+        self.addCleanup(replica.dispose)
+        routed = sessionmaker(class_=RoutingSession, primary=self.engine, replicas=ReplicaSet([replica]))
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+            f.write("email,full_name,password\ntaken@example.com,T,secret\nnew@example.com,N,secret\n")
+        self.addCleanup(os.unlink, f.name)
+
+        stderr = io.StringIO()
+        with mock.patch.object(import_users, "SessionLocal", routed), contextlib.redirect_stdout(io.StringIO()), \
+                contextlib.redirect_stderr(stderr):
+            self.assertEqual(import_users.main([f.name, "--workers", "0"]), 1)
+
+        self.assertIn("line 2 (taken@example.com)", stderr.getvalue())
+        self.assertNotIn("new@example.com", stderr.getvalue())
+        self.assertEqual(self.db.query(User).filter_by(email="new@example.com").count(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
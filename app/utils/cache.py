@@ -0,0 +1,98 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache whose entries also expire after a TTL.
+
+    Counters are kept for hits, misses, capacity evictions, expirations and
+    explicit invalidations; read them with `stats()`.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            maxsize (int): Maximum number of entries before the least recently used is evicted.
+            ttl (float): Default time-to-live of an entry in seconds.
+            clock (Callable[[], float]): Monotonic time source, injectable for tests.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for `key`, or `default` if absent or expired."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Store `value` under `key` for `ttl` seconds (default: the cache TTL)."""
+        if self.maxsize <= 0:
+            return
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Drop `key` from the cache if present."""
+        with self._lock:
+            if self._data.pop(key, _MISSING) is not _MISSING:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry; counters are kept."""
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def memory_usage(self, sizeof: Callable[[Any], int] = sys.getsizeof) -> int:
+        """Return the approximate bytes held by the cached values."""
+        with self._lock:
+            return sum(sizeof(value) for _, value in self._data.values())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Return a snapshot of the cache counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
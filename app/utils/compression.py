@@ -0,0 +1,177 @@
+import gzip
+import hashlib
+import threading
+import zlib
+import anyio.to_thread
+from fastapi import Response
+from app.config.config import settings
+from app.utils.cache import TTLCache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is a declared dependency
+    brotli = None
+
+# Offered in this order when the client weights them equally.
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+# Content types worth compressing; images, archives etc. are already compressed.
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """
+    Pick the best of ENCODINGS allowed by an Accept-Encoding header.
+
+    Honours q-values, including q=0 refusals and the "*" wildcard.
+
+    Returns:
+        str | None: "br", "gzip", or None to send the body uncompressed.
+    """
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: str | None) -> bool:
+    return content_type is not None and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a whole body at the configured level for `encoding`."""
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class StreamCompressor:
+    """Incremental compressor for bodies sent in several chunks."""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+            self._process, self._finish = self._compressor.process, self._compressor.finish
+        else:
+            self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._process, self._finish = self._compressor.compress, self._compressor.flush
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._process(chunk)
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+def compressed_response(content: bytes, encoding: str, response: Response) -> Response:
+    """Wrap an already-compressed JSON body, keeping headers (e.g. ETag) set on `response`."""
+    headers = {**response.headers, "Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+    return Response(content, media_type="application/json", headers=headers)
+
+
+class CompressedBodyCache:
+    """
+    Compressed response bodies by (entity id, encoding), so repeat reads of a
+    hot entity skip compression.
+
+    Each entry is tagged with a digest of the uncompressed body it was made
+    from and only served for that exact body. A row changed through another
+    process is therefore never masked, whatever the table versions say.
+    Repositories also call `invalidate` after an update or delete to free
+    the entry straight away.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, min_size: int):
+        """
+        Args:
+            maxsize (int): Maximum number of cached bodies.
+            ttl (float): Seconds a body stays cached.
+            min_size (int): Uncompressed bytes below which a body is cheap
+                enough to compress per request and is not cached.
+        """
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.min_size = min_size
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compress(self, entity_id, encoding: str, body: bytes) -> bytes:
+        """
+        Return `body` compressed with `encoding`, reusing the cached result
+        when this entity's body is unchanged. Bodies of at least `min_size`
+        bytes are cached.
+        """
+        if len(body) < self.min_size:
+            return compress(body, encoding)
+        key, digest, cached = self._lookup(entity_id, encoding, body)
+        if cached is not None:
+            return cached
+        compressed = compress(body, encoding)
+        self.cache.set(key, (digest, compressed))
+        return compressed
+
+    async def compress_async(self, entity_id, encoding: str, body: bytes) -> bytes:
+        """
+        `compress` for `async def` routes: a miss is compressed on a worker
+        thread, so a large body does not stall the event loop.
+        """
+        if len(body) < self.min_size:
+            return compress(body, encoding)
+        key, digest, cached = self._lookup(entity_id, encoding, body)
+        if cached is not None:
+            return cached
+        compressed = await anyio.to_thread.run_sync(compress, body, encoding)
+        self.cache.set(key, (digest, compressed))
+        return compressed
+
+    def _lookup(self, entity_id, encoding: str, body: bytes):
+        """Return the cache key, `body`'s digest and the cached compressed body (None on a miss)."""
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        key = (entity_id, encoding)
+        entry = self.cache.get(key)
+        hit = entry is not None and entry[0] == digest
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return key, digest, entry[1] if hit else None
+
+    def invalidate(self, *entity_ids) -> None:
+        for entity_id in entity_ids:
+            for encoding in ENCODINGS:
+                self.cache.delete((entity_id, encoding))
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def stats(self) -> dict:
+        stats = self.cache.stats()
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats.update(hits=self.hits, misses=self.misses, hit_ratio=self.hits / lookups if lookups else 0.0)
+        stats["memory_bytes"] = self.cache.memory_usage(lambda entry: len(entry[1]))
+        return stats
+
+
+compressed_blogs = CompressedBodyCache(
+    maxsize=settings.COMPRESSED_CACHE_MAX_SIZE,
+    ttl=settings.BLOG_CACHE_TTL_SECONDS,
+    min_size=settings.COMPRESSED_CACHE_MIN_SIZE,
+)
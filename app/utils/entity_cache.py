@@ -0,0 +1,333 @@
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Protocol
+from sqlalchemy import DateTime
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.config.config import settings
+from app.config.db_routing import primary_bind_arguments
+from app.config.logger import logger
+from app.models.blog_model import Blog
+from app.models.user_model import User
+from app.utils.cache import TTLCache
+
+# Stored for IDs known not to exist, so repeated lookups of missing rows skip the database.
+NEGATIVE = b"\x00"
+
+
+class CacheBackend(Protocol):
+    """Byte-oriented key/value store behind EntityCache."""
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    def delete(self, *keys: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict: ...
+
+
+class MemoryBackend:
+    """
+    Per-process LRU backend built on TTLCache.
+    """
+
+    def __init__(self, maxsize: int, clock: Callable[[], float] = time.monotonic):
+        self.cache = TTLCache(maxsize=maxsize, ttl=0, clock=clock)
+
+    def get(self, key: str) -> bytes | None:
+        return self.cache.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.cache.set(key, value, ttl=ttl)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.cache.delete(key)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def stats(self) -> dict:
+        return {"backend": "memory", **self.cache.stats(), "memory_bytes": self.cache.memory_usage()}
+
+
+class RedisBackend:
+    """
+    Networked backend shared by every worker, for any client with the
+    redis-py get/set(ex=)/delete/info API.
+
+    Lookup counters are per process; memory use is the server's.
+    """
+
+    def __init__(self, client, prefix: str = "dam:"):
+        """
+        Args:
+            client: A redis.Redis (or LocalRedis) instance.
+            prefix (str): Namespace prepended to every key.
+        """
+        self.client = client
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisBackend":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from e
+        return cls(redis.Redis.from_url(url, socket_timeout=0.05), **kwargs)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            value = self.client.get(self.prefix + key)
+        except Exception as e:
+            # An unreachable cache must degrade to database reads, not errors.
+            self._count("errors")
+            logger.warning("Cache get failed for %s: %s", key, e)
+            return None
+        self._count("hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        try:
+            self.client.set(self.prefix + key, value, ex=max(1, int(ttl)))
+        except Exception as e:
+            self._count("errors")
+            logger.warning("Cache set failed for %s: %s", key, e)
+
+    def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        # Unlike a failed get/set, a failed invalidation leaves stale data
+        # until the TTL, so let the writer see it.
+        self.client.delete(*(self.prefix + key for key in keys))
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "backend": "redis",
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "errors": self.errors,
+            }
+        try:
+            stats["memory_bytes"] = self.client.info("memory")["used_memory"]
+        except Exception:
+            stats["memory_bytes"] = None
+        return stats
+
+
+class LocalRedis:
+    """
+    In-process stand-in for a Redis server, for development and tests.
+
+    Implements the subset of the redis-py client used by RedisBackend.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._data: dict[str, tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= self._clock():
+                del self._data[key]
+                return None
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ex: int) -> None:
+        with self._lock:
+            self._data[key] = (self._clock() + ex, value)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def scan_iter(self, match: str):
+        prefix = match.rstrip("*")
+        with self._lock:
+            return [key for key in self._data if key.startswith(prefix)]
+
+    def info(self, section: str) -> dict:
+        with self._lock:
+            return {"used_memory": sum(len(key) + len(value) for key, (_, value) in self._data.items())}
+
+
+def create_backend(kind: str, url: str | None, maxsize: int) -> CacheBackend | None:
+    """
+    Build the backend named by CACHE_BACKEND: "memory", "redis", "local-redis" or "none".
+    """
+    if kind == "memory":
+        return MemoryBackend(maxsize)
+    if kind == "redis":
+        return RedisBackend.from_url(url)
+    if kind == "local-redis":
+        return RedisBackend(LocalRedis())
+    if kind == "none":
+        return None
+    raise ValueError(f"Unknown CACHE_BACKEND '{kind}'")
+
+
+class EntityCache:
+    """
+    Read-through cache of ORM rows by primary key.
+
+    Entries hold the row's column values, not the ORM object, so they can
+    live in a shared backend and be attached to whichever session asks.
+    Missing IDs are cached for `negative_ttl`.
+
+    Every entry is stamped with the table version (see TableVersionRepository)
+    the caller read before the fill, and is only served to a caller holding
+    that same version. Any committed write to the table bumps the version, so
+    an entry can never outlive a write, even in a worker that did not see it
+    or when a fill raced the writer's `invalidate`. Repositories still call
+    `invalidate` after committing, to free the entry at once.
+    """
+
+    def __init__(self, model, backend: CacheBackend | None, ttl: float, negative_ttl: float,
+                 exclude: tuple[str, ...] = ()):
+        """
+        Args:
+            model: The mapped class whose rows are cached.
+            backend (CacheBackend | None): Where entries are stored; None disables caching.
+            ttl (float): Seconds a found row stays cached.
+            negative_ttl (float): Seconds a missing ID stays cached.
+            exclude (tuple[str, ...]): Columns never written to the cache (e.g. password hashes);
+                they load from the database on first access.
+        """
+        self.model = model
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        columns = [column for column in model.__table__.columns if column.key not in exclude]
+        self._columns = [column.key for column in columns]
+        self._datetimes = {column.key for column in columns if isinstance(column.type, DateTime)}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def _key(self, entity_id) -> str:
+        return f"{self.model.__tablename__}:{entity_id}"
+
+    def _encode(self, entity) -> bytes:
+        data = {}
+        for key in self._columns:
+            value = getattr(entity, key)
+            data[key] = value.isoformat() if isinstance(value, datetime) else value
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+    def _decode(self, db: Session, raw: bytes):
+        data = json.loads(raw)
+        for key in self._datetimes:
+            if data.get(key) is not None:
+                data[key] = datetime.fromisoformat(data[key])
+        entity = self.model(**data)
+        make_transient_to_detached(entity)
+        return db.merge(entity, load=False)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def load(self, db: Session, entity_id, version: int):
+        """
+        Return the row with this primary key, from the cache when possible.
+
+        Args:
+            db (Session): Session the returned object is attached to.
+            entity_id: Primary key value.
+            version (int): The table's current version, read by the caller
+                before this call (usually the one its ETag is built from).
+
+        Returns:
+            The mapped object, or None if no such row exists.
+        """
+        if self.backend is None:
+            return db.get(self.model, entity_id)
+        key = self._key(entity_id)
+        raw = self.backend.get(key)
+        if raw is not None:
+            stamp, _, raw = raw.partition(b":")
+            if int(stamp) != version:
+                self._count("stale")
+                raw = None
+        if raw == NEGATIVE:
+            self._count("negative_hits")
+            return None
+        if raw is not None:
+            self._count("hits")
+            return self._decode(db, raw)
+        self._count("misses")
+        # Fill from the primary: the row read there is at least as new as
+        # `version`, which may come from a lagging replica, so the stamp never
+        # claims a newer version than the row it is stored with.
+        entity = db.get(self.model, entity_id, bind_arguments=primary_bind_arguments(db))
+        stamp = b"%d:" % version
+        if entity is None:
+            self.backend.set(key, stamp + NEGATIVE, self.negative_ttl)
+        else:
+            self.backend.set(key, stamp + self._encode(entity), self.ttl)
+        return entity
+
+    def invalidate(self, *entity_ids) -> None:
+        """Drop the entries (positive or negative) for these primary keys."""
+        if self.backend is not None and entity_ids:
+            self.backend.delete(*(self._key(entity_id) for entity_id in entity_ids))
+
+    def clear(self) -> None:
+        """Drop every entry in the backend."""
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> dict:
+        """Return entity-level hit/miss counters plus the backend's own stats."""
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "hit_ratio": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+            }
+        stats["backend"] = self.backend.stats() if self.backend is not None else None
+        return stats
+
+
+cache_backend = create_backend(settings.CACHE_BACKEND, settings.CACHE_URL, settings.CACHE_MAX_SIZE)
+
+blog_cache = EntityCache(
+    Blog, cache_backend,
+    ttl=settings.BLOG_CACHE_TTL_SECONDS,
+    negative_ttl=settings.CACHE_NEGATIVE_TTL_SECONDS,
+)
+user_cache = EntityCache(
+    User, cache_backend,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+    negative_ttl=settings.CACHE_NEGATIVE_TTL_SECONDS,
+    exclude=("password",),
+)
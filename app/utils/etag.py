@@ -0,0 +1,48 @@
+from fastapi import Request, Response, status
+
+# Clients may reuse a stored copy, but only after revalidating it.
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(versions: dict[str, int], resource: str | None = None) -> str:
+    """
+    Build an ETag from the change counters of every table a response reads.
+
+    Pass `resource` (e.g. "blog-7") for single-item responses, so items that
+    share the table versions still get different ETags.
+
+    The ETag is weak: the same version is sent brotli-, gzip- or un-encoded,
+    and a strong ETag would have to differ per content coding.
+    """
+    parts = [f"{table_name}-{version}" for table_name, version in versions.items()]
+    if resource is not None:
+        parts.insert(0, resource)
+    return 'W/"' + ".".join(parts) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Return True if the request's If-None-Match header covers `etag`.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so ignore any W/ prefix.
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def check_etag(request: Request, response: Response, etag: str) -> Response | None:
+    """
+    Tag the response with `etag`, or short-circuit with a 304 when the client already has it.
+
+    Call this before loading or serializing the body: when it returns a
+    response, return that from the route as-is.
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterable, Iterator, Literal
+from fastapi.responses import StreamingResponse
+
+EXPORT_BATCH_SIZE = 1000
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _default(value):
+    """Render values json/csv can't handle natively the same way the JSON API does."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _encode_ndjson(rows: Iterable[dict], batch_size: int) -> Iterator[bytes]:
+    """Encode rows as one JSON document per line, flushing once per batch."""
+    buffer = []
+    for row in rows:
+        buffer.append(json.dumps(row, default=_default, ensure_ascii=False))
+        if len(buffer) >= batch_size:
+            yield ("\n".join(buffer) + "\n").encode("utf-8")
+            buffer.clear()
+    if buffer:
+        yield ("\n".join(buffer) + "\n").encode("utf-8")
+
+
+def _encode_csv(rows: Iterable[dict], columns: list[str], batch_size: int) -> Iterator[bytes]:
+    """Encode rows as CSV with a header line, flushing once per batch."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow({key: _default(value) if isinstance(value, datetime) else value for key, value in row.items()})
+        count += 1
+        if count % batch_size == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def export_response(rows: Iterable[dict], columns: list[str], fmt: str, filename: str,
+                    batch_size: int = EXPORT_BATCH_SIZE) -> StreamingResponse:
+    """
+    Build a StreamingResponse that serializes rows lazily as NDJSON or CSV.
+
+    Args:
+        rows (Iterable[dict]): Lazily produced rows, e.g. from a repository export iterator.
+        columns (list[str]): Column names, used for the CSV header and field order.
+        fmt (str): Either "ndjson" or "csv".
+        filename (str): Base name for the Content-Disposition attachment.
+        batch_size (int): Number of rows serialized per chunk written to the client.
+
+    Returns:
+        StreamingResponse: A response whose body is generated as the client reads it.
+    """
+    if fmt == "csv":
+        body = _encode_csv(rows, columns, batch_size)
+    else:
+        body = _encode_ndjson(rows, batch_size)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
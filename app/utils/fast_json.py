@@ -0,0 +1,42 @@
+"""
+JSON encoding for hot list endpoints that skip ORM hydration and Pydantic.
+
+Output is byte-for-byte what FastAPI's JSONResponse renders for the same
+data through a response_model: compact separators, non-ASCII left as UTF-8,
+naive datetimes in isoformat. Uses orjson when installed.
+"""
+import json
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        # Pydantic writes UTC as "Z".
+        return text[:-6] + "Z" if value.utcoffset() == timedelta(0) else text
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data: Any) -> bytes:
+    """Encode `data` (dicts, lists, str, int, None, datetime) to compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_UTC_Z)
+    return json.dumps(data, default=_default, ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def rows_as_dicts(rows: Iterable) -> list[dict]:
+    """Turn SQLAlchemy Rows into dicts keyed in select-column order."""
+    return [dict(row._mapping) for row in rows]
+
+
+def json_response(content: bytes, response: Response) -> Response:
+    """Wrap pre-encoded JSON, keeping headers (e.g. ETag) already set on the injected `response`."""
+    return Response(content, media_type="application/json", headers=dict(response.headers))
@@ -0,0 +1,25 @@
+from fastapi import HTTPException, status
+
+
+def parse_fields(value: str, allowed: list[str]) -> list[str]:
+    """
+    Parse a comma-separated `fields=` query value into field names.
+
+    Args:
+        value (str): e.g. "title,slug,excerpt".
+        allowed (list[str]): Field names the endpoint can project.
+
+    Returns:
+        list[str]: The requested names, without duplicates or blanks.
+
+    Raises:
+        HTTPException: 400 error if no field or an unknown field is named.
+    """
+    fields = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    unknown = [name for name in fields if name not in allowed]
+    if not fields or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid fields {unknown or [value]}; choose from {allowed}"
+        )
+    return fields
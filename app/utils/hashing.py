@@ -1,9 +1,142 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from app.config.config import settings
 from app.config.logger import logger
 import bcrypt
 
+
+def _checkpw(plain_password: bytes, hashed_password: bytes) -> bool:
+    return bcrypt.checkpw(plain_password, hashed_password)
+
+
+def _hashpw(password: bytes) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt())
+
+
+class HashingService:
+    """
+    Runs bcrypt calls on a dedicated, bounded process pool.
+
+    Each bcrypt call burns ~250 ms of CPU. Running it in worker processes lets
+    hashing scale across cores and, through the async API, frees the request
+    threadpool while a hash is computed. A pool size of 0 runs calls inline.
+    """
+
+    def __init__(self, max_workers: int, timeout: float):
+        """
+        Args:
+            max_workers (int): Number of hashing processes; 0 hashes in the calling thread.
+            timeout (float): Seconds a call may wait for a worker plus run before failing.
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.timeouts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a threaded server process is unsafe.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _submit(self, fn, *args) -> Future:
+        future = self._get_executor().submit(fn, *args)
+        with self._lock:
+            self.in_flight += 1
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def _timed_out(self, future: Future | None = None):
+        if future is not None:
+            future.cancel()
+        with self._lock:
+            self.timeouts += 1
+        logger.warning("Password hashing timed out after %ss (%s calls in flight).",
+                       self.timeout, self.in_flight)
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Password hashing is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    def run(self, fn, *args):
+        """Run `fn(*args)` on the pool and block the calling thread for the result."""
+        if self.max_workers <= 0:
+            return fn(*args)
+        future = self._submit(fn, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise self._timed_out(future)
+
+    async def run_async(self, fn, *args):
+        """Run `fn(*args)` on the pool without blocking the event loop or a worker thread."""
+        if self.max_workers <= 0:
+            return await run_in_threadpool(fn, *args)
+        future = self._submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise self._timed_out(future)
+
+    def map(self, fn, *iterables, chunksize: int = 8) -> list:
+        """
+        Apply `fn` across the iterables on every worker and return results in order.
+
+        Meant for batch jobs (e.g. bulk imports) rather than request paths, so no
+        per-call timeout applies. Items travel to workers `chunksize` at a time.
+        """
+        if self.max_workers <= 0:
+            return list(map(fn, *iterables))
+        return list(self._get_executor().map(fn, *iterables, chunksize=chunksize))
+
+    def stats(self) -> dict:
+        """Return queue-depth and throughput counters for the hashing pool."""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "in_flight": self.in_flight,
+                "queue_depth": max(0, self.in_flight - self.max_workers),
+                "completed": self.completed,
+                "timeouts": self.timeouts,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; a later call starts a fresh pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+hashing_service = HashingService(
+    max_workers=settings.HASHER_POOL_SIZE,
+    timeout=settings.HASHER_TIMEOUT_SECONDS,
+)
+
+
 class Hasher:
     """
     Handles hashing and verifying passwords using bcrypt and SHA-256 for extra security.
+
+    The work runs on `hashing_service`; prefer the `*_async` variants from
+    `async def` code so no thread is held while bcrypt runs.
     """
 
     @staticmethod
@@ -12,9 +145,11 @@ class Hasher:
         Verify that a plain text password matches its hashed version.
         """
         try:
-            return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+            return hashing_service.run(_checkpw, plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.exception(f"Error verifying password: {e}")
+            logger.exception("Error verifying password: %s", e)
             return False
 
     @staticmethod
@@ -23,8 +158,41 @@ class Hasher:
         Hash a password securely using SHA-256 + bcrypt.
         """
         try:
-            hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+            hashed_password = hashing_service.run(_hashpw, password.encode('utf-8'))
+            return hashed_password.decode('utf-8')
+        except Exception as e:
+            logger.exception("Error hashing password: %s", e)
+            raise
+
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        """
+        Awaitable variant of verify_password.
+        """
+        try:
+            return await hashing_service.run_async(_checkpw, plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.exception("Error verifying password: %s", e)
+            return False
+
+    @staticmethod
+    async def get_password_hash_async(password: str) -> str:
+        """
+        Awaitable variant of get_password_hash.
+        """
+        try:
+            hashed_password = await hashing_service.run_async(_hashpw, password.encode('utf-8'))
             return hashed_password.decode('utf-8')
         except Exception as e:
-            logger.exception(f"Error hashing password: {e}")
-            raise
\ No newline at end of file
+            logger.exception("Error hashing password: %s", e)
+            raise
+
+    @staticmethod
+    def get_password_hashes(passwords: list[str], service: HashingService = hashing_service) -> list[str]:
+        """
+        Hash many passwords in parallel across the service's worker processes.
+        """
+        hashed = service.map(_hashpw, [password.encode('utf-8') for password in passwords])
+        return [hashed_password.decode('utf-8') for hashed_password in hashed]
@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+from datetime import datetime
+from app.config.config import settings
+from app.utils.cache import TTLCache
+
+
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
+    """
+    Lightweight, session-independent view of the authenticated user.
+
+    Unlike the ORM User it carries no password hash and no lazy relationships,
+    so it is safe to share between requests through the identity cache.
+    """
+    id: int
+    email: str
+    full_name: str
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_user(cls, user) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+
+# Keyed by the JWT subject (the user's email); values are (users table version, CurrentUser).
+identity_cache = TTLCache(
+    maxsize=settings.IDENTITY_CACHE_MAX_SIZE,
+    ttl=settings.IDENTITY_CACHE_TTL_SECONDS,
+)
+
+
+def evict_identity(*emails: str | None) -> None:
+    """Drop cached identities so the next authenticated request reloads them."""
+    for email in emails:
+        if email:
+            identity_cache.delete(email)
@@ -0,0 +1,114 @@
+import bisect
+import threading
+from contextvars import ContextVar
+
+# Latency buckets in seconds, from sub-millisecond pool checkouts to slow requests.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Counter:
+    """Thread-safe monotonically increasing count."""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Histogram:
+    """
+    Thread-safe fixed-bucket histogram (Prometheus style: cumulative on export).
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets (tuple[float, ...]): Sorted upper bounds; a +Inf bucket is implied.
+        """
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict:
+        """
+        Return count, sum and cumulative bucket counts keyed by upper bound
+        (the last key is float("inf")).
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative, running = {}, 0
+        for bound, count in zip((*self.buckets, float("inf")), counts):
+            running += count
+            cumulative[bound] = running
+        return {"count": running, "sum": total, "buckets": cumulative}
+
+
+class Gauge:
+    """Thread-safe value that can go up and down."""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value -= amount
+
+
+class Family:
+    """
+    A metric per label-value tuple, created on first use.
+
+    Label values must come from a small, fixed set (route templates, status
+    codes); never label with raw paths or IDs.
+    """
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], factory):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._factory = factory
+        # The metric class (Counter, Gauge or Histogram), known before any child exists.
+        self.type = type(factory())
+        self._children: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def child(self, *values):
+        """Return the metric for these label values, in `labels` order."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._factory())
+        return child
+
+    def items(self) -> list[tuple[tuple, object]]:
+        with self._lock:
+            return list(self._children.items())
+
+
+class RequestDbStats:
+    """SQL statement count and time spent in the database for one request."""
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# Set by MetricsMiddleware for the duration of a request; engine events add to it.
+current_db_stats: ContextVar[RequestDbStats | None] = ContextVar("current_db_stats", default=None)
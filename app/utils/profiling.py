@@ -0,0 +1,165 @@
+import inspect
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from fastapi.routing import APIRoute
+from app.config.config import settings
+
+# Set by ProfilingMiddleware on the requests it profiles; None for every other request.
+current_profile: ContextVar["Profile | None"] = ContextVar("current_profile", default=None)
+
+# SQLAlchemy frames that hold the statement being executed, shown as an extra "SQL ..." frame.
+_SQL_FRAMES = {"do_execute", "do_executemany", "do_execute_no_params"}
+_SQLALCHEMY_DEFAULT = os.path.join("sqlalchemy", "engine", "default.py")
+# Code objects of the endpoint wrappers; stacks are cut there, dropping threadpool/anyio frames.
+_BOUNDARY_CODES: set = set()
+_CWD = os.getcwd() + os.sep
+
+
+def _location(filename: str) -> str:
+    if filename.startswith(_CWD):
+        return filename[len(_CWD):]
+    _, marker, rest = filename.rpartition("site-packages" + os.sep)
+    return rest if marker else os.path.basename(filename)
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_qualname} ({_location(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _sql_label(frame) -> str:
+    statement = frame.f_locals.get("statement") or ""
+    return "SQL " + " ".join(str(statement).split())[:80].replace(";", ",")
+
+
+class Profile:
+    """
+    Statistical profile of one request.
+
+    While running, a sampler thread records the stack of every thread
+    registered with `track()` every `interval` seconds. Stacks run from the
+    endpoint down through controllers and repositories to the SQL statement
+    being executed.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.label = "request"
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._threads: set[int] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._sampler = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    @contextmanager
+    def track(self):
+        """Sample the current thread until the block exits."""
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads.add(ident)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._threads.discard(ident)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                idents = list(self._threads)
+            if not idents:
+                continue
+            frames = sys._current_frames()
+            for ident in idents:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.stacks[self._stack(frame)] += 1
+                    self.samples += 1
+
+    @staticmethod
+    def _stack(frame) -> str:
+        labels = []
+        while frame is not None and frame.f_code not in _BOUNDARY_CODES:
+            code = frame.f_code
+            if code.co_name in _SQL_FRAMES and code.co_filename.endswith(_SQLALCHEMY_DEFAULT):
+                labels.append(_sql_label(frame))
+            labels.append(_frame_label(code))
+            frame = frame.f_back
+        labels.reverse()
+        return ";".join(labels)
+
+    def folded(self) -> str:
+        """Return the samples in collapsed-stack format (flamegraph.pl, speedscope, inferno)."""
+        return "".join(f"{self.label};{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Bounded on-disk ring of .folded files; the oldest are deleted beyond `max_files`."""
+
+    def __init__(self, directory: str, max_files: int):
+        self.directory = Path(directory)
+        self.max_files = max_files
+
+    def write(self, name: str, profile: Profile) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / name
+        path.write_text(profile.folded())
+        # Names start with a zero-padded millisecond timestamp, so name order is age order.
+        for old in sorted(self.directory.glob("*.folded"))[:-self.max_files]:
+            old.unlink(missing_ok=True)
+        return path
+
+
+def profiling_enabled() -> bool:
+    return bool(settings.PROFILE_TOKEN or settings.PROFILE_SAMPLE_RATE)
+
+
+def profiled(endpoint):
+    """
+    Wrap a route endpoint so the thread running it is sampled when the
+    request is being profiled.
+
+    Sync endpoints run on a threadpool thread, which is sampled alone. An
+    async endpoint is sampled on the event loop thread, so its profile also
+    holds whatever other requests run on the loop between its awaits.
+    """
+    if inspect.iscoroutinefunction(endpoint):
+        @wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            profile = current_profile.get()
+            if profile is None:
+                return await endpoint(*args, **kwargs)
+            with profile.track():
+                return await endpoint(*args, **kwargs)
+    else:
+        @wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            profile = current_profile.get()
+            if profile is None:
+                return endpoint(*args, **kwargs)
+            with profile.track():
+                return endpoint(*args, **kwargs)
+    _BOUNDARY_CODES.add(wrapper.__code__)
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute whose endpoint can be profiled; a plain APIRoute when profiling is not configured."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, profiled(endpoint) if profiling_enabled() else endpoint, **kwargs)
@@ -0,0 +1,65 @@
+import math
+from app.utils.metrics import Counter, Family, Gauge, Histogram
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names, values, extra: dict | None = None) -> str:
+    pairs = [*zip(names, values), *(extra or {}).items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value) -> str:
+    if value is None:
+        return "NaN"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _histogram_lines(name: str, labels: tuple, values: tuple, snapshot: dict) -> list[str]:
+    lines = [
+        f"{name}_bucket{_labels(labels, values, {'le': _number(float(bound))})} {count}"
+        for bound, count in snapshot["buckets"].items()
+    ]
+    lines.append(f"{name}_sum{_labels(labels, values)} {_number(snapshot['sum'])}")
+    lines.append(f"{name}_count{_labels(labels, values)} {snapshot['count']}")
+    return lines
+
+
+def render_family(family: Family) -> list[str]:
+    """
+    Render a labelled metric family in the Prometheus text exposition format.
+
+    HELP and TYPE are written even before the first sample, so scrapers see
+    every family from the first scrape.
+    """
+    kind = {Counter: "counter", Gauge: "gauge", Histogram: "histogram"}[family.type]
+    lines = [f"# HELP {family.name} {family.help}", f"# TYPE {family.name} {kind}"]
+    for values, metric in sorted(family.items(), key=lambda item: item[0]):
+        if kind == "histogram":
+            lines.extend(_histogram_lines(family.name, family.labels, values, metric.snapshot()))
+        else:
+            lines.append(f"{family.name}{_labels(family.labels, values)} {_number(metric.value)}")
+    return lines
+
+
+def render_samples(name: str, help: str, kind: str, samples: list[tuple[dict, object]]) -> list[str]:
+    """
+    Render one metric from (labels, value) pairs; a value may be a Histogram snapshot.
+    """
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        if isinstance(value, dict):
+            lines.extend(_histogram_lines(name, tuple(labels), tuple(labels.values()), value))
+        else:
+            lines.append(f"{name}{_labels(labels.keys(), labels.values())} {_number(value)}")
+    return lines
@@ -0,0 +1,192 @@
+"""
+Microbenchmarks for the per-request CPU hot paths: JWT issue/verify, the
+get_current_user dependency, bcrypt verification and response-schema work.
+
+    python -m benchmarks.microbench                      # run everything, print a table
+    python -m benchmarks.microbench -k jwt -k schema     # only names containing "jwt" or "schema"
+    python -m benchmarks.microbench --save-baseline      # record results as the baseline
+    python -m benchmarks.microbench --compare            # exit 1 if a tracked path regressed
+
+Each benchmark is timed with timeit: loops are calibrated to take at least
+0.2s, then repeated with the garbage collector off, and the median per-call
+time is compared. Baselines are machine specific: record and compare them on
+the same host.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+# Settings are read at import time; benchmarks never touch the configured database.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "microbench-secret-key-of-32-bytes+")
+
+import bcrypt
+import jwt
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+from app.config.config import settings
+from app.controllers.auth_controller import create_access_token, verify_token
+from app.middleware.auth_middleware import get_current_user
+from app.models import Base, Blog, User
+from app.schemas.blog_schema import BlogResponse
+from app.schemas.user_schema import UserResponse
+from app.utils.hashing import Hasher, _checkpw, hashing_service
+from app.utils.identity_cache import identity_cache
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "microbench.json"
+EMAIL = "bench@example.com"
+PASSWORD = "microbench-password"
+
+
+class Fixtures:
+    """Objects the benchmarks share: a token, a seeded database, ORM rows and their dicts."""
+
+    def __init__(self):
+        self.token = create_access_token(EMAIL)
+        self.request = Request({
+            "type": "http", "method": "GET", "path": "/blogs/",
+            "headers": [(b"cookie", f"access_token={self.token}".encode("latin-1"))],
+        })
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = Session(self.engine)
+        self.password_hash = Hasher.get_password_hash(PASSWORD)
+        self.user = User(email=EMAIL, full_name="Bench User", password=self.password_hash)
+        self.db.add(self.user)
+        self.db.flush()
+        self.blog = Blog(title="A benchmark post", slug="a-benchmark-post", content="Lorem ipsum. " * 200,
+                         author_id=self.user.id, created_at=datetime(2024, 1, 1))
+        self.db.add(self.blog)
+        self.db.commit()
+        self.blog_dict = BlogResponse.model_validate(self.blog, from_attributes=True).model_dump()
+        self.user_dict = UserResponse.model_validate(self.user, from_attributes=True).model_dump()
+
+    def close(self):
+        self.db.close()
+        self.engine.dispose()
+
+
+def current_user_miss(f: Fixtures):
+    identity_cache.delete(EMAIL)
+    return get_current_user(f.request, db=f.db)
+
+
+# name -> (callable taking Fixtures, tracked). Untracked ones are reported but
+# never fail --compare (their cost is dominated by I/O or is not ours).
+BENCHMARKS = {
+    "jwt.create_access_token": (lambda f: create_access_token(EMAIL), True),
+    "jwt.verify_token": (lambda f: verify_token(f.token), True),
+    "jwt.decode": (lambda f: jwt.decode(f.token, str(settings.SECRET_KEY), algorithms=[settings.ALGORITHM]), True),
+    "auth.get_current_user.cached": (lambda f: get_current_user(f.request, db=f.db), True),
+    "auth.get_current_user.db": (current_user_miss, False),
+    "hashing.checkpw": (lambda f: _checkpw(PASSWORD.encode("utf-8"), f.password_hash.encode("utf-8")), True),
+    "hashing.verify_password": (lambda f: Hasher.verify_password(PASSWORD, f.password_hash), False),
+    "schema.BlogResponse.from_orm": (lambda f: BlogResponse.model_validate(f.blog, from_attributes=True), True),
+    "schema.BlogResponse.from_dict": (lambda f: BlogResponse(**f.blog_dict), True),
+    "schema.BlogResponse.dump_json": (lambda f: BlogResponse.model_validate(f.blog_dict).model_dump_json(), True),
+    "schema.UserResponse.from_orm": (lambda f: UserResponse.model_validate(f.user, from_attributes=True), True),
+    "schema.UserResponse.from_dict": (lambda f: UserResponse(**f.user_dict), True),
+}
+
+
+def measure(func, fixtures: Fixtures, repeat: int) -> dict:
+    """Time `func(fixtures)` and return per-call statistics in nanoseconds."""
+    timer = timeit.Timer(lambda: func(fixtures))
+    loops, _ = timer.autorange()
+    timer.timeit(loops)  # warm caches, the identity cache and pydantic validators
+    samples = [elapsed / loops * 1e9 for elapsed in timer.repeat(repeat, loops)]
+    return {
+        "median_ns": statistics.median(samples),
+        "min_ns": min(samples),
+        "mean_ns": statistics.fmean(samples),
+        "stdev_ns": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a message per tracked benchmark whose median is slower than baseline by more than `threshold`."""
+    regressions = []
+    for name, stats in results["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None or not BENCHMARKS[name][1]:
+            continue
+        if stats["median_ns"] > base["median_ns"] * (1 + threshold):
+            regressions.append(f"{name}: {format_ns(base['median_ns'])} -> {format_ns(stats['median_ns'])}")
+    return regressions
+
+
+def format_ns(ns: float) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("µs", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="filters", action="append", default=[],
+                        help="Only run benchmarks whose name contains this; repeatable.")
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="Exit 1 if a tracked benchmark regressed.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown as a fraction (0.25 = 25%%).")
+    parser.add_argument("--json", type=Path, help="Also write the results to this file.")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if not args.filters or any(f in name for f in args.filters)]
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    fixtures = Fixtures()
+    results = {
+        "meta": {
+            "python": platform.python_version(), "machine": platform.machine(),
+            "bcrypt": bcrypt.__version__, "pyjwt": jwt.__version__, "repeat": args.repeat,
+        },
+        "benchmarks": {},
+    }
+    print(f"{'benchmark':<32} {'median':>10} {'min':>10} {'stdev %':>8}" + ("  vs base" if baseline else ""))
+    try:
+        for name in names:
+            stats = measure(BENCHMARKS[name][0], fixtures, args.repeat)
+            results["benchmarks"][name] = stats
+            line = (f"{name:<32} {format_ns(stats['median_ns']):>10} {format_ns(stats['min_ns']):>10} "
+                    f"{stats['stdev_ns'] / stats['mean_ns'] * 100:>7.1f}%")
+            base = (baseline or {}).get("benchmarks", {}).get(name)
+            if base:
+                line += f" {(stats['median_ns'] / base['median_ns'] - 1) * 100:>+7.1f}%"
+            print(line, flush=True)
+    finally:
+        fixtures.close()
+        hashing_service.shutdown()
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        if baseline is not None:
+            # Keep entries for benchmarks filtered out of this run.
+            results["benchmarks"] = {**baseline["benchmarks"], **results["benchmarks"]}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"Baseline saved to {args.baseline}")
+    if args.compare:
+        if baseline is None:
+            print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+            return 1
+        regressions = compare(results, baseline, args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Compare list-response serialization: ORM objects through a response_model
+(FastAPI's default path) against column rows through app.utils.fast_json.
+
+    python -m benchmarks.serialize_bench --rows 1000 10000 100000
+
+Runs against an in-memory SQLite database, so the numbers isolate
+hydration and encoding cost rather than network or server time.
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from app.models import Base, Blog, User
+from app.repositories.blog_repository import RESPONSE_COLUMNS
+from app.schemas.blog_schema import BlogResponse
+from app.utils.fast_json import dumps, rows_as_dicts
+
+ADAPTER = TypeAdapter(list[BlogResponse])
+
+
+def seed(engine, count: int) -> None:
+    with Session(engine) as db:
+        db.add(User(email="bench@example.com", full_name="Bench", password="x"))
+        db.flush()
+        start = datetime(2024, 1, 1)
+        db.execute(insert(Blog), [
+            {"title": f"Title {i} – ünïcode", "slug": f"slug-{i}", "content": "lorem ipsum " * 20,
+             "author_id": 1, "created_at": start + timedelta(seconds=i)}
+            for i in range(count)
+        ])
+        db.commit()
+
+
+def orm_path(engine) -> bytes:
+    with Session(engine) as db:
+        blogs = db.query(Blog).all()
+        return JSONResponse(ADAPTER.dump_python(ADAPTER.validate_python(blogs, from_attributes=True),
+                                                mode="json")).body
+
+
+def fast_path(engine) -> bytes:
+    with Session(engine) as db:
+        return dumps(rows_as_dicts(db.query(*RESPONSE_COLUMNS).all()))
+
+
+def measure(run, engine, repeat: int) -> tuple[float, float]:
+    """Return (best seconds, peak MiB) over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(engine)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    run(engine)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak / 2 ** 20
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>8} {'path':<6} {'best ms':>9} {'rows/s':>10} {'peak MiB':>9}")
+    for count in args.rows:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        seed(engine, count)
+        assert orm_path(engine) == fast_path(engine), "fast path output differs from response_model output"
+        for name, run in (("orm", orm_path), ("fast", fast_path)):
+            seconds, peak = measure(run, engine, args.repeat)
+            print(f"{count:>8} {name:<6} {seconds * 1000:>9.1f} {count / seconds:>10.0f} {peak:>9.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Cold-start timing: how long a fresh worker process takes to import the app,
+build it, run the lifespan startup, create its engine and first connection,
+and serve its first request.
+
+    python -m benchmarks.startup                          # 5 fresh processes on a temporary SQLite file
+    python -m benchmarks.startup --database-url postgresql://...
+    python -m benchmarks.startup --importtime 15          # also list the packages slowest to import
+
+Every run is a new interpreter, so module imports, pydantic schema builds
+and route compilation are all cold. The median and minimum of each phase
+across runs are reported.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs in the child process; prints one JSON object of phase durations in seconds.
+CHILD = r"""
+import json, sys, time
+started = time.perf_counter()
+from app.main import create_app
+imported = time.perf_counter()
+app = create_app()
+built = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.config.dbconf import database
+client = TestClient(app)
+client_ready = time.perf_counter()
+with client:
+    lifespan = time.perf_counter()
+    with database.engine.connect():
+        pass
+    connected = time.perf_counter()
+    client.get(sys.argv[1])
+    first = time.perf_counter()
+    client.get(sys.argv[1])
+    second = time.perf_counter()
+print(json.dumps({
+    "import": imported - started,
+    "create_app": built - imported,
+    "lifespan_startup": lifespan - client_ready,
+    "engine_and_connect": connected - lifespan,
+    "first_request": first - connected,
+    "second_request": second - first,
+}))
+"""
+
+PHASES = ("import", "create_app", "lifespan_startup", "engine_and_connect", "first_request", "second_request")
+
+
+def run_child(env: dict, path: str, importtime: bool = False) -> tuple[dict, str]:
+    """Start one fresh interpreter, return its phase timings and its stderr."""
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", CHILD, path]
+    result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup run failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def import_time_by_package(stderr: str, limit: int) -> list[tuple[str, int]]:
+    """Sum the self time of every module in `-X importtime` output by top-level package, slowest first (µs)."""
+    totals: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        if own.strip().isdigit():
+            package = name.strip().split(".")[0]
+            totals[package] = totals.get(package, 0) + int(own)
+    return sorted(totals.items(), key=lambda entry: entry[1], reverse=True)[:limit]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--database-url", help="Database to connect to (default: a temporary SQLite file).")
+    parser.add_argument("--path", default="/", help="Route requested for the first-request timing.")
+    parser.add_argument("--importtime", type=int, metavar="N", default=0,
+                        help="Also list the N packages slowest to import, from one -X importtime run.")
+    parser.add_argument("--json", type=Path, help="Also write the per-run timings to this file.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="startup-") as workdir:
+        env = {
+            **os.environ,
+            "DATABASE_URL": args.database_url or f"sqlite:///{Path(workdir) / 'startup.db'}",
+            "SECRET_KEY": os.environ.get("SECRET_KEY", "startup-benchmark-secret-key-32b+"),
+        }
+        runs = [run_child(env, args.path)[0] for _ in range(args.runs)]
+        slowest_imports = import_time_by_package(run_child(env, args.path, importtime=True)[1],
+                                                 args.importtime) if args.importtime else []
+
+    print(f"{'phase':<20} {'median ms':>10} {'min ms':>10}")
+    for phase in PHASES + ("total",):
+        values = [sum(run[p] for p in PHASES[:-1]) if phase == "total" else run[phase] for run in runs]
+        print(f"{phase:<20} {statistics.median(values) * 1000:>10.1f} {min(values) * 1000:>10.1f}")
+    print("(total = everything up to and including the first request)")
+    if slowest_imports:
+        print(f"\n{'package':<40} {'import ms':>14}")
+        for name, micros in slowest_imports:
+            print(f"{name:<40} {micros / 1000:>14.1f}")
+    if args.json:
+        args.json.write_text(json.dumps({"runs": runs, "slowest_imports": slowest_imports}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,9 +23,39 @@ def logout():
     session = get_session()
     return session.post(f"{API_URL}/auth/logout")
 
-def get_blogs():
+ETAG_CACHE_SIZE = 50
+
+def conditional_get(url, params=None):
+    """
+    GET with If-None-Match, reusing the stored response when the server answers 304.
+    """
     session = get_session()
-    return session.get(f"{API_URL}/blogs/")
+    cache = st.session_state.setdefault("etag_cache", {})
+    key = (url, tuple(sorted((params or {}).items())))
+    cached = cache.get(key)
+    headers = {"If-None-Match": cached.headers["ETag"]} if cached is not None else {}
+    res = session.get(url, params=params, headers=headers)
+    if res.status_code == 304 and cached is not None:
+        return cached
+    if res.ok and "ETag" in res.headers:
+        cache.pop(key, None)
+        cache[key] = res
+        while len(cache) > ETAG_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+    return res
+
+def get_blogs(after=None, before=None, limit=20, fields=None):
+    params = {"limit": limit}
+    if fields:
+        params["fields"] = fields
+    if after:
+        params["after"] = after
+    if before:
+        params["before"] = before
+    return conditional_get(f"{API_URL}/blogs/", params=params)
+
+def get_blog(blog_id):
+    return conditional_get(f"{API_URL}/blogs/{blog_id}")
 
 def create_blog(title, slug, content):
     session = get_session()
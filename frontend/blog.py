@@ -1,5 +1,8 @@
 import streamlit as st
-from api import get_blogs, create_blog, update_blog, delete_blog
+from api import get_blogs, get_blog, create_blog, update_blog, delete_blog
+
+# The list only needs titles; full content is fetched when a post is opened.
+LIST_FIELDS = "title,slug,excerpt"
 
 @st.dialog("Create a New Blog")
 def add_blog_dialog():
@@ -82,13 +85,19 @@ def show_blog_page():
         st.session_state.edit_blog_id = None
     if "delete_blog_id" not in st.session_state:
         st.session_state.delete_blog_id = None
+    if "blog_cursor" not in st.session_state:
+        st.session_state.blog_cursor = {}
+    if "open_blog_ids" not in st.session_state:
+        st.session_state.open_blog_ids = set()
 
-    res = get_blogs()
+    res = get_blogs(fields=LIST_FIELDS, **st.session_state.blog_cursor)
     if res.status_code == 200:
-        blogs = res.json()
+        page = res.json()
+        blogs = page["items"]
     else:
         st.warning("⚠️ Unable to fetch blogs.")
         st.write("Response:", res.status_code, res.text)
+        page = {}
         blogs = []
 
     st.divider()
@@ -105,15 +114,38 @@ def show_blog_page():
     for blog in blogs:
         blog_id = blog.get("id")
         with st.expander(f"📄 {blog.get('title', '<No title>')}"):
-            st.markdown(blog.get("content", ""))
+            if blog_id in st.session_state.open_blog_ids:
+                full = get_blog(blog_id)
+                content = full.json().get("content") if full.ok else blog.get("excerpt")
+                st.markdown(content or "")
+            else:
+                excerpt = blog.get("excerpt") or ""
+                st.markdown(excerpt)
+                if excerpt.endswith("…") and st.button("📖 Read more", key=f"open_{blog_id}"):
+                    st.session_state.open_blog_ids.add(blog_id)
+                    st.rerun()
             col1, col2 = st.columns(2)
 
             with col1:
                 if st.button("✏️ Edit", key=f"edit_{blog_id}"):
-                    st.session_state.edit_blog_id = blog_id
-                    edit_blog_dialog(blog)  # open dialog
+                    full = get_blog(blog_id)
+                    if full.ok:
+                        st.session_state.edit_blog_id = blog_id
+                        edit_blog_dialog(full.json())  # open dialog
+                    else:
+                        st.error(f"Unable to load blog: {full.status_code}")
 
             with col2:
                 if st.button("🗑️ Delete", key=f"delete_{blog_id}"):
                     st.session_state.delete_blog_id = blog_id
                     delete_blog_dialog(blog)  # open dialog
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if page.get("prev_cursor") and st.button("⬅️ Newer"):
+            st.session_state.blog_cursor = {"before": page["prev_cursor"]}
+            st.rerun()
+    with col2:
+        if page.get("next_cursor") and st.button("Older ➡️"):
+            st.session_state.blog_cursor = {"after": page["next_cursor"]}
+            st.rerun()